@@ -0,0 +1,252 @@
+import asyncio
+import json
+import os
+import struct
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from src.compression import cache_codec, compress_blob, decompress_blob
+from src.config import settings
+from src.logs import get_logger
+from src.metrics import metrics
+from src.result_store import BlobEntry, CompactRows, ResultStore
+
+logger = get_logger(__name__)
+
+# On-disk entry: magic, wall-clock expiry, codec name, compressed JSON
+_DISK_MAGIC = b"MVK1"
+_DISK_HEADER = struct.Struct("!4sd16s")
+
+class ResponseCache:
+    """
+    TTL cache for decoded GraphQL `data` payloads.
+    Keys are built by MavvrikClient and are already tenant-scoped.
+
+    The memory tier is a ResultStore bounded by settings.result_store_max_bytes:
+    row payloads are kept in compact columnar form, anything else as
+    compressed JSON (settings.cache_compression). Every hit decodes a fresh
+    copy. With settings.cache_dir set, entries are also written to disk and
+    survive restarts; memory misses fall back to the disk tier. Disk entries
+    hold tenant cost data, so files are owner-only (0600) and a sweep removes
+    expired files and keeps the directory under settings.cache_dir_max_bytes.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int, max_bytes: int, cache_dir: Optional[str] = None,
+                 dir_max_bytes: int = 256 * 1024 * 1024, sweep_interval: float = 300.0):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.dir_max_bytes = dir_max_bytes
+        self.sweep_interval = sweep_interval
+        self.store = ResultStore(max_bytes=max_bytes, max_entries=max_entries)
+        self._pending_writes: set = set()
+        self._last_sweep = 0.0
+        self._sweeping = False
+        self.last_sweep: Optional[Dict[str, Any]] = None
+
+        if cache_dir:
+            os.makedirs(cache_dir, mode=0o700, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    # --- Memory Tier ---
+
+    def get(self, key: str) -> Optional[Any]:
+        stored = self.store.get(key)
+        if stored is None:
+            metrics.incr("cache.misses", tier="memory")
+            return None
+
+        metrics.incr("cache.hits", tier="memory")
+        if isinstance(stored, CompactRows):
+            return stored.decode()
+        return json.loads(decompress_blob(stored.blob, stored.codec))
+
+    def set(self, key: str, value: Any, refetch_ms: float = 0.0) -> None:
+        """
+        Stores a payload. `refetch_ms` is what the backend call cost; the
+        store prefers to evict entries that are cheap to fetch again.
+        """
+        if not self.enabled:
+            return
+
+        blob: Optional[bytes] = None
+        codec = cache_codec()
+        stored = CompactRows.encode(value)
+        if stored is None:
+            blob = compress_blob(json.dumps(value, separators=(",", ":")).encode("utf-8"), codec)
+            stored = BlobEntry(codec, blob)
+        self.store.put(key, stored, self.ttl_seconds, refetch_ms)
+
+        if self.cache_dir:
+            if blob is None:
+                blob = compress_blob(json.dumps(value, separators=(",", ":")).encode("utf-8"), codec)
+            self._schedule_disk_write(key, time.time() + self.ttl_seconds, codec, blob)
+
+    # --- Disk Tier ---
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.bin")
+
+    def _write_file(self, key: str, expires_at: float, codec: str, blob: bytes) -> None:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        # Owner-only from creation: there is no window where the entry is world-readable
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o600)
+        with os.fdopen(fd, "wb") as f:
+            f.write(_DISK_HEADER.pack(_DISK_MAGIC, expires_at, codec.encode()))
+            f.write(blob)
+        # Atomic rename: readers never see a half-written entry
+        os.replace(tmp_path, path)
+
+    def _read_file(self, key: str) -> Optional[Tuple[float, str, bytes]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except FileNotFoundError:
+            return None
+
+        magic, expires_at, codec = _DISK_HEADER.unpack_from(raw)
+        if magic != _DISK_MAGIC or expires_at < time.time():
+            os.remove(path)
+            return None
+        return expires_at, codec.rstrip(b"\0").decode(), raw[_DISK_HEADER.size:]
+
+    def sweep_disk(self) -> Dict[str, Any]:
+        """
+        Deletes expired entries and abandoned temp files, then the entries
+        closest to expiry until the directory fits settings.cache_dir_max_bytes.
+        Only the fixed-size header of each file is read.
+        """
+        now = time.time()
+        removed = {"expired": 0, "size_limit": 0, "stale_tmp": 0}
+        live: List[Tuple[float, int, str]] = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if not entry.is_file():
+                continue
+            try:
+                if entry.name.endswith(".tmp"):
+                    # A write in progress finishes within seconds
+                    if entry.stat().st_mtime < now - 3600:
+                        os.remove(entry.path)
+                        removed["stale_tmp"] += 1
+                    continue
+                if not entry.name.endswith(".bin"):
+                    continue
+                with open(entry.path, "rb") as f:
+                    header = f.read(_DISK_HEADER.size)
+                size = entry.stat().st_size
+                magic, expires_at, _ = _DISK_HEADER.unpack(header) if len(header) == _DISK_HEADER.size else (b"", 0.0, b"")
+                if magic != _DISK_MAGIC or expires_at < now:
+                    os.remove(entry.path)
+                    removed["expired"] += 1
+                    continue
+            except FileNotFoundError:
+                continue  # Replaced or removed concurrently
+            live.append((expires_at, size, entry.path))
+            total += size
+
+        live.sort()
+        for _, size, path in live:
+            if total <= self.dir_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            removed["size_limit"] += 1
+
+        for reason, count in removed.items():
+            if count:
+                metrics.incr("cache.disk_removed", count, reason=reason)
+        self.last_sweep = {"at": now, "files": len(live) - removed["size_limit"], "bytes": total, "removed": removed}
+        return self.last_sweep
+
+    def _maybe_sweep(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        if self._sweeping or time.monotonic() - self._last_sweep < self.sweep_interval:
+            return
+        self._last_sweep = time.monotonic()
+        if loop is None:
+            self.sweep_disk()
+            return
+
+        self._sweeping = True
+        future = loop.run_in_executor(None, self.sweep_disk)
+
+        def _on_swept(f: "asyncio.Future[Dict[str, Any]]") -> None:
+            self._sweeping = False
+            if not f.cancelled() and f.exception() is not None:
+                logger.warning("cache.disk_sweep_failed", error=str(f.exception()))
+
+        future.add_done_callback(_on_swept)
+
+    def _schedule_disk_write(self, key: str, expires_at: float, codec: str, blob: bytes) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_file(key, expires_at, codec, blob)
+            self._maybe_sweep(None)
+            return
+
+        self._maybe_sweep(loop)
+
+        future = loop.run_in_executor(None, self._write_file, key, expires_at, codec, blob)
+        self._pending_writes.add(future)
+
+        def _on_written(f: "asyncio.Future[None]") -> None:
+            self._pending_writes.discard(f)
+            if not f.cancelled() and f.exception() is not None:
+                logger.warning("cache.disk_write_failed", error=str(f.exception()))
+
+        future.add_done_callback(_on_written)
+
+    async def get_async(self, key: str) -> Optional[Any]:
+        """Memory lookup, then the disk tier (read off the event loop)."""
+        value = self.get(key)
+        if value is not None or not self.cache_dir or not self.enabled:
+            return value
+
+        try:
+            entry = await asyncio.to_thread(self._read_file, key)
+        except (OSError, struct.error) as e:
+            logger.warning("cache.disk_read_failed", error=str(e))
+            return None
+        if entry is None:
+            metrics.incr("cache.misses", tier="disk")
+            return None
+
+        expires_at, codec, blob = entry
+        metrics.incr("cache.hits", tier="disk")
+        # Promote to memory (compact form when possible) for the remaining lifetime
+        value = json.loads(decompress_blob(blob, codec))
+        stored = CompactRows.encode(value) or BlobEntry(codec, blob)
+        self.store.put(key, stored, max(expires_at - time.time(), 0.0), refetch_ms=0.0)
+        return value
+
+    def clear(self) -> None:
+        self.store.clear()
+
+    def stats(self) -> dict:
+        return {
+            **self.store.stats(),
+            "codec": cache_codec(),
+            "disk_tier": self.cache_dir,
+            "disk_last_sweep": self.last_sweep,
+        }
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+response_cache = ResponseCache(
+    settings.cache_ttl_seconds,
+    settings.cache_max_entries,
+    settings.result_store_max_bytes,
+    settings.cache_dir,
+    settings.cache_dir_max_bytes,
+    settings.cache_dir_sweep_seconds
+)
@@ -1,50 +1,303 @@
-import httpx
-import sys
-from typing import Dict, Any
-from mcp.server.fastmcp import Context
-from src.config import settings
-from src.security import IdentityManager
-
-class MavvrikClient:
-    def __init__(self, ctx: Context):
-        self.api_url = settings.api_url
-        # Load the headers (API Key + Tenant ID)
-        self.headers = IdentityManager.get_auth_headers(ctx)
-
-    async def execute(self, query: str, variables: Dict[str, Any], operation_name: str = "Query") -> Dict[str, Any]:
-        """
-        Executes GraphQL queries using the Service Account credentials.
-        """
-        # --- ROBUSTNESS CHECK ---
-        # Ensure we are not sending a request without the Tenant Context
-        if "x-mavvrik-tenant" not in self.headers and "tenant" not in self.headers:
-             raise ValueError("Configuration Error: Tenant ID missing from headers.")
-
-        async with httpx.AsyncClient(timeout=settings.request_timeout) as client:
-            try:
-                response = await client.post(
-                    self.api_url,
-                    json={"query": query, "variables": variables},
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                
-                payload = response.json()
-                
-                if "errors" in payload:
-                    # Log to stderr for debugging
-                    print(f"GraphQL Error in {operation_name}: {payload['errors']}", file=sys.stderr)
-                    raise ValueError(f"Mavvrik API Error: {payload['errors'][0]['message']}")
-                
-                return payload.get("data", {})
-
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 401:
-                    raise ValueError("Access Denied: Invalid API Key.")
-                if e.response.status_code == 403:
-                    # This often happens if the API Key is valid but the Tenant ID is wrong
-                    raise ValueError(f"Permission Denied: API Key cannot access tenant '{settings.mavvrik_tenant_id}'.")
-                raise ValueError(f"System Error ({e.response.status_code}).")
-            
-            except httpx.RequestError as e:
-                raise ValueError(f"Connection Failed: {str(e)}")
\ No newline at end of file
+import asyncio
+import functools
+import hashlib
+import json
+import httpx
+import time
+from typing import Dict, Any, Optional, Set
+from mcp.server.fastmcp import Context
+from src.config import settings
+from src.security import IdentityManager
+from src.cache import response_cache
+from src.compression import accept_encoding, decode_body
+from src.deadline import DeadlineExceeded, detached_context, remaining
+from src.tracing import span
+from src.logs import get_logger
+
+logger = get_logger(__name__)
+
+# --- Shared Connection Pool ---
+# One AsyncClient per process so concurrent tool calls (and mvk_batch items)
+# reuse keep-alive connections instead of paying a TLS handshake per query.
+_http_client: Optional[httpx.AsyncClient] = None
+
+class _InflightRequest:
+    """A backend call shared by every caller waiting on the same cache key."""
+
+    def __init__(self, task: "asyncio.Task[Dict[str, Any]]"):
+        self.task = task
+        self.waiters = 0
+        # Cached when any caller sharing the request asked for caching
+        self.use_cache = False
+
+# In-flight requests keyed by cache key. Identical concurrent queries await
+# the same task instead of hitting the backend twice.
+_inflight: Dict[str, _InflightRequest] = {}
+
+def get_http_client() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=settings.request_timeout,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections
+            )
+        )
+    return _http_client
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+# --- Automatic Persisted Queries ---
+
+class _PersistedQueryState:
+    """What we know about one endpoint's APQ support and registered hashes."""
+
+    def __init__(self) -> None:
+        # Monotonic time until which hashes are not sent; the endpoint is probed again afterwards
+        self.unsupported_until = 0.0
+        self.registered: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def unsupported(self) -> bool:
+        return time.monotonic() < self.unsupported_until
+
+_apq_endpoints: Dict[str, _PersistedQueryState] = {}
+
+def _apq_endpoint(api_url: str) -> _PersistedQueryState:
+    state = _apq_endpoints.get(api_url)
+    if state is None:
+        state = _apq_endpoints[api_url] = _PersistedQueryState()
+    return state
+
+@functools.lru_cache(maxsize=64)
+def _query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+def _persisted_query_error(payload: Dict[str, Any]) -> Optional[str]:
+    """Maps Apollo-style APQ errors (by code or message) to a canonical code."""
+    for error in payload.get("errors") or []:
+        code = (error.get("extensions") or {}).get("code")
+        message = error.get("message")
+        if code == "PERSISTED_QUERY_NOT_FOUND" or message == "PersistedQueryNotFound":
+            return "PERSISTED_QUERY_NOT_FOUND"
+        if code == "PERSISTED_QUERY_NOT_SUPPORTED" or message == "PersistedQueryNotSupported":
+            return "PERSISTED_QUERY_NOT_SUPPORTED"
+    return None
+
+def _missing_query_text(payload: Dict[str, Any]) -> bool:
+    """True when a hash-only request was refused for lacking the query text."""
+    # 408/429 are transient and say nothing about APQ support
+    if payload.get("status") not in (None, 408, 429):
+        return True
+    return any("must provide query" in str(error.get("message", "")).lower() for error in payload.get("errors") or [])
+
+def _rejected_payload(raw: bytes, encoding: str, status: int) -> Dict[str, Any]:
+    """Error payload for a 4xx answer, keeping the GraphQL errors when the body has them."""
+    try:
+        payload = json.loads(decode_body(raw, encoding))
+        if isinstance(payload, dict) and payload.get("errors"):
+            return {**payload, "status": status}
+    except Exception:
+        # Undecodable or non-JSON body: the status alone has to do
+        pass
+    return {"errors": [{"message": f"System Error ({status})."}], "status": status}
+
+def persisted_query_stats() -> Dict[str, Dict[str, Any]]:
+    return {
+        url: {"supported": not state.unsupported, "registered": len(state.registered), "hits": state.hits, "misses": state.misses}
+        for url, state in _apq_endpoints.items()
+    }
+
+class MavvrikClient:
+    def __init__(self, ctx: Context):
+        self.api_url = settings.api_url
+        # Load the headers (API Key + Tenant ID)
+        self.headers = IdentityManager.get_auth_headers(ctx)
+
+    def _cache_key(self, query: str, variables: Dict[str, Any]) -> str:
+        # Scope by endpoint + tenant + credentials so tenants never share entries
+        raw = json.dumps(
+            [
+                self.api_url,
+                self.headers.get("x-mavvrik-tenant") or self.headers.get("tenant"),
+                hashlib.sha256(self.headers.get("x-api-key", "").encode()).hexdigest(),
+                query,
+                variables
+            ],
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    async def execute(self, query: str, variables: Dict[str, Any], operation_name: str = "Query", use_cache: bool = True) -> Dict[str, Any]:
+        """
+        Executes GraphQL queries using the Service Account credentials.
+        Results are served from the response cache when fresh, and identical
+        concurrent requests are coalesced into a single backend call.
+        `use_cache=False` skips the cache in both directions (bulk exports
+        would otherwise evict everything interactive queries rely on).
+        """
+        # --- ROBUSTNESS CHECK ---
+        # Ensure we are not sending a request without the Tenant Context
+        if "x-mavvrik-tenant" not in self.headers and "tenant" not in self.headers:
+             raise ValueError("Configuration Error: Tenant ID missing from headers.")
+
+        with span("graphql.execute", operation=operation_name) as s:
+            key = self._cache_key(query, variables)
+
+            cached = await response_cache.get_async(key) if use_cache else None
+            if cached is not None:
+                s.set("cache", "hit")
+                logger.debug("graphql.cache_hit", operation=operation_name)
+                return cached
+
+            time_left = remaining()
+            if time_left is not None and time_left <= 0:
+                raise DeadlineExceeded(f"Deadline exceeded before {operation_name} was sent.")
+
+            inflight = _inflight.get(key)
+            s.set("cache", "coalesced" if inflight is not None else "miss")
+            if inflight is None:
+                fetch_started = time.perf_counter()
+                # Detached from this caller's deadline: a later caller with a longer budget may
+                # join, so each waiter enforces its own deadline below instead
+                task = asyncio.get_running_loop().create_task(
+                    self._post(query, variables, operation_name), context=detached_context()
+                )
+                inflight = _InflightRequest(task)
+                _inflight[key] = inflight
+
+                def _on_done(t: "asyncio.Task[Dict[str, Any]]") -> None:
+                    if _inflight.get(key) is inflight:
+                        del _inflight[key]
+                    if t.cancelled():
+                        return
+                    # Retrieving the exception marks it as handled even if every waiter left
+                    if t.exception() is None and inflight.use_cache:
+                        response_cache.set(key, t.result(), refetch_ms=(time.perf_counter() - fetch_started) * 1000)
+
+                task.add_done_callback(_on_done)
+
+            inflight.waiters += 1
+            inflight.use_cache = inflight.use_cache or use_cache
+            try:
+                # Shield so one cancelled waiter does not abort the request for the others
+                return await asyncio.wait_for(asyncio.shield(inflight.task), timeout=time_left)
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"Deadline exceeded while waiting for {operation_name}.")
+            finally:
+                inflight.waiters -= 1
+                # Nobody will read the result any more: stop wasting backend work
+                if inflight.waiters == 0 and not inflight.task.done():
+                    inflight.task.cancel()
+
+    async def _post(self, query: str, variables: Dict[str, Any], operation_name: str) -> Dict[str, Any]:
+        """
+        Sends the query using Automatic Persisted Queries when enabled:
+        the SHA-256 hash goes first and the full text is only sent when the
+        backend reports it has not seen the hash yet. Any other error or 4xx
+        to a hash-only request is retried once with the full text, so
+        backends without APQ support keep working. APQ is switched off for
+        settings.persisted_queries_retry_seconds only when the backend says
+        it does not support it; transient failures never switch it off.
+        """
+        apq = _apq_endpoint(self.api_url) if settings.persisted_queries else None
+
+        if apq is None or apq.unsupported:
+            payload = await self._send({"query": query, "variables": variables}, operation_name)
+        else:
+            sha = _query_hash(query)
+            extensions = {"persistedQuery": {"version": 1, "sha256Hash": sha}}
+
+            payload = await self._send({"variables": variables, "extensions": extensions}, operation_name)
+            code = _persisted_query_error(payload)
+
+            if code == "PERSISTED_QUERY_NOT_FOUND":
+                # Register the query (hash + text); later calls can send the hash alone
+                apq.misses += 1
+                payload = await self._send({"query": query, "variables": variables, "extensions": extensions}, operation_name)
+                if "errors" not in payload:
+                    apq.registered.add(sha)
+            elif "errors" in payload:
+                # PersistedQueryNotSupported, a server that does not know the extension
+                # ("Must provide query string", 400), a genuine query error or a transient
+                # failure: retry with the full text either way.
+                apq.misses += 1
+                missing_query = _missing_query_text(payload)
+                payload = await self._send({"query": query, "variables": variables}, operation_name)
+                if code == "PERSISTED_QUERY_NOT_SUPPORTED" or (missing_query and "errors" not in payload):
+                    # Remember per endpoint so we stop paying the extra round trip, then probe again later
+                    apq.unsupported_until = time.monotonic() + settings.persisted_queries_retry_seconds
+                    logger.warning("graphql.apq_unsupported", endpoint=self.api_url, retry_seconds=settings.persisted_queries_retry_seconds)
+            else:
+                apq.hits += 1
+                apq.registered.add(sha)
+
+        if "errors" in payload:
+            logger.error("graphql.error", operation=operation_name, errors=payload["errors"])
+            raise ValueError(f"Mavvrik API Error: {payload['errors'][0]['message']}")
+
+        return payload.get("data", {})
+
+    async def _send(self, body: Dict[str, Any], operation_name: str) -> Dict[str, Any]:
+        client = get_http_client()
+        try:
+            # Never wait on the socket longer than the caller's deadline allows
+            time_left = remaining()
+            timeout = settings.request_timeout if time_left is None else max(min(settings.request_timeout, time_left), 0.001)
+
+            started = time.perf_counter()
+            with span("http.post", operation=operation_name, persisted="query" not in body) as s:
+                # Stream raw bytes so we can measure the wire size and decode cost ourselves
+                async with client.stream(
+                    "POST",
+                    self.api_url,
+                    json=body,
+                    headers={**self.headers, "Accept-Encoding": accept_encoding()},
+                    timeout=timeout
+                ) as response:
+                    raw = b"".join([chunk async for chunk in response.aiter_raw()])
+                encoding = response.headers.get("content-encoding", "identity")
+                s.set("status", response.status_code)
+                s.set("wire_bytes", len(raw))
+                s.set("encoding", encoding)
+            logger.info(
+                "graphql.request",
+                operation=operation_name,
+                status=response.status_code,
+                wire_bytes=len(raw),
+                encoding=encoding,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1)
+            )
+            if "query" not in body and 400 <= response.status_code < 500 and response.status_code not in (401, 403):
+                # Hash-only request rejected: hand back an error payload so _post can resend the full text
+                return _rejected_payload(raw, encoding, response.status_code)
+            response.raise_for_status()
+
+            with span("decode", wire_bytes=len(raw), encoding=encoding) as s:
+                content = decode_body(raw, encoding)
+                s.set("bytes", len(content))
+                return json.loads(content)
+
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 401:
+                raise ValueError("Access Denied: Invalid API Key.")
+            if e.response.status_code == 403:
+                # This often happens if the API Key is valid but the Tenant ID is wrong
+                raise ValueError(f"Permission Denied: API Key cannot access tenant '{self.headers.get('x-mavvrik-tenant')}'.")
+            raise ValueError(f"System Error ({e.response.status_code}).")
+
+        except httpx.TimeoutException as e:
+            if time_left is not None and timeout < settings.request_timeout:
+                raise DeadlineExceeded(f"Deadline exceeded during {operation_name}.")
+            raise ValueError(f"Connection Failed: {str(e)}")
+
+        except httpx.RequestError as e:
+            raise ValueError(f"Connection Failed: {str(e)}")
@@ -0,0 +1,139 @@
+import gzip
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config import settings
+from src.metrics import metrics
+
+# --- Optional Codecs ---
+# brotli and zstandard are optional; we only advertise what we can decode.
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on deployment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on deployment
+    zstandard = None
+
+def _zstd_decompress(data: bytes) -> bytes:
+    # Streaming reader: servers may omit the content size from the frame header
+    with zstandard.ZstdDecompressor().stream_reader(data) as reader:
+        return reader.read()
+
+_DECODERS: Dict[str, Callable[[bytes], bytes]] = {
+    "gzip": gzip.decompress,
+    "deflate": zlib.decompress,
+    "identity": lambda data: data,
+}
+if brotli is not None:
+    _DECODERS["br"] = brotli.decompress
+if zstandard is not None:
+    _DECODERS["zstd"] = _zstd_decompress
+
+def available_encodings() -> List[str]:
+    return [e for e in _DECODERS if e != "identity"]
+
+def accept_encoding() -> str:
+    """
+    Builds the Accept-Encoding header from `settings.response_encodings`
+    (preference order), limited to codecs installed in this deployment.
+    """
+    offered = [e for e in settings.response_encodings if e in _DECODERS and e != "identity"]
+    if not offered:
+        return "identity"
+    # Descending q-values express the configured preference
+    step = 1.0 / (len(offered) + 1)
+    return ", ".join(e if i == 0 else f"{e};q={1 - i * step:.1f}" for i, e in enumerate(offered))
+
+def decode_body(raw: bytes, content_encoding: Optional[str]) -> bytes:
+    """
+    Decodes a response body and records wire/decoded bytes and CPU time per
+    encoding, so compression ratios can be compared across deployments.
+    """
+    encodings = [e.strip().lower() for e in (content_encoding or "identity").split(",") if e.strip()]
+
+    started = time.process_time()
+    data = raw
+    # Content-Encoding lists codecs in the order they were applied
+    for encoding in reversed(encodings):
+        decoder = _DECODERS.get(encoding)
+        if decoder is None:
+            raise ValueError(f"Unsupported Content-Encoding '{encoding}'.")
+        data = decoder(data)
+    cpu_ms = (time.process_time() - started) * 1000
+
+    label = "+".join(encodings) or "identity"
+    metrics.incr("http.responses", encoding=label)
+    metrics.incr("http.wire_bytes", len(raw), encoding=label)
+    metrics.incr("http.decoded_bytes", len(data), encoding=label)
+    metrics.incr("http.decode_cpu_ms", cpu_ms, encoding=label)
+    return data
+
+# --- Cache Blob Codecs ---
+
+def _blob_codecs() -> Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]]:
+    codecs: Dict[str, Tuple[Callable[[bytes], bytes], Callable[[bytes], bytes]]] = {
+        "none": (lambda d: d, lambda d: d),
+        "zlib": (lambda d: zlib.compress(d, settings.cache_compression_level), zlib.decompress),
+    }
+    if zstandard is not None:
+        codecs["zstd"] = (
+            lambda d: zstandard.ZstdCompressor(level=settings.cache_compression_level).compress(d),
+            lambda d: zstandard.ZstdDecompressor().decompress(d),
+        )
+    if brotli is not None:
+        codecs["br"] = (lambda d: brotli.compress(d, quality=min(settings.cache_compression_level, 11)), brotli.decompress)
+    return codecs
+
+_BLOB_CODECS = _blob_codecs()
+
+def cache_codec() -> str:
+    """The configured cache codec, falling back to zlib when it is not installed."""
+    codec = settings.cache_compression
+    return codec if codec in _BLOB_CODECS else "zlib"
+
+def compress_blob(data: bytes, codec: str) -> bytes:
+    started = time.process_time()
+    blob = _BLOB_CODECS[codec][0](data)
+    metrics.incr("cache.compress_cpu_ms", (time.process_time() - started) * 1000, codec=codec)
+    metrics.incr("cache.raw_bytes", len(data), codec=codec)
+    metrics.incr("cache.stored_bytes", len(blob), codec=codec)
+    return blob
+
+def decompress_blob(blob: bytes, codec: str) -> bytes:
+    started = time.process_time()
+    data = _BLOB_CODECS[codec][1](blob)
+    metrics.incr("cache.decompress_cpu_ms", (time.process_time() - started) * 1000, codec=codec)
+    return data
+
+def compression_report() -> Dict[str, Any]:
+    """Per-encoding ratios and CPU cost derived from the raw counters."""
+    report: Dict[str, Any] = {"available": available_encodings(), "accept_encoding": accept_encoding(), "responses": {}, "cache": {}}
+
+    for encoding in metrics.label_values("http.responses", "encoding"):
+        count = metrics.get("http.responses", encoding=encoding)
+        wire = metrics.get("http.wire_bytes", encoding=encoding)
+        decoded = metrics.get("http.decoded_bytes", encoding=encoding)
+        report["responses"][encoding] = {
+            "responses": int(count),
+            "wire_bytes": int(wire),
+            "decoded_bytes": int(decoded),
+            "ratio": round(decoded / wire, 2) if wire else None,
+            "decode_cpu_ms_per_mb": round(metrics.get("http.decode_cpu_ms", encoding=encoding) / max(decoded / 1e6, 1e-9), 3),
+        }
+
+    for codec in metrics.label_values("cache.raw_bytes", "codec"):
+        raw = metrics.get("cache.raw_bytes", codec=codec)
+        stored = metrics.get("cache.stored_bytes", codec=codec)
+        report["cache"][codec] = {
+            "raw_bytes": int(raw),
+            "stored_bytes": int(stored),
+            "ratio": round(raw / stored, 2) if stored else None,
+            "compress_cpu_ms": round(metrics.get("cache.compress_cpu_ms", codec=codec), 3),
+            "decompress_cpu_ms": round(metrics.get("cache.decompress_cpu_ms", codec=codec), 3),
+        }
+
+    return report
@@ -1,23 +1,115 @@
-import os
-from typing import Optional
-from pydantic import Field
-from pydantic_settings import BaseSettings
-
-class Settings(BaseSettings):
-    # API Configuration
-    api_url: str = Field("https://graphql.mavvrik.dev", alias="MAVVRIK_API_URL")
-    
-    # Auth (Optional to prevent startup crashes)
-    dev_api_key: Optional[str] = Field(default=None, alias="MAVVRIK_API_KEY")
-    dev_tenant_id: Optional[str] = Field(default=None, alias="MAVVRIK_TENANT_ID")
-
-    # Guardrails & Timeouts
-    max_list_limit: int = 20 
-    request_timeout: float = 30.0 
-    
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore" 
-
+import os
+from typing import Dict, List, Optional
+from pydantic import Field
+from pydantic_settings import BaseSettings
+
+class Settings(BaseSettings):
+    # API Configuration
+    api_url: str = Field("https://graphql.mavvrik.dev", alias="MAVVRIK_API_URL")
+    
+    # Auth (Optional to prevent startup crashes)
+    dev_api_key: Optional[str] = Field(default=None, alias="MAVVRIK_API_KEY")
+    dev_tenant_id: Optional[str] = Field(default=None, alias="MAVVRIK_TENANT_ID")
+
+    # Guardrails & Timeouts
+    max_list_limit: int = 20 
+    request_timeout: float = 30.0 
+
+    # Automatic Persisted Queries: send the query hash first, full text only on a miss
+    persisted_queries: bool = True
+    # A backend that rejects persisted queries is probed again after this long
+    persisted_queries_retry_seconds: float = 3600.0
+
+    # Per-tool deadlines (seconds). Should stay below the MCP client's own timeout.
+    # Override individual tools via JSON, e.g. TOOL_DEADLINES='{"mvk_batch": 25}'
+    tool_deadline_seconds: float = 20.0
+    tool_deadlines: Dict[str, float] = Field(default_factory=dict)
+
+    # Connection Pool & Response Cache
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    cache_ttl_seconds: float = 300.0
+    cache_max_entries: int = 1024
+    # Global memory budget for cached results (bytes, measured on the stored form)
+    result_store_max_bytes: int = 64 * 1024 * 1024
+
+    # Compression. Response codecs are offered in this order if installed (brotli/zstandard are optional).
+    response_encodings: List[str] = Field(default_factory=lambda: ["zstd", "br", "gzip"])
+    # Cached entries are stored compressed: "zlib" | "zstd" | "br" | "none"
+    cache_compression: str = "zlib"
+    cache_compression_level: int = 6
+    # Optional on-disk cache tier (same TTL, compressed files). Entries hold tenant cost data:
+    # files are owner-only (0600); put the directory on an encrypted volume.
+    cache_dir: Optional[str] = None
+    # Expired entries are swept at most this often; the oldest entries go first beyond the size cap
+    cache_dir_sweep_seconds: float = 300.0
+    cache_dir_max_bytes: int = 256 * 1024 * 1024
+
+    # Trend Point Budget (per series) for adaptive granularity & downsampling
+    trend_max_points: int = 120
+
+    # Tag Breakdown (mvk_tag_costs). Rows are paged from the backend and folded into at most
+    # tag_aggregator_capacity counters, so memory stays flat for high-cardinality tags.
+    tag_aggregator_capacity: int = 2000
+    tag_page_size: int = 1000
+    tag_max_pages: int = 100
+
+    # Structured Logging (stderr). log_format: "json" | "console"
+    log_level: str = "INFO"
+    log_format: str = "json"
+    # Fraction of hot-path events kept, keyed by event name
+    log_sample_rates: Dict[str, float] = Field(default_factory=lambda: {"graphql.request": 0.1, "graphql.cache_hit": 0.01})
+    # Identical warnings/errors allowed per window before they are suppressed
+    log_repeat_limit: int = 5
+    log_repeat_window_seconds: float = 60.0
+
+    # Tracing (tool -> GraphQL -> formatting). 0.0 disables sampling entirely.
+    trace_sample_rate: float = 0.0
+    trace_file: Optional[str] = "mavvrik_traces.jsonl"
+    trace_otlp_endpoint: Optional[str] = None  # e.g. http://localhost:4318/v1/traces
+
+    # On-demand Profiling. PROFILE_TOOLS='["mvk_cost_trend"]' (or '["*"]') profiles every call of
+    # those tools; profile_sample_rate profiles a fraction of all calls. Adjustable at runtime
+    # via the mvk_admin_profiling tool.
+    profile_tools: List[str] = Field(default_factory=list)
+    profile_sample_rate: float = 0.0
+    profile_interval_ms: float = 5.0
+    profile_dir: str = "profiles"
+
+    # Bulk Export (mvk_cost_export). Files are written page by page; parquet needs pyarrow.
+    export_dir: str = "exports"
+    export_format: str = "parquet"
+    export_page_size: int = 5000
+    export_max_pages: int = 2000
+
+    # Offline Snapshots (src/snapshot.py). snapshot_mode: "off" | "fallback" | "prefer" | "only"
+    snapshot_mode: str = "off"
+    snapshot_dir: str = "snapshots"
+    snapshot_interval_seconds: float = 3600.0
+    snapshot_lookback_days: int = 400
+    # "prefer" mode only serves snapshots younger than this
+    snapshot_max_age_seconds: float = 6 * 3600.0
+    snapshot_groupings: List[str] = Field(default_factory=lambda: ["provider_code", "product_name", "service", "location_id", "billing_account_id", "resource_group_id"])
+    snapshot_k8s_groupings: List[str] = Field(default_factory=lambda: ["cluster_id", "namespace", "node"])
+    snapshot_page_size: int = 5000
+    snapshot_max_pages: int = 200
+
+    # Subscribable Resources (src/subscriptions.py). One poller per (tenant, view) refreshes
+    # subscribed resources; clients are notified only when the values change.
+    resource_poll_interval_seconds: float = 60.0
+    resource_poll_timeout_seconds: float = 20.0
+    # Failed polls back off exponentially from the interval up to this cap
+    resource_poll_max_backoff_seconds: float = 600.0
+    resource_trend_days: int = 30
+
+    # Batch Execution (mvk_batch)
+    batch_max_items: int = 10
+    batch_max_concurrency: int = 4
+    batch_max_output_chars: int = 40000
+    
+    class Config:
+        env_file = ".env"
+        env_file_encoding = "utf-8"
+        extra = "ignore" 
+
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,110 @@
+import asyncio
+import contextvars
+import functools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, List, Optional, Tuple
+
+from src.config import settings
+
+# Absolute monotonic deadline for the current tool call. Context variables are
+# copied into tasks created by asyncio.gather / create_task, so every backend
+# call made on behalf of a tool sees the same deadline.
+_current_deadline: ContextVar[Optional[float]] = ContextVar("mvk_deadline", default=None)
+
+class DeadlineExceeded(Exception):
+    """Raised when a tool's time budget runs out before a backend call completes."""
+
+def tool_deadline(tool_name: str) -> float:
+    """Returns the configured deadline (seconds) for a tool."""
+    return settings.tool_deadlines.get(tool_name, settings.tool_deadline_seconds)
+
+def remaining() -> Optional[float]:
+    """Seconds left before the current deadline, or None when no deadline is set."""
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[None]:
+    """
+    Applies a deadline to the enclosed block. Nested scopes can only tighten
+    the deadline, so a tool called from mvk_batch keeps the batch's budget.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _current_deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+
+    token = _current_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _current_deadline.reset(token)
+
+def detached_context() -> contextvars.Context:
+    """
+    A copy of the current context without a deadline, for work shared by
+    several callers (coalesced requests): each caller enforces its own
+    deadline while waiting, so the shared work must not inherit the first one.
+    """
+    context = contextvars.copy_context()
+    context.run(_current_deadline.set, None)
+    return context
+
+def enforce_deadline(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """
+    Decorator for MCP tools: runs the tool under its configured deadline and
+    turns an expired deadline into a readable tool result instead of a crash.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        seconds = tool_deadline(fn.__name__)
+        with deadline_scope(seconds):
+            try:
+                return await fn(*args, **kwargs)
+            except DeadlineExceeded:
+                return f"Deadline Exceeded: No results were available within {seconds:g}s."
+
+    return wrapper
+
+async def gather_partial(*aws: Awaitable[Any]) -> Tuple[List[Any], bool]:
+    """
+    Like asyncio.gather(), but stops at the current deadline.
+    Returns (results, partial): items that did not finish (or raised
+    DeadlineExceeded) are None, outstanding work is cancelled, and
+    `partial` is True if anything is missing. Other exceptions propagate.
+    """
+    tasks = [asyncio.ensure_future(aw) for aw in aws]
+    if not tasks:
+        return [], False
+
+    timeout = remaining()
+    if timeout is not None:
+        timeout = max(timeout, 0.0)
+
+    done, pending = await asyncio.wait(tasks, timeout=timeout)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.wait(pending)
+
+    results: List[Any] = []
+    partial = bool(pending)
+    for task in tasks:
+        if task in pending or task.cancelled():
+            results.append(None)
+            partial = True
+            continue
+        error = task.exception()
+        if isinstance(error, DeadlineExceeded):
+            results.append(None)
+            partial = True
+        elif error is not None:
+            raise error
+        else:
+            results.append(task.result())
+
+    return results, partial
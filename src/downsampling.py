@@ -0,0 +1,98 @@
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence
+
+# --- Interval Selection ---
+
+def _parse_date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+def choose_interval(from_date: str, to_date: str, max_points: int) -> str:
+    """
+    Picks the finest interval (day -> week -> month) whose point count
+    for the range fits within `max_points` per series.
+    """
+    start, end = _parse_date(from_date), _parse_date(to_date)
+    if start is None or end is None or end < start:
+        # Unknown range: keep the historical default and rely on downsampling
+        return "day"
+
+    days = (end - start).days + 1
+    if days <= max_points:
+        return "day"
+    if -(-days // 7) <= max_points:
+        return "week"
+    return "month"
+
+# --- Largest-Triangle-Three-Buckets ---
+
+def lttb_indices(xs: Sequence[float], ys: Sequence[float], threshold: int) -> List[int]:
+    """
+    Returns the indices of the points kept by the LTTB algorithm
+    (Steinarsson, 2013). Keeps the first and last points and, per bucket,
+    the point forming the largest triangle with its neighbours, which
+    preserves spikes and dips that plain averaging would flatten.
+    """
+    n = len(xs)
+    if threshold >= n:
+        return list(range(n))
+    if threshold < 3:
+        return [0, n - 1][:max(threshold, 0)]
+
+    kept = [0]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0
+
+    for i in range(threshold - 2):
+        # Average of the next bucket acts as the third triangle vertex
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        span = next_end - next_start
+        avg_x = sum(xs[next_start:next_end]) / span
+        avg_y = sum(ys[next_start:next_end]) / span
+
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        ax, ay = xs[a], ys[a]
+
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((ax - avg_x) * (ys[j] - ay) - (ax - xs[j]) * (avg_y - ay))
+            if area > best_area:
+                best, best_area = j, area
+
+        kept.append(best)
+        a = best
+
+    kept.append(n - 1)
+    return kept
+
+def downsample_rows(rows: List[Dict[str, Any]], max_points: int, series_key: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Downsamples `{"date": ..., "cost": ...}` rows to at most `max_points`
+    per series (rows grouped by `series_key`, e.g. "groupId").
+    Rows are returned in their original order.
+    """
+    series: Dict[Any, List[int]] = defaultdict(list)
+    for index, row in enumerate(rows):
+        series[row.get(series_key) if series_key else None].append(index)
+
+    keep: List[int] = []
+    for indices in series.values():
+        if len(indices) <= max_points:
+            keep.extend(indices)
+            continue
+
+        indices.sort(key=lambda i: str(rows[i].get("date")))
+        xs = []
+        for position, i in enumerate(indices):
+            parsed = _parse_date(rows[i].get("date"))
+            xs.append(float(parsed.toordinal()) if parsed else float(position))
+        ys = [float(rows[i].get("cost") or 0.0) for i in indices]
+
+        keep.extend(indices[k] for k in lttb_indices(xs, ys, max_points))
+
+    return [rows[i] for i in sorted(keep)]
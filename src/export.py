@@ -0,0 +1,195 @@
+import asyncio
+import os
+import re
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.heavy_hitters import SpaceSaving
+
+# --- Optional Parquet Support ---
+# pyarrow is optional; without it exports fall back to CSV.
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on deployment
+    pa = None
+    pq = None
+
+EXPORT_COLUMNS = ["date", "groupId", "groupName", "cost"]
+
+def parquet_available() -> bool:
+    return pq is not None
+
+# --- Chunk Writers ---
+
+class CsvChunkWriter:
+    """Appends each page to one CSV file; only the current page is in memory."""
+
+    extension = "csv"
+
+    def __init__(self, path: str):
+        self._file = open(path, "w", encoding="utf-8", newline="")
+        self._header = True
+
+    def write(self, frame: pd.DataFrame) -> None:
+        frame.to_csv(self._file, header=self._header, index=False)
+        self._header = False
+
+    def close(self) -> None:
+        self._file.close()
+
+class ParquetChunkWriter:
+    """Writes each page as its own row group of a single Parquet file."""
+
+    extension = "parquet"
+
+    def __init__(self, path: str):
+        self._schema = pa.schema([
+            ("date", pa.string()),
+            ("groupId", pa.string()),
+            ("groupName", pa.string()),
+            ("cost", pa.float64()),
+        ])
+        self._writer = pq.ParquetWriter(path, self._schema, compression="zstd")
+
+    def write(self, frame: pd.DataFrame) -> None:
+        self._writer.write_table(pa.Table.from_pandas(frame, schema=self._schema, preserve_index=False))
+
+    def close(self) -> None:
+        self._writer.close()
+
+def export_path(export_dir: str, dataset: str, group_by: str, from_date: str, to_date: str, extension: str) -> str:
+    os.makedirs(export_dir, exist_ok=True)
+    # Random suffix: two exports of the same range within one second must not share a file
+    stamp = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+    # Tool arguments end up in the file name: keep it to a safe character set
+    name = re.sub(r"[^A-Za-z0-9_.-]+", "-", f"{dataset}_{group_by}_{from_date}_{to_date}_{stamp}")
+    return os.path.abspath(os.path.join(export_dir, f"{name}.{extension}"))
+
+# --- Summary ---
+
+class ExportSummary:
+    """Running statistics over exported rows, independent of the row count."""
+
+    def __init__(self, top_groups: int = 5):
+        self.rows = 0
+        self.pages = 0
+        self.total_cost = 0.0
+        self.first_date: Optional[str] = None
+        self.last_date: Optional[str] = None
+        self._groups = SpaceSaving(1000)
+        self._top_groups = top_groups
+
+    def add(self, frame: pd.DataFrame) -> None:
+        self.rows += len(frame)
+        self.pages += 1
+        if frame.empty:
+            return
+        self.total_cost += float(frame["cost"].sum())
+        dates = frame["date"].dropna()
+        if not dates.empty:
+            lo, hi = dates.min(), dates.max()
+            self.first_date = lo if self.first_date is None else min(self.first_date, lo)
+            self.last_date = hi if self.last_date is None else max(self.last_date, hi)
+        for group, cost in frame.groupby("groupName", sort=False)["cost"].sum().items():
+            self._groups.add(str(group), float(cost))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "pages": self.pages,
+            "total_cost": round(self.total_cost, 2),
+            "date_range": [self.first_date, self.last_date],
+            "top_groups": [
+                {"group": group, "cost": round(cost, 2)} for group, cost, _ in self._groups.top(self._top_groups)
+            ],
+        }
+
+# --- Pipeline ---
+
+def _frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    frame = pd.DataFrame.from_records(rows, columns=EXPORT_COLUMNS)
+    frame["cost"] = pd.to_numeric(frame["cost"], errors="coerce")
+    for column in ("date", "groupId", "groupName"):
+        frame[column] = frame[column].astype("string")
+    return frame
+
+async def export_pages(
+    fetch_page: Callable[[int], Awaitable[List[Dict[str, Any]]]],
+    path: str,
+    file_format: str,
+    page_size: int,
+    max_pages: int,
+) -> Dict[str, Any]:
+    """
+    Streams pages from `fetch_page(page_no)` into `path`.
+
+    The next page is fetched while the current one is written (in a worker
+    thread), so at most two pages are held in memory. The file is written
+    under a temporary name and renamed when complete; if fetching stops
+    early (deadline, backend error) the rows written so far are kept and
+    the error is returned in `stopped_by`.
+    """
+    writer_cls = ParquetChunkWriter if file_format == "parquet" else CsvChunkWriter
+    partial_path = f"{path}.partial"
+    writer = await asyncio.to_thread(writer_cls, partial_path)
+    summary = ExportSummary()
+    started = time.perf_counter()
+    stopped_by: Optional[BaseException] = None
+    truncated = False
+
+    pending: Optional["asyncio.Future[List[Dict[str, Any]]]"] = asyncio.ensure_future(fetch_page(1))
+    try:
+        page_no = 1
+        while pending is not None:
+            try:
+                rows = await pending
+            except Exception as e:
+                stopped_by, pending = e, None
+                break
+
+            # Prefetch while this page is being written
+            pending = None
+            if len(rows) >= page_size:
+                if page_no < max_pages:
+                    page_no += 1
+                    pending = asyncio.ensure_future(fetch_page(page_no))
+                else:
+                    truncated = True
+
+            frame = _frame(rows)
+            await asyncio.to_thread(writer.write, frame)
+            summary.add(frame)
+            del frame, rows
+    except BaseException:
+        # Cancelled or failed while writing: never leave a half-written file behind
+        if pending is not None:
+            pending.cancel()
+        writer.close()
+        os.remove(partial_path)
+        raise
+    await asyncio.to_thread(writer.close)
+
+    if summary.rows == 0 and stopped_by is not None:
+        os.remove(partial_path)
+        raise stopped_by
+    os.replace(partial_path, path)
+
+    result = summary.to_dict()
+    result.update({
+        "path": path,
+        "format": file_format,
+        "columns": EXPORT_COLUMNS,
+        "file_bytes": os.path.getsize(path),
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+        "complete": stopped_by is None and not truncated,
+    })
+    if truncated:
+        result["stopped_by"] = f"page limit ({max_pages} pages of {page_size} rows)"
+    elif stopped_by is not None:
+        result["stopped_by"] = f"{type(stopped_by).__name__}: {stopped_by}"
+    return result
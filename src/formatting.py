@@ -1,32 +1,103 @@
-import json
-from datetime import datetime
-from typing import Any
-
-def format_cost_response(data: Any, title: str, filter_query: str) -> str:
-    """
-    Standardized formatter for all Mavvrik MCP tools.
-    Enforces the 'Context Injection' requirement from the PDF.
-    """
-    # 1. Header (Context)
-    header = (
-        f"### {title}\n"
-        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
-        f"**Source:** Mavvrik Intelligence Engine (Net Billable USD)\n"
-    )
-
-    # 2. Body (Data)
-    if not data or (isinstance(data, list) and len(data) == 0):
-        body = "\n> _No cost data found for the specified parameters._\n"
-    else:
-        # We assume the LLM handles the JSON parsing and explanation.
-        # We keep the raw JSON clean for the model to read.
-        body = f"\n```json\n{json.dumps(data, indent=2)}\n```\n"
-
-    # 3. Footer (Verification)
-    verify_url = f"https://app.mavvrik.ai/cost?{filter_query}"
-    footer = (
-        f"\n---\n"
-        f"🔍 [**Click here to verify this data in the Mavvrik Dashboard**]({verify_url})\n"
-    )
-
-    return f"{header}{body}{footer}"
\ No newline at end of file
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from src.tracing import span
+
+# Prefixes of the plain-text failures tools return instead of raising
+# ("Validation Error: ...", "Execution Error: ...", "Deadline Exceeded: ...")
+ERROR_PREFIXES = ("Validation Error", "Execution Error", "Deadline Exceeded", "Error", "API Error")
+
+def format_cost_response(data: Any, title: str, filter_query: str, partial_reason: Optional[str] = None,
+                         data_as_of: Optional[str] = None) -> str:
+    """
+    Standardized formatter for all Mavvrik MCP tools.
+    Enforces the 'Context Injection' requirement from the PDF.
+    `partial_reason` marks results that are incomplete (e.g. a deadline hit).
+    `data_as_of` labels results served from an offline snapshot instead of live data.
+    """
+    with span("format", title=title) as s:
+        output = _render_cost_response(data, title, filter_query, partial_reason, data_as_of)
+        s.set("output_chars", len(output))
+    return output
+
+def _render_cost_response(data: Any, title: str, filter_query: str, partial_reason: Optional[str], data_as_of: Optional[str]) -> str:
+    # 1. Header (Context)
+    header = (
+        f"### {title}\n"
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+        f"**Source:** Mavvrik Intelligence Engine (Net Billable USD)\n"
+    )
+    if data_as_of:
+        header += f"**Data As Of:** {data_as_of}\n"
+    if partial_reason:
+        header += f"**Status:** ⚠️ PARTIAL RESULT - {partial_reason}\n"
+
+    # 2. Body (Data)
+    if not data or (isinstance(data, list) and len(data) == 0):
+        body = "\n> _No cost data found for the specified parameters._\n"
+    else:
+        # We assume the LLM handles the JSON parsing and explanation.
+        # We keep the raw JSON clean for the model to read.
+        body = f"\n```json\n{json.dumps(data, indent=2)}\n```\n"
+
+    # 3. Footer (Verification)
+    verify_url = f"https://app.mavvrik.ai/cost?{filter_query}"
+    footer = (
+        f"\n---\n"
+        f"🔍 [**Click here to verify this data in the Mavvrik Dashboard**]({verify_url})\n"
+    )
+
+    return f"{header}{body}{footer}"
+
+def allocate_output_budget(lengths: List[int], total_budget: int) -> List[int]:
+    """
+    Splits a character budget across several outputs (water-filling).
+    Short outputs keep their full length and hand their unused share
+    to longer ones, so only the largest sections get truncated.
+    """
+    budgets = [0] * len(lengths)
+    remaining = total_budget
+    pending = sorted(range(len(lengths)), key=lambda i: lengths[i])
+
+    for position, index in enumerate(pending):
+        fair_share = remaining // (len(pending) - position)
+        budgets[index] = min(lengths[index], fair_share)
+        remaining -= budgets[index]
+
+    return budgets
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """
+    Cuts `text` so the result, including the truncation note and a closing
+    code fence when the cut falls inside a ```json block, fits in `budget`.
+    """
+    if len(text) <= budget:
+        return text
+    # Sized for the largest possible count so the note never pushes the result over budget
+    note = "\n\n> _[Truncated {} characters to fit the batch response budget]_\n"
+    reserve = len(note.format(len(text))) + len("\n```")
+    kept = text[:max(budget - reserve, 0)]
+    if kept.count("```") % 2:
+        kept += "\n```"
+    return kept + note.format(len(text) - len(kept))
+
+def format_batch_response(sections: List[Tuple[str, str]], total_budget: int, partial_reason: Optional[str] = None) -> str:
+    """
+    Combines the outputs of several tool calls into one size-budgeted response.
+    `sections` is a list of (heading, body) pairs in request order; the
+    budget covers the whole response, headings and status line included.
+    """
+    header = f"## Batch Results ({len(sections)} queries)\n"
+    if partial_reason:
+        header += f"**Status:** ⚠️ PARTIAL RESULT - {partial_reason}\n"
+    headings = [f"\n#### {heading}\n" for heading, _ in sections]
+
+    body_budget = max(total_budget - len(header) - sum(len(h) for h in headings), 0)
+    budgets = allocate_output_budget([len(body) for _, body in sections], body_budget)
+
+    parts = [header]
+    for heading, (_, body), budget in zip(headings, sections, budgets):
+        parts.append(f"{heading}{truncate_to_budget(body, budget)}")
+
+    return "".join(parts)
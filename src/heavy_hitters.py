@@ -0,0 +1,115 @@
+import heapq
+from typing import Any, Dict, List, Tuple
+
+# --- Weighted Space-Saving ---
+
+class SpaceSaving:
+    """
+    Bounded-memory heavy-hitter summary over a stream of (key, weight) pairs
+    (Metwally et al., 2005, weighted variant). At most `capacity` keys are
+    tracked; when a new key arrives and the table is full, it replaces the
+    smallest counter and inherits its value as `error`.
+
+    Guarantees for every tracked key: `count - error <= true <= count`.
+    Any untracked key's true weight is at most `min_count()`, so every key
+    heavier than total/capacity is always tracked.
+
+    Weights must be non-negative; negative amounts (credits, refunds) are
+    accumulated separately in `negative_total` and only affect the total.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._counts: Dict[str, float] = {}
+        self._errors: Dict[str, float] = {}
+        # Lazy min-heap of (count, key); stale records are skipped on pop
+        self._heap: List[Tuple[float, str]] = []
+        self.total = 0.0
+        self.negative_total = 0.0
+        self.items_seen = 0
+        self.replacements = 0
+
+    def add(self, key: str, weight: float) -> None:
+        self.items_seen += 1
+        self.total += weight
+        if weight < 0:
+            self.negative_total += weight
+            return
+
+        count = self._counts.get(key)
+        if count is not None:
+            self._counts[key] = count + weight
+        elif len(self._counts) < self.capacity:
+            self._counts[key] = weight
+            self._errors[key] = 0.0
+        else:
+            floor_key, floor = self._pop_min()
+            del self._counts[floor_key]
+            del self._errors[floor_key]
+            self._counts[key] = floor + weight
+            self._errors[key] = floor
+            self.replacements += 1
+
+        heapq.heappush(self._heap, (self._counts[key], key))
+        if len(self._heap) > 4 * self.capacity + 64:
+            self._heap = [(c, k) for k, c in self._counts.items()]
+            heapq.heapify(self._heap)
+
+    def _pop_min(self) -> Tuple[str, float]:
+        while True:
+            count, key = heapq.heappop(self._heap)
+            if self._counts.get(key) == count:
+                return key, count
+
+    def min_count(self) -> float:
+        """Upper bound on the weight of any key that is not tracked (0 while exact)."""
+        if self.replacements == 0 or not self._counts:
+            return 0.0
+        return min(self._counts.values())
+
+    @property
+    def exact(self) -> bool:
+        return self.replacements == 0
+
+    def top(self, k: int) -> List[Tuple[str, float, float]]:
+        """The `k` largest counters as (key, count, error), heaviest first."""
+        ranked = heapq.nlargest(k, self._counts.items(), key=lambda kv: kv[1])
+        return [(key, count, self._errors[key]) for key, count in ranked]
+
+    def significant(self, limit: int, min_share: float) -> Dict[str, Any]:
+        """
+        Splits the stream into reported keys and an "other" remainder.
+
+        A key is reported when it ranks within `limit` and its guaranteed
+        weight (count - error) is at least `min_share` of the positive total.
+        The remainder is given as a range because reported counts may
+        overestimate by up to their error. `unlisted_max` bounds the weight
+        of any single key not reported: tracked keys cut by `limit` or
+        `min_share` as well as keys that were never tracked.
+        """
+        positive_total = self.total - self.negative_total
+        threshold = positive_total * min_share
+        values = []
+        for key, count, error in self.top(limit):
+            if count - error >= threshold:
+                values.append({"key": key, "count": count, "error": error})
+
+        reported = {v["key"] for v in values}
+        unlisted_tracked = max((c for k, c in self._counts.items() if k not in reported), default=0.0)
+
+        reported_high = sum(v["count"] for v in values)
+        reported_low = sum(v["count"] - v["error"] for v in values)
+        return {
+            "values": values,
+            "other": {
+                "low": max(positive_total - reported_high, 0.0),
+                "high": max(positive_total - reported_low, 0.0),
+            },
+            "unlisted_max": max(unlisted_tracked, self.min_count()),
+            "positive_total": positive_total,
+        }
+
+    def __len__(self) -> int:
+        return len(self._counts)
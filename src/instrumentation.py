@@ -0,0 +1,48 @@
+import functools
+from typing import Any, Awaitable, Callable
+
+from mcp.server.fastmcp import Context, FastMCP
+
+from src.deadline import enforce_deadline
+from src.logs import correlation_scope
+from src.profiling import profiled
+from src.tracing import traced_tool
+
+ToolFn = Callable[..., Awaitable[str]]
+
+def _mcp_request_id(ctx: Any) -> Any:
+    try:
+        return ctx.request_id
+    except (AttributeError, ValueError):
+        # No ctx, or called outside an MCP request (e.g. tests, scripts)
+        return None
+
+def _tool_context(args: Any, kwargs: Any) -> Any:
+    # FastMCP passes ctx by keyword; tools calling each other may pass it positionally
+    if "ctx" in kwargs:
+        return kwargs["ctx"]
+    return next((arg for arg in args if isinstance(arg, Context)), None)
+
+def correlated(fn: ToolFn) -> ToolFn:
+    """Decorator for MCP tools: binds a correlation ID and the tool name to all log lines."""
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        with correlation_scope(tool=fn.__name__, mcp_request_id=_mcp_request_id(_tool_context(args, kwargs))):
+            return await fn(*args, **kwargs)
+
+    return wrapper
+
+def instrumented_tool(mcp: FastMCP) -> Callable[[ToolFn], ToolFn]:
+    """
+    Replacement for `@mcp.tool()` that applies the cross-cutting wrappers
+    every Mavvrik tool needs, outermost first:
+    correlation ID -> tracing span -> profiling -> deadline.
+    Returns the wrapped function so tools calling each other (mvk_batch)
+    go through the same pipeline.
+    """
+    def decorator(fn: ToolFn) -> ToolFn:
+        wrapped = correlated(traced_tool(profiled(enforce_deadline(fn))))
+        mcp.tool()(wrapped)
+        return wrapped
+
+    return decorator
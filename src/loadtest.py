@@ -0,0 +1,422 @@
+"""
+Concurrent-session load generator for the MCP server's network transports.
+
+Opens many MCP sessions (SSE or streamable HTTP), replays a weighted mix of
+`mvk_*` tool calls through a ramp of concurrency stages and reports per-stage
+throughput, latency percentiles and error rate, a timeline of server
+event-loop lag and memory (polled from `mvk_server_metrics`), and the stage
+where the server saturated:
+
+    python -m src.loadtest --spawn --stages 10:20,25:20,50:30,100:30
+    python -m src.loadtest --url http://127.0.0.1:8000/sse --mix mvk_cost_overview=3,mvk_cost_trend=1
+
+`--spawn` starts the stand-in backend (src.mock_backend) and the server as
+subprocesses, so results reflect the MCP layer rather than the real API.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+from src.formatting import ERROR_PREFIXES
+from src.runtime import LoopLagMonitor, process_memory
+
+# --- Workload ---
+
+def _month(months_ago: int) -> date:
+    today = date.today().replace(day=1)
+    for _ in range(months_ago):
+        today = (today - timedelta(days=1)).replace(day=1)
+    return today
+
+def _window(max_months: int = 6) -> Tuple[str, str]:
+    start = _month(random.randint(1, max_months))
+    end = start + timedelta(days=random.choice([7, 14, 30, 60, 90]))
+    return start.isoformat(), min(end, date.today()).isoformat()
+
+def _overview_args() -> Dict[str, Any]:
+    from_date, to_date = _window()
+    return {"from_date": from_date, "to_date": to_date, "provider": random.choice([None, "aws", "gcp"])}
+
+def _trend_args() -> Dict[str, Any]:
+    from_date, to_date = _window()
+    return {"from_date": from_date, "to_date": to_date, "split_by": random.choice([None, "provider_code", "product_name"])}
+
+def _rankings_args() -> Dict[str, Any]:
+    return {
+        "month": _month(random.randint(1, 6)).strftime("%Y-%m"),
+        "category": random.choice(["product_name", "service", "location_id"]),
+        "limit": random.choice([5, 10]),
+    }
+
+def _k8s_args() -> Dict[str, Any]:
+    from_date, to_date = _window()
+    return {"from_date": from_date, "to_date": to_date, "group_by": random.choice(["cluster_id", "namespace"])}
+
+def _compare_args() -> Dict[str, Any]:
+    base, comp = _month(2), _month(1)
+    return {
+        "base_start": base.isoformat(), "base_end": (comp - timedelta(days=1)).isoformat(),
+        "comp_start": comp.isoformat(), "comp_end": (_month(0) - timedelta(days=1)).isoformat(),
+    }
+
+# Randomised arguments keep the cache hit rate realistic instead of 100%
+ARGUMENT_FACTORIES: Dict[str, Callable[[], Dict[str, Any]]] = {
+    "mvk_cost_overview": _overview_args,
+    "mvk_cost_trend": _trend_args,
+    "mvk_cost_rankings": _rankings_args,
+    "mvk_k8s_drilldown": _k8s_args,
+    "mvk_cost_compare": _compare_args,
+}
+
+DEFAULT_MIX = "mvk_cost_overview=4,mvk_cost_trend=3,mvk_cost_rankings=3,mvk_k8s_drilldown=1,mvk_cost_compare=1"
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in ARGUMENT_FACTORIES:
+            raise ValueError(f"Unknown tool '{name}' in mix. Options: {', '.join(ARGUMENT_FACTORIES)}")
+        mix[name] = float(weight or 1)
+    if not mix or sum(mix.values()) <= 0:
+        raise ValueError("Tool mix must contain at least one positive weight.")
+    return mix
+
+def parse_stages(spec: str) -> List[Tuple[int, float]]:
+    """'10:30,50:60' -> hold 10 sessions for 30s, then 50 sessions for 60s."""
+    stages = []
+    for part in filter(None, (p.strip() for p in spec.split(","))):
+        sessions, _, seconds = part.partition(":")
+        stages.append((int(sessions), float(seconds or 30)))
+    if not stages:
+        raise ValueError("At least one stage is required.")
+    return stages
+
+def percentile(ordered: List[float], q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(int(len(ordered) * q), len(ordered) - 1)]
+
+# --- Measurement ---
+
+class Recorder:
+    """Collects call outcomes, bucketed by the stage that was running."""
+
+    def __init__(self) -> None:
+        self.stage = 0
+        self.latencies: Dict[int, List[float]] = {}
+        self.errors: Dict[int, Dict[str, int]] = {}
+        self.calls_by_tool: Dict[int, Dict[str, int]] = {}
+        self._interval_latencies: List[float] = []
+        self._interval_errors = 0
+
+    def record(self, tool: str, latency_ms: float, error: Optional[str]) -> None:
+        self.latencies.setdefault(self.stage, []).append(latency_ms)
+        by_tool = self.calls_by_tool.setdefault(self.stage, {})
+        by_tool[tool] = by_tool.get(tool, 0) + 1
+        self._interval_latencies.append(latency_ms)
+        if error:
+            errors = self.errors.setdefault(self.stage, {})
+            errors[error] = errors.get(error, 0) + 1
+            self._interval_errors += 1
+
+    def drain_interval(self) -> Tuple[List[float], int]:
+        latencies, errors = self._interval_latencies, self._interval_errors
+        self._interval_latencies, self._interval_errors = [], 0
+        return latencies, errors
+
+def _classify(result: Any) -> Optional[str]:
+    """Tools report most failures as text, so look at both the flag and the body."""
+    text = "".join(getattr(c, "text", "") for c in result.content)
+    if result.isError:
+        return "tool_error"
+    if text.startswith("Deadline Exceeded"):
+        return "deadline"
+    if "PARTIAL RESULT" in text:
+        return "partial"
+    if text.startswith(ERROR_PREFIXES):
+        return "error"
+    return None
+
+@asynccontextmanager
+async def open_session(url: str, transport: str) -> AsyncIterator[ClientSession]:
+    if transport == "sse":
+        streams = sse_client(url, timeout=30, sse_read_timeout=300)
+    else:
+        streams = streamablehttp_client(url, timeout=30, sse_read_timeout=300)
+    async with streams as opened:
+        read, write = opened[0], opened[1]
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            yield session
+
+# --- Virtual Users ---
+
+async def virtual_user(url: str, transport: str, mix: Dict[str, float], think_ms: float,
+                       recorder: Recorder, stop: asyncio.Event) -> None:
+    """One simulated agent: a long-lived session issuing calls with think time between them."""
+    tools, weights = list(mix), list(mix.values())
+    while not stop.is_set():
+        try:
+            async with open_session(url, transport) as session:
+                while not stop.is_set():
+                    tool = random.choices(tools, weights)[0]
+                    started = time.perf_counter()
+                    try:
+                        result = await session.call_tool(tool, ARGUMENT_FACTORIES[tool]())
+                        error = _classify(result)
+                    except Exception as e:
+                        error = f"exception:{type(e).__name__}"
+                    recorder.record(tool, (time.perf_counter() - started) * 1000, error)
+                    if think_ms > 0:
+                        await _sleep_or_stop(stop, random.expovariate(1000 / think_ms))
+        except Exception as e:
+            recorder.record("session", 0.0, f"session:{type(e).__name__}")
+            await _sleep_or_stop(stop, 1.0)
+
+async def _sleep_or_stop(stop: asyncio.Event, seconds: float) -> None:
+    try:
+        await asyncio.wait_for(stop.wait(), timeout=seconds)
+    except asyncio.TimeoutError:
+        pass
+
+def _parse_admin_json(text: str) -> Dict[str, Any]:
+    match = re.search(r"```json\n(.*)\n```", text, re.S)
+    return json.loads(match.group(1)) if match else {}
+
+async def monitor(url: str, transport: str, recorder: Recorder, users: List[Any],
+                  client_lag: LoopLagMonitor, interval: float, timeline: List[Dict[str, Any]],
+                  stop: asyncio.Event) -> None:
+    """Samples server runtime stats and client-side throughput every `interval` seconds."""
+    started = time.perf_counter()
+    async with open_session(url, transport) as session:
+        while not stop.is_set():
+            await _sleep_or_stop(stop, interval)
+            latencies, errors = recorder.drain_interval()
+            latencies.sort()
+            point: Dict[str, Any] = {
+                "t": round(time.perf_counter() - started, 1),
+                "stage": recorder.stage,
+                "sessions": len(users),
+                "throughput_rps": round(len(latencies) / interval, 2),
+                "p50_ms": _round(percentile(latencies, 0.50)),
+                "p99_ms": _round(percentile(latencies, 0.99)),
+                "errors": errors,
+                "client_loop_lag_p99_ms": client_lag.stats().get("p99_ms"),
+            }
+            try:
+                result = await session.call_tool("mvk_server_metrics", {})
+                runtime = _parse_admin_json("".join(getattr(c, "text", "") for c in result.content)).get("runtime", {})
+                lag = runtime.get("event_loop_lag", {})
+                point.update({
+                    "server_loop_lag_last_ms": lag.get("last_ms"),
+                    "server_loop_lag_p99_ms": lag.get("p99_ms"),
+                    "server_rss_mib": runtime.get("memory", {}).get("rss_mib"),
+                })
+            except Exception as e:
+                point["server_metrics_error"] = type(e).__name__
+            timeline.append(point)
+            print(
+                f"  t={point['t']:>6}s sessions={point['sessions']:>4} rps={point['throughput_rps']:>7} "
+                f"p99={point['p99_ms']}ms loop_lag_p99={point.get('server_loop_lag_p99_ms')}ms "
+                f"rss={point.get('server_rss_mib')}MiB errors={errors}",
+                flush=True,
+            )
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return None if value is None else round(value, 1)
+
+# --- Ramp & Report ---
+
+def summarize_stage(index: int, sessions: int, seconds: float, recorder: Recorder) -> Dict[str, Any]:
+    latencies = sorted(recorder.latencies.get(index, []))
+    errors = recorder.errors.get(index, {})
+    calls = len(latencies)
+    return {
+        "stage": index,
+        "sessions": sessions,
+        "seconds": seconds,
+        "calls": calls,
+        "throughput_rps": round(calls / seconds, 2) if seconds else 0.0,
+        "p50_ms": _round(percentile(latencies, 0.50)),
+        "p90_ms": _round(percentile(latencies, 0.90)),
+        "p99_ms": _round(percentile(latencies, 0.99)),
+        "max_ms": _round(latencies[-1] if latencies else None),
+        "error_rate": round(sum(errors.values()) / calls, 4) if calls else 0.0,
+        "errors": errors,
+        "calls_by_tool": recorder.calls_by_tool.get(index, {}),
+    }
+
+def find_saturation(stages: List[Dict[str, Any]], p99_factor: float, max_error_rate: float,
+                    min_throughput_gain: float) -> Dict[str, Any]:
+    """
+    The first stage where p99 exceeds `p99_factor` x the first stage's p99,
+    errors exceed `max_error_rate`, or adding sessions stopped adding throughput.
+    """
+    baseline = stages[0]["p99_ms"] if stages else None
+    for previous, stage in zip([None] + stages[:-1], stages):
+        reasons = []
+        if baseline and stage["p99_ms"] and stage["p99_ms"] > baseline * p99_factor:
+            reasons.append(f"p99 {stage['p99_ms']}ms > {p99_factor}x baseline ({baseline}ms)")
+        if stage["error_rate"] > max_error_rate:
+            reasons.append(f"error rate {stage['error_rate']:.2%} > {max_error_rate:.2%}")
+        if previous and stage["sessions"] > previous["sessions"] and previous["throughput_rps"] > 0:
+            gain = stage["throughput_rps"] / previous["throughput_rps"]
+            if gain < min_throughput_gain:
+                reasons.append(f"throughput gain x{gain:.2f} for x{stage['sessions'] / previous['sessions']:.2f} sessions")
+        if reasons:
+            return {
+                "saturated_at_sessions": stage["sessions"],
+                "last_healthy_sessions": previous["sessions"] if previous else None,
+                "reasons": reasons,
+            }
+    return {"saturated_at_sessions": None, "last_healthy_sessions": stages[-1]["sessions"] if stages else None, "reasons": []}
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    mix = parse_mix(args.mix)
+    stages = parse_stages(args.stages)
+    recorder = Recorder()
+    client_lag = LoopLagMonitor()
+    client_lag.ensure_started()
+
+    users: List[Tuple["asyncio.Task[None]", asyncio.Event]] = []
+    timeline: List[Dict[str, Any]] = []
+    monitor_stop = asyncio.Event()
+    monitor_task = asyncio.create_task(
+        monitor(args.url, args.transport, recorder, users, client_lag, args.metrics_interval, timeline, monitor_stop)
+    )
+
+    results = []
+    for index, (target, seconds) in enumerate(stages):
+        recorder.stage = index
+        print(f"Stage {index}: {target} sessions for {seconds:.0f}s", flush=True)
+        while len(users) < target:
+            stop = asyncio.Event()
+            users.append((asyncio.create_task(virtual_user(args.url, args.transport, mix, args.think_ms, recorder, stop)), stop))
+        while len(users) > target:
+            users.pop()[1].set()
+        await asyncio.sleep(seconds)
+        results.append(summarize_stage(index, target, seconds, recorder))
+
+    for _, stop in users:
+        stop.set()
+    monitor_stop.set()
+    await asyncio.gather(*(task for task, _ in users), monitor_task, return_exceptions=True)
+
+    return {
+        "config": {
+            "url": args.url, "transport": args.transport, "stages": args.stages,
+            "mix": mix, "think_ms": args.think_ms,
+        },
+        "stages": results,
+        "saturation": find_saturation(results, args.p99_factor, args.max_error_rate, args.min_throughput_gain),
+        "timeline": timeline,
+        "load_generator": {"loop_lag": client_lag.stats(), "memory": process_memory()},
+    }
+
+def print_report(report: Dict[str, Any]) -> None:
+    print("\nstage sessions   calls     rps    p50_ms    p90_ms    p99_ms  err_rate")
+    for s in report["stages"]:
+        print(
+            f"{s['stage']:>5} {s['sessions']:>8} {s['calls']:>7} {s['throughput_rps']:>7} "
+            f"{s['p50_ms']!s:>9} {s['p90_ms']!s:>9} {s['p99_ms']!s:>9} {s['error_rate']:>9.2%}"
+        )
+    saturation = report["saturation"]
+    if saturation["saturated_at_sessions"] is None:
+        print(f"\nNo saturation detected up to {saturation['last_healthy_sessions']} sessions.")
+    else:
+        print(f"\nSaturated at {saturation['saturated_at_sessions']} sessions "
+              f"(last healthy: {saturation['last_healthy_sessions']}): {'; '.join(saturation['reasons'])}")
+    client_lag = report["load_generator"]["loop_lag"].get("p99_ms")
+    if client_lag and client_lag > 50:
+        print(f"Warning: load generator loop lag p99 {client_lag}ms; it may be the bottleneck.")
+
+# --- Local Stack ---
+
+def _wait_for_port(host: str, port: int, timeout: float = 20.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"Nothing listening on {host}:{port} after {timeout:.0f}s")
+
+def spawn_stack(args: argparse.Namespace) -> List[subprocess.Popen]:
+    """Starts the stand-in backend and the MCP server, returning the processes."""
+    backend_port, server_port = args.backend_port, args.server_port
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "src.mock_backend", "--port", str(backend_port), "--latency-ms", str(args.backend_latency_ms)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    _wait_for_port("127.0.0.1", backend_port)
+
+    env = {
+        **os.environ,
+        "MAVVRIK_API_URL": f"http://127.0.0.1:{backend_port}",
+        "MAVVRIK_API_KEY": os.environ.get("MAVVRIK_API_KEY", "loadtest"),
+        "MAVVRIK_TENANT_ID": os.environ.get("MAVVRIK_TENANT_ID", "loadtest"),
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING"),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.server", "--transport", args.transport, "--port", str(server_port)],
+        env=env, stdout=subprocess.DEVNULL, stderr=None if args.server_logs else subprocess.DEVNULL,
+    )
+    _wait_for_port("127.0.0.1", server_port)
+    args.url = f"http://127.0.0.1:{server_port}{'/sse' if args.transport == 'sse' else '/mcp'}"
+    return [server, backend]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent-session load test for the Mavvrik MCP server")
+    parser.add_argument("--url", help="Server endpoint, e.g. http://127.0.0.1:8000/sse (or /mcp for streamable-http)")
+    parser.add_argument("--transport", choices=["sse", "streamable-http"], default="sse")
+    parser.add_argument("--stages", default="5:20,10:20,25:20,50:30,100:30", help="sessions:seconds ramp profile")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="tool=weight list")
+    parser.add_argument("--think-ms", type=float, default=200.0, help="Mean pause between calls per session")
+    parser.add_argument("--metrics-interval", type=float, default=5.0, help="Seconds between timeline samples")
+    parser.add_argument("--p99-factor", type=float, default=2.0, help="Saturated when p99 exceeds this x baseline")
+    parser.add_argument("--max-error-rate", type=float, default=0.01)
+    parser.add_argument("--min-throughput-gain", type=float, default=1.1, help="Saturated when more sessions add less than this")
+    parser.add_argument("--output", default="loadtest_report.json")
+    parser.add_argument("--spawn", action="store_true", help="Start the stand-in backend and server locally")
+    parser.add_argument("--server-port", type=int, default=8010)
+    parser.add_argument("--backend-port", type=int, default=8900)
+    parser.add_argument("--backend-latency-ms", type=float, default=20.0)
+    parser.add_argument("--server-logs", action="store_true", help="Show the spawned server's stderr")
+    args = parser.parse_args()
+
+    if not args.spawn and not args.url:
+        parser.error("--url is required unless --spawn is given")
+
+    processes = spawn_stack(args) if args.spawn else []
+    try:
+        report = asyncio.run(run(args))
+    finally:
+        for process in processes:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print_report(report)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
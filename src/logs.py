@@ -0,0 +1,153 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+import structlog
+from structlog.contextvars import bound_contextvars, get_contextvars
+
+from src.config import settings
+
+# --- Processors ---
+
+class _SampleHotPath:
+    """
+    Keeps only a fraction of high-volume events (settings.log_sample_rates,
+    keyed by event name). Kept events carry `sample_rate` so counts can be
+    scaled back up downstream.
+    """
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        rate = settings.log_sample_rates.get(event_dict.get("event", ""))
+        if rate is None or method_name in ("error", "exception", "critical"):
+            return event_dict
+        if random.random() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+class _RateLimitRepeats:
+    """
+    Lets each (level, event) pair at WARNING or above through at most
+    `settings.log_repeat_limit` times per window; the first event after the
+    window resets reports how many were suppressed.
+    """
+
+    _LIMITED = ("warning", "warn", "error", "exception", "critical")
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._windows: Dict[Tuple[str, str], list] = {}
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Dict[str, Any]:
+        if method_name not in self._LIMITED or settings.log_repeat_limit <= 0:
+            return event_dict
+
+        key = (method_name, str(event_dict.get("event")))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= settings.log_repeat_window_seconds:
+                suppressed = window[2] if window else 0
+                self._windows[key] = [now, 1, 0]
+                if suppressed:
+                    event_dict["suppressed_repeats"] = suppressed
+                return event_dict
+
+            if window[1] >= settings.log_repeat_limit:
+                window[2] += 1
+                raise structlog.DropEvent
+
+            window[1] += 1
+            return event_dict
+
+# --- Setup ---
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+def configure_logging() -> None:
+    """
+    Routes structlog and stdlib logging (httpx, mcp, uvicorn) through one
+    pipeline. Records are rendered in the caller (JSON by default) and
+    written to stderr by a background thread, so the event loop never
+    blocks on the terminal. stdout stays reserved for the stdio transport.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    shared_processors = [
+        structlog.contextvars.merge_contextvars,
+        structlog.stdlib.add_logger_name,
+        structlog.stdlib.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+    ]
+
+    structlog.configure(
+        processors=[
+            structlog.stdlib.filter_by_level,
+            _SampleHotPath(),
+            _RateLimitRepeats(),
+            *shared_processors,
+            structlog.stdlib.PositionalArgumentsFormatter(),
+            structlog.processors.StackInfoRenderer(),
+            structlog.stdlib.ProcessorFormatter.wrap_for_formatter,
+        ],
+        logger_factory=structlog.stdlib.LoggerFactory(),
+        wrapper_class=structlog.stdlib.BoundLogger,
+        cache_logger_on_first_use=True,
+    )
+
+    if settings.log_format == "console":
+        renderer: Any = structlog.dev.ConsoleRenderer(colors=False)
+    else:
+        renderer = structlog.processors.JSONRenderer()
+
+    formatter = structlog.stdlib.ProcessorFormatter(
+        foreign_pre_chain=shared_processors,
+        processors=[
+            structlog.stdlib.ProcessorFormatter.remove_processors_meta,
+            structlog.processors.dict_tracebacks if settings.log_format != "console" else structlog.processors.format_exc_info,
+            renderer,
+        ],
+    )
+
+    # Format in the calling thread, write from the listener thread
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setFormatter(formatter)
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(settings.log_level.upper())
+
+    # httpx logs every request at INFO; keep it for DEBUG deployments only
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+def get_logger(name: str) -> Any:
+    return structlog.get_logger(name)
+
+@contextmanager
+def correlation_scope(**context: Any) -> Iterator[str]:
+    """
+    Binds a correlation ID (plus any extra context) to every log line
+    emitted in this task and the tasks it spawns. Nested scopes, such as
+    a tool called from mvk_batch, reuse the outer ID.
+    """
+    correlation_id = get_contextvars().get("correlation_id") or uuid.uuid4().hex[:16]
+    with bound_contextvars(correlation_id=correlation_id, **context):
+        yield correlation_id
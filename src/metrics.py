@@ -0,0 +1,52 @@
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List
+
+class Metrics:
+    """
+    Minimal in-process counter registry. Counters are keyed by name plus
+    optional labels, e.g. `http.wire_bytes{encoding=gzip}`.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, float] = defaultdict(float)
+
+    @staticmethod
+    def _key(name: str, labels: Dict[str, Any]) -> str:
+        if not labels:
+            return name
+        rendered = ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+        return f"{name}{{{rendered}}}"
+
+    def incr(self, name: str, value: float = 1, **labels: Any) -> None:
+        key = self._key(name, labels)
+        with self._lock:
+            self._counters[key] += value
+
+    def get(self, name: str, **labels: Any) -> float:
+        return self._counters.get(self._key(name, labels), 0.0)
+
+    def label_values(self, name: str, label: str) -> List[str]:
+        """Distinct values seen for `label` on counter `name`."""
+        prefix, needle = f"{name}{{", f"{label}="
+        values = set()
+        with self._lock:
+            keys = list(self._counters)
+        for key in keys:
+            if not key.startswith(prefix):
+                continue
+            for pair in key[len(prefix):-1].split(","):
+                if pair.startswith(needle):
+                    values.add(pair[len(needle):])
+        return sorted(values)
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {k: round(v, 3) for k, v in sorted(self._counters.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+metrics = Metrics()
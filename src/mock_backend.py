@@ -0,0 +1,280 @@
+"""
+Local stand-in for the Mavvrik GraphQL API.
+
+Serves deterministic synthetic data for the queries used by the MCP tools
+(costs, including tag breakdowns, costTopEntries, k8sCosts) and implements Automatic Persisted
+Queries, so the server can be exercised end-to-end without credentials:
+
+    python -m src.mock_backend --port 8900
+    MAVVRIK_API_URL=http://127.0.0.1:8900 MAVVRIK_API_KEY=dev MAVVRIK_TENANT_ID=dev python src/server.py
+"""
+import argparse
+import asyncio
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import zlib
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+# --- Synthetic Dimensions ---
+
+GROUPS: Dict[str, List[str]] = {
+    "provider_code": ["aws", "gcp", "azure"],
+    "product_name": [
+        "Amazon EC2", "Amazon S3", "Amazon RDS", "AWS Lambda", "Amazon EKS", "Amazon CloudFront",
+        "Compute Engine", "BigQuery", "Cloud Storage", "Virtual Machines", "Azure SQL Database", "Azure Blob Storage",
+    ],
+    "service": ["Compute", "Storage", "Database", "Networking", "Analytics", "Serverless"],
+    "location_id": ["us-east-1", "us-west-2", "eu-west-1", "ap-southeast-1", "us-central1", "westeurope"],
+    "billing_account_id": ["111111111111", "222222222222", "333333333333", "444444444444"],
+    "resource_group_id": ["rg-platform", "rg-data", "rg-web", "rg-ml", "rg-shared"],
+    "cluster_id": ["prod-eks-use1", "prod-gke-usc1", "staging-aks-weu"],
+    "namespace": ["default", "kube-system", "payments", "checkout", "search", "ml-training", "observability", "ingress"],
+    "node": [f"ip-10-0-{i}-{i * 7 % 255}.ec2.internal" for i in range(1, 25)],
+}
+
+# Tag values by key; unknown keys get a few hundred generated values
+TAG_VALUES: Dict[str, List[str]] = {
+    "env": ["prod", "staging", "dev", "sandbox"],
+    "team": ["platform", "data", "payments", "search", "ml", "web", "mobile", "security", "sre", "growth"],
+    "owner": [f"user{i:03d}@example.com" for i in range(1, 151)],
+    "commit_sha": [hashlib.sha1(str(i).encode()).hexdigest() for i in range(20000)],
+}
+
+def _seed(*parts: Any) -> int:
+    # crc32 instead of hash(): stable across processes
+    return zlib.crc32("|".join(str(p) for p in parts).encode())
+
+def _parse(value: Optional[str], default: date) -> date:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return default
+
+def _buckets(start: date, end: date, interval: str) -> List[date]:
+    buckets = []
+    current = start
+    while current <= end:
+        buckets.append(current)
+        if interval == "month":
+            current = (current.replace(day=1) + timedelta(days=32)).replace(day=1)
+        elif interval == "week":
+            current += timedelta(days=7)
+        else:
+            current += timedelta(days=1)
+    return buckets
+
+def _bucket_days(bucket: date, interval: str, end: date) -> int:
+    if interval == "month":
+        next_bucket = (bucket.replace(day=1) + timedelta(days=32)).replace(day=1)
+    elif interval == "week":
+        next_bucket = bucket + timedelta(days=7)
+    else:
+        next_bucket = bucket + timedelta(days=1)
+    return max((min(next_bucket, end + timedelta(days=1)) - bucket).days, 1)
+
+def _groups(group_by: str, flt: Dict[str, Any]) -> List[str]:
+    groups = GROUPS.get(group_by) or [f"{group_by}-{i}" for i in range(1, 9)]
+    wanted = flt.get(group_by)
+    if wanted:
+        groups = [g for g in groups if g in wanted] or list(wanted)
+    return groups
+
+def _daily_cost(tenant: str, group: str, day: date) -> float:
+    base = math.exp(random.Random(_seed(tenant, group)).uniform(2.0, 8.0))
+    weekly = 1.0 + 0.15 * math.sin(day.toordinal() * 2 * math.pi / 7)
+    noise = random.Random(_seed(tenant, group, day.isoformat())).uniform(0.85, 1.15)
+    spike = 4.0 if _seed(tenant, group, day.isoformat(), "spike") % 97 == 0 else 1.0
+    return base * weekly * noise * spike
+
+def generate_cost_rows(tenant: str, option: Dict[str, Any], flt: Dict[str, Any]) -> List[Dict[str, Any]]:
+    today = date.today()
+    start = _parse(option.get("fromDate"), today.replace(day=1))
+    end = _parse(option.get("toDate"), today)
+    interval = option.get("interval") or "day"
+    group_by = option.get("groupBy") or "provider_code"
+
+    rows = []
+    for bucket in _buckets(start, end, interval):
+        days = _bucket_days(bucket, interval, end)
+        for group in _groups(group_by, flt):
+            # Sample a single day per bucket and scale: keeps long ranges cheap
+            cost = _daily_cost(tenant, group, bucket) * days
+            rows.append({"cost": round(cost, 4), "date": bucket.isoformat(), "groupId": group, "groupName": group})
+    return rows
+
+def _tag_values(tag_key: str) -> List[str]:
+    return TAG_VALUES.get(tag_key) or [f"{tag_key}-{i}" for i in range(1, 301)]
+
+# Row sets for tag breakdowns are large; keep the last few so paging stays cheap
+_tag_rows_cache: Dict[str, List[Dict[str, Any]]] = {}
+
+def generate_tag_rows(tenant: str, option: Dict[str, Any], flt: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Zipf-distributed cost per tag value: a few heavy values and a long tail."""
+    cache_key = json.dumps([tenant, {k: v for k, v in option.items() if k not in ("pageNo", "pageSize")}, flt], sort_keys=True)
+    rows = _tag_rows_cache.get(cache_key)
+    if rows is not None:
+        return rows
+
+    today = date.today()
+    start = _parse(option.get("fromDate"), today.replace(day=1))
+    end = _parse(option.get("toDate"), today)
+    interval = option.get("interval") or "month"
+    tag_key = option.get("tagKey") or "team"
+    values = _tag_values(tag_key)
+    order = sorted(values, key=lambda v: _seed(tenant, tag_key, v))
+
+    rows = []
+    for bucket in _buckets(start, end, interval):
+        days = _bucket_days(bucket, interval, end)
+        rng = random.Random(_seed(tenant, tag_key, bucket.isoformat()))
+        # Untagged spend is typically a large share
+        rows.append({"cost": round(900.0 * days * rng.uniform(0.8, 1.2), 4), "date": bucket.isoformat(), "groupId": "", "groupName": ""})
+        for rank, value in enumerate(order, start=1):
+            cost = 2000.0 / rank ** 1.1 * days * rng.uniform(0.7, 1.3)
+            rows.append({"cost": round(cost, 4), "date": bucket.isoformat(), "groupId": value, "groupName": value})
+
+    if len(_tag_rows_cache) >= 8:
+        _tag_rows_cache.pop(next(iter(_tag_rows_cache)))
+    _tag_rows_cache[cache_key] = rows
+    return rows
+
+def paginate(rows: List[Any], option: Dict[str, Any]) -> List[Any]:
+    page_size = option.get("pageSize")
+    if not page_size:
+        return rows
+    page_no = max(int(option.get("pageNo") or 1), 1)
+    return rows[(page_no - 1) * page_size: page_no * page_size]
+
+def resolve(query: str, variables: Dict[str, Any], tenant: str) -> Dict[str, Any]:
+    option = variables.get("option") or {}
+    flt = variables.get("filter") or {}
+
+    if re.search(r"\bcostTopEntries\s*\(", query):
+        month = _parse(option.get("month"), date.today().replace(day=1)).replace(day=1)
+        month_end = (month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+        totals = {}
+        for group in _groups(option.get("category") or "product_name", flt):
+            totals[group] = sum(_daily_cost(tenant, group, month + timedelta(days=d)) for d in range((month_end - month).days + 1))
+        ranked = sorted(totals.items(), key=lambda kv: kv[1], reverse=True)[: option.get("limit") or 10]
+        return {"costTopEntries": {"topEntries": [{"cost": round(c, 2), "groupId": g, "groupName": g} for g, c in ranked]}}
+
+    if re.search(r"\bk8sCosts\s*\(", query):
+        option = {**option, "groupBy": option.get("groupBy") or "cluster_id"}
+        return {"k8sCosts": paginate(generate_cost_rows(tenant, option, flt), option)}
+
+    if re.search(r"\bcosts\s*\(", query):
+        if option.get("groupBy") == "tag":
+            return {"costs": paginate(generate_tag_rows(tenant, option, flt), option)}
+        return {"costs": paginate(generate_cost_rows(tenant, option, flt), option)}
+
+    raise ValueError("Unsupported query for the local stand-in backend.")
+
+# --- HTTP Layer ---
+
+def _encoders() -> List[Any]:
+    encoders: List[Any] = []
+    try:
+        import zstandard
+        encoders.append(("zstd", lambda body: zstandard.ZstdCompressor(level=3).compress(body)))
+    except ImportError:
+        pass
+    try:
+        import brotli
+        encoders.append(("br", lambda body: brotli.compress(body, quality=5)))
+    except ImportError:
+        pass
+    encoders.append(("gzip", lambda body: gzip.compress(body, compresslevel=6)))
+    return encoders
+
+_ENCODERS = _encoders()
+
+def _compressed_json(request: Request, payload: Dict[str, Any], compression: bool) -> Response:
+    """Honours Accept-Encoding like a production gateway would (zstd > br > gzip)."""
+    body = json.dumps(payload).encode("utf-8")
+    accepted = request.headers.get("accept-encoding", "")
+    if compression and len(body) >= 512:
+        for name, encode in _ENCODERS:
+            if name in accepted:
+                return Response(encode(body), media_type="application/json", headers={"Content-Encoding": name, "Vary": "Accept-Encoding"})
+    return Response(body, media_type="application/json")
+
+def _error(message: str, code: Optional[str] = None, status: int = 200) -> JSONResponse:
+    error: Dict[str, Any] = {"message": message}
+    if code:
+        error["extensions"] = {"code": code}
+    return JSONResponse({"errors": [error]}, status_code=status)
+
+def create_app(latency_ms: float = 0.0, persisted_queries: bool = True, compression: bool = True) -> Starlette:
+    # sha256 -> query text, registered through APQ
+    persisted: Dict[str, str] = {}
+
+    async def graphql(request: Request) -> JSONResponse:
+        if not request.headers.get("x-api-key"):
+            return JSONResponse({"message": "Unauthorized"}, status_code=401)
+        tenant = request.headers.get("x-mavvrik-tenant") or request.headers.get("tenant")
+        if not tenant:
+            return JSONResponse({"message": "Forbidden"}, status_code=403)
+
+        body = await request.json()
+        query = body.get("query")
+        persisted_query = (body.get("extensions") or {}).get("persistedQuery")
+
+        if persisted_query and not persisted_queries:
+            # Like servers without APQ: ignore the extension, fail hash-only requests
+            if query is None:
+                return _error("PersistedQueryNotSupported", "PERSISTED_QUERY_NOT_SUPPORTED")
+        elif persisted_query:
+            sha = persisted_query.get("sha256Hash", "")
+            if query is None:
+                query = persisted.get(sha)
+                if query is None:
+                    return _error("PersistedQueryNotFound", "PERSISTED_QUERY_NOT_FOUND")
+            elif hashlib.sha256(query.encode()).hexdigest() != sha:
+                return _error("provided sha does not match query", "BAD_USER_INPUT", status=400)
+            else:
+                persisted[sha] = query
+
+        if not query:
+            return _error("Must provide query string.", "BAD_USER_INPUT", status=400)
+
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+
+        try:
+            data = resolve(query, body.get("variables") or {}, tenant)
+        except ValueError as e:
+            return _error(str(e), "BAD_USER_INPUT")
+        return _compressed_json(request, {"data": data}, compression)
+
+    return Starlette(routes=[Route("/", graphql, methods=["POST"]), Route("/graphql", graphql, methods=["POST"])])
+
+def main():
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local stand-in for the Mavvrik GraphQL API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Artificial per-request latency")
+    parser.add_argument("--no-persisted-queries", action="store_true", help="Reject APQ like a server without support")
+    parser.add_argument("--no-compression", action="store_true", help="Always send identity-encoded responses")
+    args = parser.parse_args()
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        persisted_queries=not args.no_persisted_queries,
+        compression=not args.no_compression
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+import asyncio
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from datetime import datetime, timezone
+from types import FrameType
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from src.config import settings
+from src.logs import get_logger
+
+logger = get_logger(__name__)
+
+# --- Runtime Configuration ---
+
+class ProfilingConfig:
+    """
+    Which tool invocations get profiled. Seeded from settings and adjustable
+    at runtime through the `mvk_admin_profiling` tool without a redeploy.
+    """
+
+    def __init__(self) -> None:
+        self.tools: Set[str] = set(settings.profile_tools)
+        self.sample_rate = settings.profile_sample_rate
+        self.interval_ms = settings.profile_interval_ms
+        self.output_dir = settings.profile_dir
+
+    @property
+    def active(self) -> bool:
+        return bool(self.tools) or self.sample_rate > 0
+
+    def should_profile(self, tool_name: str) -> bool:
+        if tool_name in self.tools or "*" in self.tools:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "tools": sorted(self.tools),
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval_ms,
+            "output_dir": os.path.abspath(self.output_dir),
+            "recent_profiles": list(recent_profiles),
+        }
+
+profiling_config = ProfilingConfig()
+recent_profiles: Deque[Dict[str, Any]] = deque(maxlen=20)
+
+# --- Sampler ---
+
+class _Session:
+    """One profiled tool invocation, identified by its wrapper coroutine frame."""
+
+    def __init__(self, tool: str, frame: FrameType):
+        self.tool = tool
+        self.frame = frame
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.on_cpu_samples = 0
+        self.on_cpu_ms = 0.0
+
+class _StackSampler:
+    """
+    Periodically samples the event loop thread's stack from a background
+    thread (no tracing hooks, so the cost is one stack walk per interval).
+
+    A sample counts as on-CPU for an invocation when its wrapper frame is on
+    the stack, i.e. that tool's coroutine was the one executing. Work in tasks
+    the tool spawned (coalesced backend fetches, decode) has no link to that
+    frame; while a single invocation is profiled, such busy samples are
+    attributed to it under a "[spawned task]" root. Samples are weighted by
+    the real time since the previous one, because the sampler can only run
+    when the loop thread releases the GIL (sys.getswitchinterval()).
+    Only runs while at least one session is open.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._sessions: Dict[int, _Session] = {}
+        self._target_thread: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop: Optional[threading.Event] = None
+
+    def start_session(self, session: _Session) -> None:
+        with self._lock:
+            self._sessions[id(session.frame)] = session
+            self._target_thread = threading.get_ident()
+            if self._thread is None:
+                # Fresh event per thread so a quick stop/start never leaves two samplers running
+                self._stop = threading.Event()
+                self._thread = threading.Thread(target=self._run, args=(self._stop,), name="mvk-profiler", daemon=True)
+                self._thread.start()
+
+    def end_session(self, session: _Session) -> Optional[threading.Thread]:
+        """Detaches the session; returns the sampler thread to join when it was the last one."""
+        with self._lock:
+            self._sessions.pop(id(session.frame), None)
+            if self._sessions or self._thread is None:
+                return None
+            thread, self._thread = self._thread, None
+            self._stop.set()
+            self._stop = None
+            return thread
+
+    def _run(self, stop: threading.Event) -> None:
+        last = time.perf_counter()
+        while not stop.wait(profiling_config.interval_ms / 1000):
+            now = time.perf_counter()
+            elapsed_ms, last = (now - last) * 1000, now
+
+            frame = sys._current_frames().get(self._target_thread)
+            # Held for the whole sample: once end_session() returns, its session is never touched again
+            with self._lock:
+                if frame is not None and self._sessions:
+                    self._sample(frame, self._sessions, elapsed_ms)
+
+    def _sample(self, frame: Optional[FrameType], sessions: Dict[int, _Session], elapsed_ms: float) -> None:
+        # Walk leaf -> root once, remembering which sessions are on the stack
+        chain: List[FrameType] = []
+        owners: List[_Session] = []
+        while frame is not None:
+            chain.append(frame)
+            owner = sessions.get(id(frame))
+            if owner is not None and owner.frame is frame:
+                owners.append(owner)
+            frame = frame.f_back
+
+        for session in sessions.values():
+            session.samples += 1
+        for session in owners:
+            session.on_cpu_samples += 1
+            session.on_cpu_ms += elapsed_ms
+            # Collapsed stack from the tool wrapper down to the leaf
+            index = chain.index(session.frame)
+            session.stacks[";".join(_frame_label(f) for f in reversed(chain[:index + 1]))] += 1
+
+        # Loop blocked in the selector means every session is awaiting I/O
+        idle = os.path.basename(chain[0].f_code.co_filename) == "selectors.py"
+        if not owners and not idle and len(sessions) == 1:
+            session = next(iter(sessions.values()))
+            session.on_cpu_samples += 1
+            session.on_cpu_ms += elapsed_ms
+            session.stacks[";".join(["[spawned task]"] + [_frame_label(f) for f in reversed(chain) if not _is_loop_frame(f)])] += 1
+
+_sampler = _StackSampler()
+
+def _is_loop_frame(frame: FrameType) -> bool:
+    # asyncio/runner plumbing adds noise to spawned-task stacks
+    return f"{os.sep}asyncio{os.sep}" in frame.f_code.co_filename
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+def _write_profile(session: _Session, wall_ms: float, cpu_ms: float) -> Dict[str, Any]:
+    os.makedirs(profiling_config.output_dir, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    base = os.path.join(profiling_config.output_dir, f"{session.tool}-{stamp}-{uuid.uuid4().hex[:6]}")
+
+    # Brendan Gregg's folded format: flamegraph.pl, speedscope and inferno read it
+    with open(f"{base}.folded", "w", encoding="utf-8") as f:
+        for stack, count in session.stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+    summary = {
+        "tool": session.tool,
+        "file": f"{base}.folded",
+        "timestamp": stamp,
+        "wall_ms": round(wall_ms, 2),
+        "cpu_ms": round(cpu_ms, 2),
+        "samples": session.samples,
+        "on_cpu_samples": session.on_cpu_samples,
+        "interval_ms": profiling_config.interval_ms,
+    }
+    with open(os.path.join(profiling_config.output_dir, "index.jsonl"), "a", encoding="utf-8") as f:
+        f.write(json.dumps(summary) + "\n")
+    return summary
+
+def profiled(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """
+    Decorator for MCP tools: profiles the invocation when profiling_config
+    selects it (by tool name or sample rate). Costs one attribute check when
+    profiling is off.
+    """
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        if not profiling_config.active or not profiling_config.should_profile(fn.__name__):
+            return await fn(*args, **kwargs)
+
+        session = _Session(fn.__name__, sys._getframe())
+        wall_started = time.perf_counter()
+        cpu_started = time.thread_time()
+        _sampler.start_session(session)
+        try:
+            return await fn(*args, **kwargs)
+        finally:
+            wall_ms = (time.perf_counter() - wall_started) * 1000
+            sampler_thread = _sampler.end_session(session)
+            if sampler_thread is not None:
+                await asyncio.to_thread(sampler_thread.join)
+            # Thread CPU includes other coroutines sharing the loop; the on-CPU
+            # samples are the per-invocation estimate.
+            cpu_ms = session.on_cpu_ms
+            try:
+                # File I/O off the event loop
+                summary = await asyncio.to_thread(_write_profile, session, wall_ms, cpu_ms)
+                summary["loop_thread_cpu_ms"] = round((time.thread_time() - cpu_started) * 1000, 2)
+                recent_profiles.append(summary)
+                logger.info("profile.written", **summary)
+            except OSError as e:
+                logger.warning("profile.write_failed", tool=session.tool, error=str(e))
+
+    return wrapper
@@ -0,0 +1,251 @@
+import heapq
+import math
+import sys
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from src.metrics import metrics
+
+# Fixed per-entry bookkeeping (key string, entry object, heap/dict slots)
+_ENTRY_OVERHEAD = 240
+
+# --- Compact Row Encoding ---
+
+class CompactRows:
+    """
+    Column-oriented form of a GraphQL row list such as
+    `{"costs": [{"cost": .., "date": .., "groupId": .., "groupName": ..}, ...]}`.
+
+    String columns are dictionary-encoded (each distinct groupId/groupName/date
+    is stored once, rows hold array-backed indices) and numeric columns live in
+    `array('d')`, or `array('q')` when every value is an int so they decode
+    as ints, which is ~8 bytes per value instead of a dict per row.
+    """
+
+    __slots__ = ("path", "keys", "columns", "dictionaries", "row_count", "nbytes")
+
+    NUMERIC_KEYS = ("cost",)
+
+    def __init__(self, path: Tuple[str, ...], keys: Tuple[str, ...], rows: List[Dict[str, Any]]):
+        self.path = path
+        self.keys = keys
+        self.row_count = len(rows)
+        self.columns: Dict[str, array] = {}
+        self.dictionaries: Dict[str, List[Any]] = {}
+
+        for key in keys:
+            if key in self.NUMERIC_KEYS:
+                values = [r.get(key) for r in rows]
+                if all(type(v) is int for v in values):
+                    # The typecode records the dtype: 'q' columns decode back to ints
+                    self.columns[key] = array("q", values)
+                else:
+                    # NaN marks a missing value (None) so it round-trips
+                    self.columns[key] = array("d", (math.nan if v is None else float(v) for v in values))
+                continue
+
+            codes: Dict[Any, int] = {}
+            values: List[Any] = []
+            indices = array("I")
+            for row in rows:
+                value = row.get(key)
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(values)
+                    values.append(sys.intern(value) if isinstance(value, str) else value)
+                indices.append(code)
+            self.columns[key] = indices
+            self.dictionaries[key] = values
+
+        self.nbytes = self._measure()
+
+    def _measure(self) -> int:
+        size = sys.getsizeof(self) + sum(sys.getsizeof(p) for p in self.path)
+        for column in self.columns.values():
+            size += sys.getsizeof(column)
+        for values in self.dictionaries.values():
+            size += sys.getsizeof(values) + sum(sys.getsizeof(v) for v in values)
+        return size
+
+    @classmethod
+    def encode(cls, data: Any) -> Optional["CompactRows"]:
+        """Returns a compact form when `data` is a (nested) single-key dict ending in flat rows."""
+        path: List[str] = []
+        node = data
+        while isinstance(node, dict) and len(node) == 1:
+            key = next(iter(node))
+            path.append(key)
+            node = node[key]
+
+        if not path or not isinstance(node, list) or not node or not all(isinstance(r, dict) for r in node):
+            return None
+
+        keys = tuple(node[0].keys())
+        numeric_types: Dict[str, set] = {key: set() for key in keys if key in cls.NUMERIC_KEYS}
+        for row in node:
+            if tuple(row.keys()) != keys:
+                return None
+            for key, value in row.items():
+                if key in cls.NUMERIC_KEYS:
+                    if value is not None and type(value) not in (int, float):
+                        return None
+                    numeric_types[key].add(type(value))
+                elif value is not None and not isinstance(value, (str, int, bool)):
+                    return None
+
+        # Ints mixed with floats or None have no exact column form; keep the JSON as is
+        for kinds in numeric_types.values():
+            if int in kinds and len(kinds) > 1:
+                return None
+
+        return cls(tuple(path), keys, node)
+
+    def decode(self) -> Any:
+        """Rebuilds a fresh payload equivalent to the one that was encoded."""
+        columns = []
+        for key in self.keys:
+            column = self.columns[key]
+            if key in self.dictionaries:
+                values = self.dictionaries[key]
+                columns.append([values[i] for i in column])
+            elif column.typecode == "q":
+                columns.append(column.tolist())
+            else:
+                columns.append([None if math.isnan(v) else v for v in column])
+
+        rows = [dict(zip(self.keys, values)) for values in zip(*columns)]
+        node: Any = rows
+        for key in reversed(self.path):
+            node = {key: node}
+        return node
+
+class BlobEntry:
+    """Compressed JSON for payloads that do not fit the row layout."""
+
+    __slots__ = ("codec", "blob", "nbytes")
+
+    def __init__(self, codec: str, blob: bytes):
+        self.codec = codec
+        self.blob = blob
+        self.nbytes = sys.getsizeof(blob)
+
+StoredValue = Union[CompactRows, BlobEntry]
+
+# --- Store ---
+
+class _Slot:
+    __slots__ = ("value", "expires_at", "refetch_ms", "priority", "version")
+
+    def __init__(self, value: StoredValue, expires_at: float, refetch_ms: float):
+        self.value = value
+        self.expires_at = expires_at
+        self.refetch_ms = refetch_ms
+        self.priority = 0.0
+        self.version = 0
+
+class ResultStore:
+    """
+    Memory-bounded store with byte-accurate accounting and cost-aware eviction.
+
+    Eviction follows GreedyDual-Size: each entry's priority is
+    `L + refetch_cost / size`, refreshed on every hit, and the entry with the
+    lowest priority goes first (L is raised to that priority). Large results
+    that were cheap to fetch are evicted before small, expensive ones, and
+    entries nobody reads age out as L grows.
+    """
+
+    def __init__(self, max_bytes: int, max_entries: int):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._slots: Dict[str, _Slot] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._inflation = 0.0
+        self._version = 0
+        self.current_bytes = 0
+        self.evictions: Dict[str, int] = {}
+
+    def _entry_bytes(self, key: str, slot: _Slot) -> int:
+        return slot.value.nbytes + sys.getsizeof(key) + _ENTRY_OVERHEAD
+
+    def _touch(self, key: str, slot: _Slot) -> None:
+        # Cost per byte: milliseconds of backend time saved per KiB held
+        slot.priority = self._inflation + slot.refetch_ms / max(self._entry_bytes(key, slot) / 1024, 1e-3)
+        self._version += 1
+        slot.version = self._version
+        heapq.heappush(self._heap, (slot.priority, slot.version, key))
+        if len(self._heap) > 4 * len(self._slots) + 64:
+            self._compact_heap()
+
+    def _remove(self, key: str, reason: str) -> None:
+        slot = self._slots.pop(key)
+        self.current_bytes -= self._entry_bytes(key, slot)
+        self.evictions[reason] = self.evictions.get(reason, 0) + 1
+        metrics.incr("store.evictions", reason=reason)
+
+    def get(self, key: str) -> Optional[StoredValue]:
+        slot = self._slots.get(key)
+        if slot is None:
+            return None
+        if slot.expires_at < time.monotonic():
+            self._remove(key, "expired")
+            return None
+        self._touch(key, slot)
+        return slot.value
+
+    def put(self, key: str, value: StoredValue, ttl_seconds: float, refetch_ms: float) -> None:
+        if key in self._slots:
+            self._remove(key, "replaced")
+
+        slot = _Slot(value, time.monotonic() + ttl_seconds, max(refetch_ms, 1.0))
+        size = self._entry_bytes(key, slot)
+        if size > self.max_bytes:
+            # Would evict everything else and still not fit
+            self.evictions["too_large"] = self.evictions.get("too_large", 0) + 1
+            metrics.incr("store.evictions", reason="too_large")
+            return
+
+        self._slots[key] = slot
+        self.current_bytes += size
+        self._touch(key, slot)
+
+        while self.current_bytes > self.max_bytes:
+            self._evict_one("memory_budget")
+        while len(self._slots) > self.max_entries:
+            self._evict_one("entry_limit")
+
+    def _evict_one(self, reason: str) -> None:
+        now = time.monotonic()
+        while self._heap:
+            priority, version, key = heapq.heappop(self._heap)
+            slot = self._slots.get(key)
+            if slot is None or slot.version != version:
+                continue  # Stale heap record
+            self._inflation = priority
+            self._remove(key, "expired" if slot.expires_at < now else reason)
+            return
+
+    def _compact_heap(self) -> None:
+        self._heap = [(s.priority, s.version, k) for k, s in self._slots.items()]
+        heapq.heapify(self._heap)
+
+    def clear(self) -> None:
+        for key in list(self._slots):
+            self._remove(key, "cleared")
+        self._heap.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        compact = sum(1 for s in self._slots.values() if isinstance(s.value, CompactRows))
+        return {
+            "entries": len(self._slots),
+            "compact_entries": compact,
+            "blob_entries": len(self._slots) - compact,
+            "rows": sum(s.value.row_count for s in self._slots.values() if isinstance(s.value, CompactRows)),
+            "current_bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "max_entries": self.max_entries,
+            "evictions": dict(self.evictions),
+        }
+
+    def __len__(self) -> int:
+        return len(self._slots)
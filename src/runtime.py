@@ -0,0 +1,67 @@
+import asyncio
+import os
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# POSIX only; without it (Windows) the peak RSS figure is omitted
+try:
+    import resource
+except ImportError:  # pragma: no cover - depends on platform
+    resource = None
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a periodic sleep wakes up. Sustained
+    lag means CPU-bound work (decode, aggregation, formatting) is starving
+    other sessions sharing this process.
+    """
+
+    def __init__(self, interval: float = 0.1, window: int = 100):
+        self.interval = interval
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._task: Optional["asyncio.Task[None]"] = None
+        self.max_lag_ms = 0.0
+
+    def ensure_started(self) -> None:
+        """Idempotent; must be called from inside the running loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag_ms = max((time.perf_counter() - started - self.interval) * 1000, 0.0)
+            self._samples.append(lag_ms)
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        if not self._samples:
+            return {"running": self._task is not None and not self._task.done(), "samples": 0}
+        ordered = sorted(self._samples)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "samples": len(ordered),
+            "window_seconds": round(len(ordered) * self.interval, 1),
+            "last_ms": round(self._samples[-1], 2),
+            "p50_ms": round(ordered[len(ordered) // 2], 2),
+            "p99_ms": round(ordered[min(int(len(ordered) * 0.99), len(ordered) - 1)], 2),
+            "max_ms": round(self.max_lag_ms, 2),
+        }
+
+def process_memory() -> Dict[str, Any]:
+    """Current RSS (Linux /proc) and peak RSS of this process, in MiB."""
+    memory: Dict[str, Any] = {}
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        memory["rss_mib"] = round(resident_pages * os.sysconf("SC_PAGE_SIZE") / 2**20, 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        # No /proc (macOS, Windows) or no os.sysconf (Windows)
+        memory["rss_mib"] = None
+    # ru_maxrss is KiB on Linux
+    memory["peak_rss_mib"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1) if resource else None
+    return memory
+
+loop_lag_monitor = LoopLagMonitor()
@@ -1,46 +1,63 @@
-import sys
-import os
-import logging
-from dotenv import load_dotenv
-
-# Force Python to see the project root
-current_file_path = os.path.abspath(__file__)
-src_directory = os.path.dirname(current_file_path)
-project_root = os.path.dirname(src_directory)
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-# Configure Logging to Stderr (Copilot reads stdout, so logs must go to stderr)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    stream=sys.stderr
-)
-logger = logging.getLogger("mavvrik-mcp")
-
-load_dotenv()
-
-def main():
-    try:
-        from mcp.server.fastmcp import FastMCP
-        from src.tools.finops import register_finops
-        
-        # Initialize Server
-        logger.info("Initializing Mavvrik MCP Server (v1 Service Mode)...")
-        mcp = FastMCP("Mavvrik Cost Intelligence")
-
-        # Register ONLY FinOps tools (Auth tools are removed)
-        register_finops(mcp)
-        logger.info("FinOps tools registered. Ready for queries.")
-        
-        # Run in stdio mode (Required for VS Code Copilot)
-        mcp.run(transport="stdio")
-        
-    except Exception as e:
-        logger.critical(f"Server crashed: {e}")
-        import traceback
-        traceback.print_exc(file=sys.stderr)
-        sys.exit(1)
-
-if __name__ == "__main__":
+import argparse
+import sys
+import os
+from contextlib import asynccontextmanager
+from dotenv import load_dotenv
+
+# Force Python to see the project root
+current_file_path = os.path.abspath(__file__)
+src_directory = os.path.dirname(current_file_path)
+project_root = os.path.dirname(src_directory)
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+load_dotenv()
+
+# Configure Structured Logging to Stderr (Copilot reads stdout, so logs must go to stderr)
+from src.logs import configure_logging, get_logger
+
+configure_logging()
+logger = get_logger("mavvrik-mcp")
+
+@asynccontextmanager
+async def server_lifespan(server):
+    # Entered per client session on network transports, so everything here is idempotent
+    from src.runtime import loop_lag_monitor
+    from src.snapshot import snapshot_materializer
+
+    loop_lag_monitor.ensure_started()
+    snapshot_materializer.ensure_started()
+    yield {}
+
+def main():
+    parser = argparse.ArgumentParser(description="Mavvrik Cost Intelligence MCP Server")
+    parser.add_argument("--transport", choices=["stdio", "sse", "streamable-http"], default="stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+
+    try:
+        from mcp.server.fastmcp import FastMCP
+        from src.tools.finops import register_finops
+        from src.tools.admin import register_admin
+        from src.tools.resources import register_resources
+        
+        # Initialize Server
+        logger.info("Initializing Mavvrik MCP Server (v1 Service Mode)...", transport=args.transport)
+        mcp = FastMCP("Mavvrik Cost Intelligence", host=args.host, port=args.port, lifespan=server_lifespan)
+
+        # Register FinOps tools + read-only admin diagnostics (Auth tools are removed)
+        register_finops(mcp)
+        register_admin(mcp)
+        register_resources(mcp)
+        logger.info("FinOps tools and cost resources registered. Ready for queries.")
+        
+        # stdio is required for VS Code Copilot; sse / streamable-http serve remote agents
+        mcp.run(transport=args.transport)
+        
+    except Exception:
+        logger.critical("server.crashed", exc_info=True)
+        sys.exit(1)
+
+if __name__ == "__main__":
     main()
\ No newline at end of file
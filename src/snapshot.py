@@ -0,0 +1,505 @@
+"""
+Offline snapshots of cost data in a local, memory-mappable columnar store.
+
+A materializer periodically pulls daily costs for the configured groupings
+(settings.snapshot_groupings / snapshot_k8s_groupings) over the last
+settings.snapshot_lookback_days and writes one table per grouping: sorted
+day numbers, dictionary-encoded group codes and costs as `.npy` arrays,
+opened with `mmap_mode="r"`. Queries binary-search the date range and
+aggregate with `np.bincount`, so they run in microseconds without the backend.
+
+settings.snapshot_mode controls how tools use it:
+    off       always query the backend
+    fallback  query the backend; answer from the snapshot if it fails (maintenance windows)
+    prefer    answer from a fresh snapshot when it covers the query, else the backend
+    only      never call the backend (air-gapped analysis)
+
+Materialize once from the command line with `python -m src.snapshot`.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import settings
+from src.deadline import DeadlineExceeded
+from src.logs import get_logger
+from src.metrics import metrics
+
+logger = get_logger(__name__)
+
+# Operations a snapshot can answer, mapped to (dataset, response field)
+_OPERATIONS = {
+    "CostsQuery": ("costs", "costs"),
+    "K8sCostsQuery": ("k8s", "k8sCosts"),
+    "CostTopEntriesQuery": ("costs", "costTopEntries"),
+}
+
+class SnapshotUnavailable(Exception):
+    """Raised in `only` mode when no snapshot covers a query."""
+
+# Day numbers are stored as date ordinals; numpy's datetime64[D] counts from 1970-01-01
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+def _parse_date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except (TypeError, ValueError):
+        return None
+
+def _safe_name(value: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]+", "-", value) or "default"
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+# --- Columnar Tables ---
+
+class SnapshotTable:
+    """
+    Daily costs for one (dataset, grouping), rows sorted by day.
+    Arrays are memory-mapped, so opening a table costs no reads and
+    concurrent processes share the page cache.
+    """
+
+    def __init__(self, path: str):
+        self.days = np.load(os.path.join(path, "days.npy"), mmap_mode="r")
+        self.groups = np.load(os.path.join(path, "groups.npy"), mmap_mode="r")
+        self.costs = np.load(os.path.join(path, "costs.npy"), mmap_mode="r")
+        with open(os.path.join(path, "dictionary.json"), encoding="utf-8") as f:
+            dictionary = json.load(f)
+        self.group_ids: List[str] = dictionary["ids"]
+        self.group_names: List[str] = dictionary["names"]
+        self._codes = {g: i for i, g in enumerate(self.group_ids)}
+
+    @staticmethod
+    def write(path: str, rows_days: np.ndarray, rows_groups: np.ndarray, rows_costs: np.ndarray,
+              group_ids: List[str], group_names: List[str]) -> None:
+        os.makedirs(path, exist_ok=True)
+        order = np.argsort(rows_days, kind="stable")
+        np.save(os.path.join(path, "days.npy"), rows_days[order].astype(np.int32))
+        np.save(os.path.join(path, "groups.npy"), rows_groups[order].astype(np.int32))
+        np.save(os.path.join(path, "costs.npy"), rows_costs[order].astype(np.float64))
+        with open(os.path.join(path, "dictionary.json"), "w", encoding="utf-8") as f:
+            json.dump({"ids": group_ids, "names": group_names}, f)
+
+    def _slice(self, start: date, end: date, only_groups: Optional[List[str]]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        lo, hi = np.searchsorted(self.days, [start.toordinal(), end.toordinal() + 1])
+        days, groups, costs = self.days[lo:hi], self.groups[lo:hi], self.costs[lo:hi]
+        if only_groups is not None:
+            mask = np.isin(groups, [self._codes[g] for g in only_groups if g in self._codes])
+            days, groups, costs = days[mask], groups[mask], costs[mask]
+        return days, groups, costs
+
+    def group_totals(self, start: date, end: date) -> np.ndarray:
+        _, groups, costs = self._slice(start, end, None)
+        return np.bincount(groups, weights=costs, minlength=len(self.group_ids))
+
+    def rows(self, start: date, end: date, interval: str, only_groups: Optional[List[str]]) -> List[Dict[str, Any]]:
+        """Rows shaped like the backend's `costs` response, bucketed by `interval`."""
+        days, groups, costs = self._slice(start, end, only_groups)
+        if len(days) == 0:
+            return []
+
+        # Bucket labels follow the backend: buckets start at `start`, then on week/month boundaries
+        epoch_days = days.astype(np.int64) - _EPOCH_ORDINAL
+        start_day = start.toordinal() - _EPOCH_ORDINAL
+        if interval == "month":
+            month_starts = epoch_days.astype("datetime64[D]").astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+            bucket_days = np.maximum(month_starts, start_day)
+        elif interval == "week":
+            bucket_days = start_day + (epoch_days - start_day) // 7 * 7
+        else:
+            bucket_days = epoch_days
+        labels, bucket_of_row = np.unique(bucket_days, return_inverse=True)
+
+        group_count = len(self.group_ids)
+        keys = bucket_of_row * group_count + groups
+        sums = np.bincount(keys, weights=costs, minlength=len(labels) * group_count)
+        present = np.bincount(keys, minlength=len(labels) * group_count)
+
+        keys = np.flatnonzero(present)
+        buckets, codes = np.divmod(keys, group_count)
+        label_text = np.datetime_as_string(labels.astype("datetime64[D]")).tolist()
+        return [
+            {"cost": cost, "date": label_text[bucket], "groupId": self.group_ids[code], "groupName": self.group_names[code]}
+            for cost, bucket, code in zip(np.round(sums[keys], 4).tolist(), buckets.tolist(), codes.tolist())
+        ]
+
+class Snapshot:
+    """One published snapshot version for a tenant."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            self.meta: Dict[str, Any] = json.load(f)
+        self.start = date.fromisoformat(self.meta["start"])
+        self.end = date.fromisoformat(self.meta["end"])
+        self.materialized_at: float = self.meta["materialized_at"]
+        self._tables: Dict[Tuple[str, str], SnapshotTable] = {}
+
+    @property
+    def age_seconds(self) -> float:
+        return max(time.time() - self.materialized_at, 0.0)
+
+    def label(self) -> str:
+        taken = datetime.fromtimestamp(self.materialized_at, timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+        minutes = int(self.age_seconds // 60)
+        age = f"{minutes // 1440}d {minutes // 60 % 24}h" if minutes >= 1440 else f"{minutes // 60}h {minutes % 60}m"
+        return f"Offline snapshot materialized {taken} (age {age}), covering {self.start} to {self.end}"
+
+    def table(self, dataset: str, group_by: str) -> Optional[SnapshotTable]:
+        key = (dataset, group_by)
+        if key not in self._tables:
+            if group_by not in self.meta["datasets"].get(dataset, []):
+                return None
+            self._tables[key] = SnapshotTable(os.path.join(self.path, dataset, group_by))
+        return self._tables[key]
+
+    def options(self, dataset: str) -> List[str]:
+        """Cost options the dataset was materialized with."""
+        # Snapshots written before options were recorded used discount+tax for every dataset
+        return self.meta.get("options", {}).get(dataset, ["discount", "tax"]) or []
+
+    def covers(self, start: Optional[date], end: Optional[date]) -> bool:
+        if start is None or end is None:
+            return False
+        # Days after the snapshot was taken have no data anywhere yet
+        return start >= self.start and min(end, date.today()) <= self.end
+
+    def answer(self, operation: str, variables: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """GraphQL-shaped `data` for the query, or None when the snapshot cannot answer it."""
+        if operation not in _OPERATIONS:
+            return None
+        dataset, field = _OPERATIONS[operation]
+        option = variables.get("option") or {}
+        flt = {k: v for k, v in (variables.get("filter") or {}).items() if v}
+        if sorted(option.get("options") or []) != sorted(self.options(dataset)):
+            return None
+
+        if operation == "CostTopEntriesQuery":
+            month = _parse_date(option.get("month"))
+            table = self.table(dataset, option.get("category") or "product_name")
+            if month is None or table is None or flt:
+                return None
+            month = month.replace(day=1)
+            month_end = (month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+            if not self.covers(month, month_end):
+                return None
+            totals = table.group_totals(month, month_end)
+            limit = option.get("limit") or 10
+            ranked = [i for i in np.argsort(-totals, kind="stable")[:limit].tolist() if totals[i] > 0]
+            return {field: {"topEntries": [
+                {"cost": round(float(totals[i]), 2), "groupId": table.group_ids[i], "groupName": table.group_names[i]}
+                for i in ranked
+            ]}}
+
+        group_by = option.get("groupBy") or "provider_code"
+        table = self.table(dataset, group_by)
+        start, end = _parse_date(option.get("fromDate")), _parse_date(option.get("toDate"))
+        # Only filters on the grouping dimension itself can be applied to a pre-grouped table
+        if table is None or set(flt) - {group_by} or option.get("tagKey") or not self.covers(start, end):
+            return None
+        rows = table.rows(start, end, option.get("interval") or "day", flt.get(group_by))
+        return {field: rows}
+
+# --- Store ---
+
+class SnapshotStore:
+    """
+    Locates the current snapshot per tenant. A `CURRENT` file names the
+    published version directory; it is replaced atomically, so readers see
+    either the old or the new snapshot, never a mix.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._loaded: Dict[str, Tuple[int, Snapshot]] = {}
+
+    def tenant_dir(self, tenant: str) -> str:
+        return os.path.join(self.root, _safe_name(tenant))
+
+    def current(self, tenant: str) -> Optional[Snapshot]:
+        pointer = os.path.join(self.tenant_dir(tenant), "CURRENT")
+        try:
+            mtime = os.stat(pointer).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        loaded = self._loaded.get(tenant)
+        if loaded is not None and loaded[0] == mtime:
+            return loaded[1]
+        with open(pointer, encoding="utf-8") as f:
+            version = f.read().strip()
+        snapshot = Snapshot(os.path.join(self.tenant_dir(tenant), version))
+        self._loaded[tenant] = (mtime, snapshot)
+        return snapshot
+
+    def publish(self, tenant: str, version: str, keep: int = 2) -> None:
+        tenant_dir = self.tenant_dir(tenant)
+        pointer = os.path.join(tenant_dir, "CURRENT")
+        with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+            f.write(version)
+        os.replace(f"{pointer}.tmp", pointer)
+
+        # Older versions may still be mapped by readers; unlinking is safe on POSIX
+        versions = sorted(d for d in os.listdir(tenant_dir) if d.startswith("v") and os.path.isdir(os.path.join(tenant_dir, d)))
+        for old in versions[:-keep]:
+            shutil.rmtree(os.path.join(tenant_dir, old), ignore_errors=True)
+
+snapshot_store = SnapshotStore(settings.snapshot_dir)
+
+# --- Materializer ---
+
+class _TableBuilder:
+    """Accumulates pages column by column; the full table is never held as dicts."""
+
+    def __init__(self) -> None:
+        self.codes: Dict[str, int] = {}
+        self.names: List[str] = []
+        self.days: List[np.ndarray] = []
+        self.groups: List[np.ndarray] = []
+        self.costs: List[np.ndarray] = []
+        self.rows = 0
+        self.skipped = 0
+
+    def add_page(self, rows: List[Dict[str, Any]]) -> None:
+        page_days, page_groups, page_costs = [], [], []
+        for row in rows:
+            day = _parse_date(row.get("date"))
+            if day is None:
+                # A null or malformed date cannot be placed on the day axis
+                self.skipped += 1
+                continue
+            group_id = row.get("groupId") or ""
+            code = self.codes.get(group_id)
+            if code is None:
+                code = self.codes[group_id] = len(self.names)
+                self.names.append(row.get("groupName") or group_id)
+            page_days.append(day.toordinal())
+            page_groups.append(code)
+            page_costs.append(row.get("cost") or 0.0)
+        self.days.append(np.array(page_days, dtype=np.int32))
+        self.groups.append(np.array(page_groups, dtype=np.int32))
+        self.costs.append(np.array(page_costs, dtype=np.float64))
+        self.rows += len(page_days)
+
+    def write(self, path: str) -> None:
+        SnapshotTable.write(
+            path,
+            np.concatenate(self.days) if self.days else np.empty(0, np.int32),
+            np.concatenate(self.groups) if self.groups else np.empty(0, np.int32),
+            np.concatenate(self.costs) if self.costs else np.empty(0, np.float64),
+            list(self.codes), self.names,
+        )
+
+def service_tenant() -> str:
+    from src.security import IdentityManager
+
+    headers = IdentityManager.get_auth_headers(None)
+    return headers.get("x-mavvrik-tenant") or headers.get("tenant") or "default"
+
+class SnapshotMaterializer:
+    """Pulls daily costs for every configured grouping and publishes a new snapshot version."""
+
+    def __init__(self, store: SnapshotStore):
+        self.store = store
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._running: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        self.last_run: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[str] = None
+
+    async def materialize(self) -> Dict[str, Any]:
+        from src.client import MavvrikClient
+        from src.tools.finops import DATASET_OPTIONS, QUERY_COSTS, QUERY_K8S_COSTS
+
+        client = MavvrikClient(None)
+        tenant = service_tenant()
+        end = date.today()
+        start = end - timedelta(days=settings.snapshot_lookback_days)
+        version = f"v{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        path = os.path.join(self.store.tenant_dir(tenant), version)
+        started = time.perf_counter()
+
+        plan = [("costs", g, QUERY_COSTS, "CostsQuery", "costs") for g in settings.snapshot_groupings]
+        plan += [("k8s", g, QUERY_K8S_COSTS, "K8sCostsQuery", "k8sCosts") for g in settings.snapshot_k8s_groupings]
+
+        row_counts: Dict[str, int] = {}
+        skipped_rows: Dict[str, int] = {}
+        datasets: Dict[str, List[str]] = {}
+        try:
+            for dataset, group_by, query, operation, field in plan:
+                rows, skipped = await self._fetch_table(client, query, operation, field, group_by, start, end, path, dataset)
+                row_counts[f"{dataset}/{group_by}"] = rows
+                if skipped:
+                    skipped_rows[f"{dataset}/{group_by}"] = skipped
+                datasets.setdefault(dataset, []).append(group_by)
+
+            meta = {
+                "version": version,
+                "materialized_at": time.time(),
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "datasets": datasets,
+                # Cost basis of each dataset; answer() refuses queries asking for another
+                "options": {dataset: DATASET_OPTIONS[dataset] for dataset in datasets},
+                "rows": row_counts,
+                "skipped_rows": skipped_rows,
+            }
+            await asyncio.to_thread(_write_json, os.path.join(path, "meta.json"), meta)
+        except BaseException:
+            shutil.rmtree(path, ignore_errors=True)
+            raise
+
+        await asyncio.to_thread(self.store.publish, tenant, version)
+        summary = {**meta, "duration_seconds": round(time.perf_counter() - started, 2)}
+        self.last_run, self.last_error = summary, None
+        metrics.incr("snapshot.materialized")
+        logger.info("snapshot.materialized", version=version, rows=sum(row_counts.values()), duration_seconds=summary["duration_seconds"])
+        return summary
+
+    async def _fetch_table(self, client: Any, query: str, operation: str, field: str, group_by: str,
+                           start: date, end: date, path: str, dataset: str) -> Tuple[int, int]:
+        """Pages one grouping into a table; returns (rows stored, rows skipped)."""
+        from src.schemas import Filter
+        from src.tools.finops import series_option
+
+        # Same variables as the dataset's live tools, so offline answers match live ones
+        option = series_option(dataset, start.isoformat(), end.isoformat(), "day", group_by, pageSize=settings.snapshot_page_size)
+        builder = _TableBuilder()
+
+        for page_no in range(1, settings.snapshot_max_pages + 1):
+            variables = {
+                "option": option.model_copy(update={"pageNo": page_no}).model_dump(exclude_none=True),
+                "filter": Filter().model_dump(exclude_none=True)
+            }
+            data = await client.execute(query, variables, operation, use_cache=False)
+            rows = data.get(field, [])
+            # Conversion and writing run in a worker thread so live tool calls are not blocked
+            await asyncio.to_thread(builder.add_page, rows)
+
+            if len(rows) < settings.snapshot_page_size:
+                break
+        else:
+            raise ValueError(f"{dataset}/{group_by} exceeded {settings.snapshot_max_pages} pages; reduce SNAPSHOT_LOOKBACK_DAYS.")
+
+        await asyncio.to_thread(builder.write, os.path.join(path, dataset, group_by))
+        if builder.skipped:
+            logger.warning("snapshot.rows_skipped", dataset=dataset, group_by=group_by, rows=builder.skipped)
+        return builder.rows, builder.skipped
+
+    def refresh(self) -> bool:
+        """Starts a materialization in the background; False if one is already running."""
+        if self._running is not None and not self._running.done():
+            return False
+        # Fresh context: the caller's tool deadline must not cut the materialization short
+        self._running = asyncio.get_running_loop().create_task(self._run_once(), context=contextvars.Context())
+        return True
+
+    async def _run_once(self) -> Dict[str, Any]:
+        try:
+            return await self.materialize()
+        except Exception as e:
+            self.last_error = f"{type(e).__name__}: {e}"
+            logger.warning("snapshot.materialize_failed", error=self.last_error)
+            return {}
+
+    def ensure_started(self) -> None:
+        """Starts the periodic materializer (idempotent); no-op when snapshots are off."""
+        if settings.snapshot_mode == "off" or settings.snapshot_interval_seconds <= 0:
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._loop(), context=contextvars.Context())
+
+    async def _loop(self) -> None:
+        while True:
+            snapshot = self.store.current(service_tenant())
+            # After a restart, wait out the published snapshot's remaining freshness
+            wait = 0.0 if snapshot is None else max(settings.snapshot_interval_seconds - snapshot.age_seconds, 0.0)
+            await asyncio.sleep(wait)
+            self.refresh()
+            await self._running
+            if self.last_error:
+                await asyncio.sleep(min(settings.snapshot_interval_seconds, 300.0))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._running is not None and not self._running.done(),
+            "periodic": self._task is not None and not self._task.done(),
+            "last_run": self.last_run,
+            "last_error": self.last_error,
+        }
+
+snapshot_materializer = SnapshotMaterializer(snapshot_store)
+
+# --- Tool Integration ---
+
+async def execute(client: Any, query: str, variables: Dict[str, Any], operation_name: str,
+                  use_cache: bool = True) -> Tuple[Dict[str, Any], Optional[str]]:
+    """
+    Runs a tool query according to settings.snapshot_mode. Returns the
+    GraphQL `data` and, when it came from a snapshot, a label with the
+    snapshot's age for the response header. `use_cache` is passed to the
+    live backend call.
+    """
+    mode = settings.snapshot_mode
+    if mode == "off":
+        return await client.execute(query, variables, operation_name, use_cache=use_cache), None
+
+    tenant = client.headers.get("x-mavvrik-tenant") or client.headers.get("tenant") or "default"
+
+    def from_snapshot() -> Tuple[Optional[Snapshot], Optional[Dict[str, Any]]]:
+        snapshot = snapshot_store.current(tenant)
+        if snapshot is None:
+            return None, None
+        started = time.perf_counter()
+        data = snapshot.answer(operation_name, variables)
+        if data is not None:
+            metrics.incr("snapshot.answers", mode=mode)
+            metrics.incr("snapshot.query_ms", (time.perf_counter() - started) * 1000, mode=mode)
+        return snapshot, data
+
+    if mode in ("prefer", "only"):
+        snapshot, data = from_snapshot()
+        if data is not None and (mode == "only" or snapshot.age_seconds <= settings.snapshot_max_age_seconds):
+            return data, snapshot.label()
+        if mode == "only":
+            coverage = snapshot.label() if snapshot else "No snapshot has been materialized yet"
+            raise SnapshotUnavailable(f"Offline mode: this query is not covered by the local snapshot. {coverage}.")
+        metrics.incr("snapshot.misses", mode=mode)
+        return await client.execute(query, variables, operation_name, use_cache=use_cache), None
+
+    try:
+        return await client.execute(query, variables, operation_name, use_cache=use_cache), None
+    except (ValueError, DeadlineExceeded) as e:
+        snapshot, data = from_snapshot()
+        if data is None:
+            raise
+        logger.warning("snapshot.fallback", operation=operation_name, error=str(e))
+        return data, f"{snapshot.label()}; live backend unavailable ({e})"
+
+def main() -> None:
+    from src.logs import configure_logging
+    from src.client import close_http_client
+
+    configure_logging()
+
+    async def run() -> Dict[str, Any]:
+        try:
+            return await snapshot_materializer.materialize()
+        finally:
+            await close_http_client()
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+if __name__ == "__main__":
+    main()
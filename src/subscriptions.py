@@ -0,0 +1,231 @@
+"""
+Subscribable MCP resources refreshed by shared pollers.
+
+Each resource view is backed by at most one poller per (tenant, view): it
+refetches the view every settings.resource_poll_interval_seconds while at
+least one session is subscribed, fingerprints the result and sends
+`notifications/resources/updated` to every subscribed session only when the
+values changed. One backend fetch per interval therefore serves any number
+of subscribers, and reads in between are answered from the poller's copy.
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import time
+import weakref
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.server.session import ServerSession
+from pydantic import AnyUrl
+
+from src.config import settings
+from src.deadline import deadline_scope
+from src.logs import get_logger
+from src.metrics import metrics
+from src.snapshot import service_tenant
+
+logger = get_logger(__name__)
+
+# Returns (payload, data_as_of label); the payload alone decides whether a view changed
+ViewFetch = Callable[[], Awaitable[Tuple[Dict[str, Any], Optional[str]]]]
+
+def _fingerprint(payload: Dict[str, Any]) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+# --- Poller ---
+
+class _ViewPoller:
+    """Latest value of one view for one tenant, plus the sessions subscribed to it."""
+
+    def __init__(self, uri: str, view: str, fetch: ViewFetch):
+        self.uri = uri
+        self.view = view
+        self.fetch = fetch
+        # Weak: a session that disconnects without unsubscribing drops out once collected
+        self.sessions: "weakref.WeakSet[ServerSession]" = weakref.WeakSet()
+        self.value: Optional[Dict[str, Any]] = None
+        self.as_of: Optional[str] = None
+        self.fingerprint: Optional[str] = None
+        self.revision = 0
+        self.fetched_at = 0.0  # monotonic
+        self.changed_at: Optional[float] = None  # wall clock
+        self.polls = 0
+        self.notifications = 0
+        self.last_error: Optional[str] = None
+        self.failures = 0  # consecutive failed polls
+        self._lock = asyncio.Lock()
+        self._task: Optional["asyncio.Task[None]"] = None
+
+    def fresh(self, max_age: float) -> bool:
+        return self.value is not None and time.monotonic() - self.fetched_at < max_age
+
+    async def refresh(self, max_age: float = 0.0) -> bool:
+        """Fetches the view unless a value younger than `max_age` exists; True if it changed."""
+        # Serialized so a read and a poll arriving together share one fetch
+        async with self._lock:
+            if max_age > 0 and self.fresh(max_age):
+                return False
+            with deadline_scope(settings.resource_poll_timeout_seconds):
+                payload, as_of = await self.fetch()
+            self.polls += 1
+            self.fetched_at = time.monotonic()
+            self.as_of = as_of
+            fingerprint = _fingerprint(payload)
+            if fingerprint == self.fingerprint:
+                metrics.incr("subscriptions.unchanged", view=self.view)
+                return False
+            changed = self.fingerprint is not None
+            self.value, self.fingerprint = payload, fingerprint
+            self.revision += 1
+            self.changed_at = time.time()
+            if changed:
+                metrics.incr("subscriptions.changed", view=self.view)
+            return changed
+
+    def document(self) -> Dict[str, Any]:
+        return {
+            "uri": self.uri,
+            "revision": self.revision,
+            "data_as_of": self.as_of or "live",
+            "changed_at": datetime.fromtimestamp(self.changed_at, timezone.utc).isoformat() if self.changed_at else None,
+            "data": self.value,
+        }
+
+    def ensure_polling(self) -> None:
+        if self._task is None or self._task.done():
+            # Fresh context: the subscribing request's deadline must not apply to the poller
+            self._task = asyncio.get_running_loop().create_task(self._loop(), context=contextvars.Context())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    def next_delay(self) -> float:
+        """Seconds until the next poll."""
+        interval = settings.resource_poll_interval_seconds
+        if self.failures:
+            # Backend failing: back off exponentially instead of retrying every second
+            return min(interval * 2 ** (self.failures - 1), max(settings.resource_poll_max_backoff_seconds, interval))
+        # Sleep until the current value expires (a read may have refreshed it early)
+        return max(interval - (time.monotonic() - self.fetched_at), 1.0)
+
+    async def _loop(self) -> None:
+        while self.sessions:
+            try:
+                if await self.refresh(max_age=settings.resource_poll_interval_seconds):
+                    await self._notify()
+                self.last_error = None
+                self.failures = 0
+            except Exception as e:
+                # Keep serving the last good value; subscribers are not notified of failures
+                self.last_error = f"{type(e).__name__}: {e}"
+                self.failures += 1
+                metrics.incr("subscriptions.poll_errors", view=self.view)
+                logger.warning("subscriptions.poll_failed", view=self.view, error=self.last_error, failures=self.failures)
+            await asyncio.sleep(self.next_delay())
+
+    async def _notify(self) -> None:
+        sessions = list(self.sessions)
+        results = await asyncio.gather(
+            *(session.send_resource_updated(AnyUrl(self.uri)) for session in sessions),
+            return_exceptions=True,
+        )
+        delivered = 0
+        for session, result in zip(sessions, results):
+            if isinstance(result, Exception):
+                # Disconnected without unsubscribing
+                self.sessions.discard(session)
+            else:
+                delivered += 1
+        self.notifications += delivered
+        metrics.incr("subscriptions.notifications", delivered, view=self.view)
+        logger.info("subscriptions.updated", view=self.view, revision=self.revision, sessions=delivered)
+
+# --- Hub ---
+
+class SubscriptionHub:
+    """Registered views and their pollers, keyed by (tenant, view)."""
+
+    def __init__(self) -> None:
+        self._views: Dict[str, Tuple[str, ViewFetch]] = {}
+        self._pollers: Dict[Tuple[str, str], _ViewPoller] = {}
+
+    def register(self, uri: str, view: str, fetch: ViewFetch) -> None:
+        self._views[uri] = (view, fetch)
+
+    def _poller(self, uri: str) -> _ViewPoller:
+        if uri not in self._views:
+            raise ValueError(f"Unknown resource: {uri}")
+        view, fetch = self._views[uri]
+        key = (service_tenant(), view)
+        poller = self._pollers.get(key)
+        if poller is None:
+            poller = self._pollers[key] = _ViewPoller(uri, view, fetch)
+        return poller
+
+    async def read(self, uri: str) -> str:
+        poller = self._poller(uri)
+        changed = await poller.refresh(max_age=settings.resource_poll_interval_seconds)
+        if changed and poller.sessions:
+            await poller._notify()
+        return json.dumps(poller.document(), indent=2, default=str)
+
+    def subscribe(self, uri: str, session: ServerSession) -> None:
+        poller = self._poller(uri)
+        poller.sessions.add(session)
+        poller.ensure_polling()
+        metrics.incr("subscriptions.subscribed", view=poller.view)
+
+    def unsubscribe(self, uri: str, session: ServerSession) -> None:
+        poller = self._poller(uri)
+        poller.sessions.discard(session)
+        if not poller.sessions:
+            poller.stop()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            f"{tenant}/{view}": {
+                "subscribers": len(poller.sessions),
+                "polling": poller._task is not None and not poller._task.done(),
+                "revision": poller.revision,
+                "polls": poller.polls,
+                "notifications": poller.notifications,
+                "last_error": poller.last_error,
+            }
+            for (tenant, view), poller in self._pollers.items()
+        }
+
+subscription_hub = SubscriptionHub()
+
+# --- MCP Wiring ---
+
+def enable_subscriptions(mcp: FastMCP) -> None:
+    """
+    Adds resources/subscribe and resources/unsubscribe handlers. FastMCP only
+    registers list/read handlers and always advertises `subscribe: false`, so
+    the low-level server is extended directly.
+    """
+    server = mcp._mcp_server
+
+    @server.subscribe_resource()
+    async def subscribe(uri: AnyUrl) -> None:
+        subscription_hub.subscribe(str(uri), server.request_context.session)
+
+    @server.unsubscribe_resource()
+    async def unsubscribe(uri: AnyUrl) -> None:
+        subscription_hub.unsubscribe(str(uri), server.request_context.session)
+
+    get_capabilities = server.get_capabilities
+
+    def capabilities_with_subscribe(*args: Any, **kwargs: Any) -> types.ServerCapabilities:
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = capabilities_with_subscribe
@@ -0,0 +1,130 @@
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Literal, Optional
+
+from mcp.server.fastmcp import FastMCP, Context
+
+# Internal Imports
+from src.cache import response_cache
+from src.client import persisted_query_stats
+from src.compression import compression_report
+from src.config import settings
+from src.instrumentation import instrumented_tool
+from src.metrics import metrics
+from src.profiling import profiling_config
+from src.runtime import loop_lag_monitor, process_memory
+from src.snapshot import service_tenant, snapshot_materializer, snapshot_store
+from src.subscriptions import subscription_hub
+
+def _format_admin_response(data: Dict[str, Any], title: str) -> str:
+    return (
+        f"### {title}\n"
+        f"**Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"\n```json\n{json.dumps(data, indent=2, default=str)}\n```\n"
+    )
+
+def register_admin(mcp: FastMCP):
+    """
+    Registers operational (admin) tools: server metrics and diagnostics.
+    These never call the Mavvrik backend, except a requested snapshot refresh.
+    """
+    tool = instrumented_tool(mcp)
+
+    @tool
+    async def mvk_server_metrics(ctx: Context, include_raw_counters: bool = False) -> str:
+        """
+        Reports MCP server health metrics: event-loop lag and process memory,
+        resource subscriptions (subscribers, polls, notifications per view),
+        response compression ratios and decode CPU,
+        result store usage (bytes vs. budget, entry counts, eviction reasons), cache
+        compression, and persisted-query registration.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** An operator asks about server performance, caching or bandwidth.
+        - **DO NOT USE:** For any cloud cost question.
+        """
+        data: Dict[str, Any] = {
+            "runtime": {
+                "event_loop_lag": loop_lag_monitor.stats(),
+                "memory": process_memory(),
+            },
+            "subscriptions": subscription_hub.stats(),
+            "compression": compression_report(),
+            "cache": response_cache.stats(),
+            "persisted_queries": persisted_query_stats(),
+        }
+        if include_raw_counters:
+            data["counters"] = metrics.snapshot()
+
+        return _format_admin_response(data, "Server Metrics")
+
+    @tool
+    async def mvk_admin_profiling(
+        ctx: Context,
+        action: Literal["status", "enable", "disable"] = "status",
+        tools: Optional[List[str]] = None,
+        sample_rate: Optional[float] = None
+    ) -> str:
+        """
+        Turns on-demand profiling of tool invocations on or off, or shows recent profiles.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** An operator asks to profile or diagnose a slow tool.
+        - **DO NOT USE:** For any cloud cost question.
+
+        [Argument Mapping Guide]
+        - `action="enable", tools=["mvk_cost_trend"]`: Profile every call of those tools (use ["*"] for all).
+        - `action="enable", sample_rate=0.05`: Profile 5% of all tool calls.
+        - `action="disable"`: Stop profiling (clears tools and sample rate).
+        - `action="status"`: Current settings and the most recent profile files.
+
+        Profiles are written as folded stacks (flamegraph/speedscope) to the configured directory.
+        """
+        if action == "enable":
+            if tools is None and sample_rate is None:
+                return "Validation Error: Provide `tools` and/or `sample_rate` to enable profiling."
+            if sample_rate is not None and not 0.0 <= sample_rate <= 1.0:
+                return "Validation Error: `sample_rate` must be between 0 and 1."
+            if tools is not None:
+                profiling_config.tools = set(tools)
+            if sample_rate is not None:
+                profiling_config.sample_rate = sample_rate
+        elif action == "disable":
+            profiling_config.tools = set()
+            profiling_config.sample_rate = 0.0
+
+        return _format_admin_response(profiling_config.status(), "Profiling")
+
+    @tool
+    async def mvk_admin_snapshot(
+        ctx: Context,
+        action: Literal["status", "refresh"] = "status"
+    ) -> str:
+        """
+        Shows or refreshes the offline cost snapshot that tools can answer from
+        during backend maintenance or in air-gapped mode.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** An operator asks about snapshot/offline mode, data freshness, or wants a new snapshot.
+        - **DO NOT USE:** For any cloud cost question.
+
+        [Argument Mapping Guide]
+        - `action="status"`: Mode, current snapshot age and coverage, last materialization result.
+        - `action="refresh"`: Starts a new materialization in the background (reads the backend).
+        """
+        data: Dict[str, Any] = {"mode": settings.snapshot_mode}
+        if action == "refresh":
+            data["refresh"] = "started" if snapshot_materializer.refresh() else "already running"
+
+        current = snapshot_store.current(service_tenant())
+        data["current"] = None if current is None else {
+            "label": current.label(),
+            "age_seconds": round(current.age_seconds),
+            "path": current.path,
+            "datasets": current.meta["datasets"],
+            "rows": current.meta["rows"],
+        }
+        data["materializer"] = snapshot_materializer.status()
+        data["interval_seconds"] = settings.snapshot_interval_seconds
+        data["answers"] = {m: int(metrics.get("snapshot.answers", mode=m)) for m in metrics.label_values("snapshot.answers", "mode")}
+        return _format_admin_response(data, "Offline Snapshot")
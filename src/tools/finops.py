@@ -1,371 +1,739 @@
-from collections import defaultdict
-from typing import Optional, Literal, List, Any, Dict
-from mcp.server.fastmcp import FastMCP, Context
-import asyncio
-
-# Internal Imports
-from src.client import MavvrikClient
-from src.formatting import format_cost_response
-from src.config import settings
-from src.schemas import CostOption, Filter
-
-# --- GraphQL Constants ---
-# We use a single unified query structure consistent with Scenario 1 
-QUERY_COSTS = """
-query CostsQuery($option: CostOption!, $filter: Filter) {
-  costs(option: $option, filter: $filter) {
-    cost
-    date
-    groupId
-    groupName
-  }
-}
-"""
-
-QUERY_COST_RANKINGS = """
-query CostTopEntriesQuery($option: CostOption!, $filter: Filter) {
-  costTopEntries(option: $option, filter: $filter) {
-    topEntries {
-      cost
-      groupId
-      groupName
-    }
-  }
-}
-"""
-
-QUERY_K8S_COSTS = """
-query K8sCostsQuery($option: CostOption!, $filter: Filter) {
-  k8sCosts(option: $option, filter: $filter) {
-    groupId
-    groupName
-    cost
-    date
-  }
-}
-"""
-
-def register_finops(mcp: FastMCP):
-    """
-    Registers Financial Operations (FinOps) tools with the MCP server.
-    """
-
-    @mcp.tool()
-    async def mvk_cost_overview(
-        ctx: Context,
-        from_date: str,
-        to_date: str,
-        granularity: Literal["month", "day"] = "month",
-        provider: Optional[str] = None
-    ) -> str:
-        """
-        Calculates the single SCALAR total cost (or aggregated bill) for a specific time period.
-
-        [Use Case Strategy]
-        - **USE THIS TOOL WHEN:** The user asks for "Total Spend", "How much did we spend?", "What is the bill?", or "Invoice total".
-        - **DO NOT USE WHEN:** The user asks for a "breakdown", "trend", "list of services", or "comparison".
-        
-        [Parameter Reasoning]
-        - `granularity`: Default to "month" for high-level reporting. Use "day" only if the user asks for "daily totals" without a chart.
-        - `provider`: Use this ONLY if the user explicitly scopes the question (e.g., "Total AWS spend").
-        
-        [Example Triggers]
-        - "What is my total bill for June 2024?" -> from_date="2024-06-01", to_date="2024-06-30"
-        - "How much did we spend on GCP last month?" -> provider="gcp"
-        """
-        client = MavvrikClient(ctx)
-        
-        # Normalize Provider
-        clean_provider = None
-        if provider:
-            p_map = {"amazon": "aws", "google": "gcp", "microsoft": "azure"}
-            clean_provider = p_map.get(provider.lower(), provider.lower())
-
-        try:
-            query_filter = Filter()
-            if clean_provider:
-                query_filter.provider_code = [clean_provider]
-
-            # CRITICAL FIX: Always include groupBy to prevent "undefined" error 
-            query_option = CostOption(
-                xAxis="date",
-                interval=granularity,
-                groupBy="provider_code", 
-                fromDate=from_date,
-                toDate=to_date,
-                options=["discount", "tax"]
-            )
-        except Exception as e:
-            return f"Validation Error: {str(e)}"
-
-        variables = {
-            "option": query_option.model_dump(exclude_none=True),
-            "filter": query_filter.model_dump(exclude_none=True)
-        }
-
-        # Execute
-        data = await client.execute(QUERY_COSTS, variables, "CostsQuery")
-        raw_costs = data.get("costs", [])
-        
-        # Python-side Aggregation: Sum all groups to get the Total
-        total_cost = sum(item.get("cost", 0.0) for item in raw_costs)
-        
-        # Structure the response for the LLM
-        summary_data = {
-            "total_cost": round(total_cost, 2),
-            "currency": "USD",
-            "period": f"{from_date} to {to_date}",
-            "grouping_applied": "provider_code (aggregated)"
-        }
-
-        return format_cost_response(
-            summary_data, 
-            "Cost Overview", 
-            f"view=overview&provider={clean_provider or 'all'}"
-        )
-
-    @mcp.tool()
-    async def mvk_cost_trend(
-        ctx: Context,
-        from_date: str,
-        to_date: str,
-        granularity: Literal["day", "month"] = "day",
-        split_by: Optional[Literal["product_name", "provider_code", "location_id"]] = None
-    ) -> str:
-        """
-        Generates Time-Series data to visualize spending patterns, spikes, or trends over time.
-
-        [Use Case Strategy]
-        - **USE THIS TOOL WHEN:** The user asks for "Trend", "Over time", "Daily spend", "Is cost spiking?", or "Graph".
-        - **USE FOR DIAGNOSIS:** If user asks "Why did cost go up?", use this FIRST with `split_by` to visualize the driver.
-
-        [Argument Mapping Guide]
-        - `split_by="product_name"`: Use if user asks "by Service", "by Product", or "Which service spiked?".
-        - `split_by="provider_code"`: Use if user asks "by Cloud", "AWS vs Azure".
-        - `split_by="location_id"`: Use if user asks "by Region".
-        - `split_by=None`: Use for simple "Total daily spend" trends.
-
-        [Example Triggers]
-        - "Show me the daily trend for the last 30 days." -> granularity="day", split_by=None
-        - "Plot monthly cost split by Service." -> granularity="month", split_by="product_name"
-        """
-        client = MavvrikClient(ctx)
-
-        try:
-            query_filter = Filter()
-            
-            # CRITICAL FIX: Ensure valid groupBy exists 
-            # If user didn't ask for split, we still group by provider to keep backend happy.
-            effective_group_by = split_by if split_by else "provider_code"
-            
-            query_option = CostOption(
-                xAxis="date",
-                interval=granularity,
-                groupBy=effective_group_by, 
-                fromDate=from_date,
-                toDate=to_date,
-                options=["discount", "tax"]
-            )
-        except Exception as e:
-            return f"Validation Error: {str(e)}"
-
-        variables = {
-            "option": query_option.model_dump(exclude_none=True),
-            "filter": query_filter.model_dump(exclude_none=True)
-        }
-
-        data = await client.execute(QUERY_COSTS, variables, "CostsQuery")
-        raw_costs = data.get("costs", [])
-
-        # Post-Processing Logic
-        if not split_by:
-            # User wanted a simple trend line (Total Cost vs Time).
-            # We must merge the provider segments into a single value per date.
-            date_map = defaultdict(float)
-            for item in raw_costs:
-                d = item.get("date")
-                c = item.get("cost", 0.0)
-                date_map[d] += c
-            
-            # Convert back to sorted list
-            final_costs = [{"date": d, "cost": round(c, 2)} for d, c in sorted(date_map.items())]
-        else:
-            # User wanted the split, return raw grouped data
-            final_costs = raw_costs
-
-        return format_cost_response(
-            final_costs, 
-            f"Cost Trend ({granularity})", 
-            f"view=trend&interval={granularity}&split={split_by or 'total'}"
-        )
-
-    @mcp.tool()
-    async def mvk_cost_rankings(
-        ctx: Context,
-        month: str,
-        category: Literal["product_name", "service", "resource_group_id", "location_id", "billing_account_id"] = "product_name",
-        limit: int = 5
-    ) -> str:
-        """
-        Identifies the TOP cost drivers for a specific month.
-
-        [Use Case Strategy]
-        - **USE THIS TOOL WHEN:** The user asks for "Top X", "Biggest spenders", "Rankings", or "Who spent the most?".
-        - **DO NOT USE FOR KUBERNETES:** If user mentions "Cluster", "Pod", or "Namespace", use `mvk_k8s_drilldown` instead.
-
-        [Argument Mapping Guide]
-        - `category="product_name"`: Default. Use for "Top Services", "Top Products".
-        - `category="billing_account_id"`: Use for "Top Teams", "Top Accounts", "Top Subscriptions".
-        - `category="location_id"`: Use for "Top Regions".
-
-        [Constraints]
-        - Only works for a single `month` (e.g., "2024-06").
-        - `limit`: Default is 5. Max is 20.
-        """
-        client = MavvrikClient(ctx)
-        safe_limit = min(limit, settings.max_list_limit)
-        formatted_month = f"{month}-01" if len(month) == 7 else month
-
-        try:
-            query_filter = Filter()
-            # Scenario 3 [cite: 15] uses 'category', 'month', 'limit'.
-            query_option = CostOption(
-                category=category,
-                month=formatted_month,
-                limit=safe_limit,
-                options=["discount", "tax"]
-            )
-        except Exception as e:
-            return f"Validation Error: {str(e)}"
-
-        variables = {
-            "option": query_option.model_dump(exclude_none=True),
-            "filter": query_filter.model_dump(exclude_none=True)
-        }
-
-        data = await client.execute(QUERY_COST_RANKINGS, variables, "CostTopEntriesQuery")
-        
-        return format_cost_response(
-            data.get("costTopEntries", {}), 
-            f"Top {safe_limit} by {category}", 
-            f"view=rankings&dim={category}&month={formatted_month}"
-        )
-    
-    @mcp.tool()
-    async def mvk_k8s_drilldown(
-        ctx: Context,
-        from_date: str,
-        to_date: str,
-        group_by: Literal["cluster_id", "namespace", "node"] = "cluster_id"
-    ) -> str:
-        """
-        Analyzes KUBERNETES (K8s) specific cost metrics.
-
-        [Use Case Strategy]
-        - **EXCLUSIVE TRIGGER:** Use this tool IF AND ONLY IF the user mentions "Kubernetes", "K8s", "EKS", "AKS", "GKE", "Cluster", "Node", or "Namespace".
-        - **DO NOT USE:** For standard cloud VM/Storage costs (use `mvk_cost_rankings`).
-
-        [Argument Mapping Guide]
-        - `group_by="cluster_id"`: "Which cluster costs the most?", "Total K8s spend".
-        - `group_by="namespace"`: "Cost by Team" (if on K8s), "Top Namespaces".
-        - `group_by="node"`: "Infrastructure cost", "Compute nodes".
-
-        [Example Triggers]
-        - "Show me the top namespaces by cost last month." -> group_by="namespace"
-        - "What is my K8s cluster spend?" -> group_by="cluster_id"
-        """
-        client = MavvrikClient(ctx)
-
-        try:
-            query_filter = Filter()
-            # Scenario 5 [cite: 20] mandates groupBy for K8s queries
-            query_option = CostOption(
-                xAxis="date",
-                interval="month",
-                groupBy=group_by,
-                fromDate=from_date,
-                toDate=to_date
-            )
-        except Exception as e:
-            return f"Validation Error: {str(e)}"
-
-        variables = {
-            "option": query_option.model_dump(exclude_none=True),
-            "filter": query_filter.model_dump(exclude_none=True)
-        }
-
-        data = await client.execute(QUERY_K8S_COSTS, variables, "K8sCostsQuery")
-        
-        return format_cost_response(
-            data.get("k8sCosts", []), 
-            f"Kubernetes Cost by {group_by}", 
-            f"view=k8s&group={group_by}"
-        )
-    
-    @mcp.tool()
-    async def mvk_cost_compare(
-        ctx: Context,
-        base_start: str,
-        base_end: str,
-        comp_start: str,
-        comp_end: str
-    ) -> str:
-        """
-        Compares total cost between two time periods to calculate VARIANCE (Delta & %).
-
-        [Use Case Strategy]
-        - **USE THIS TOOL WHEN:** The user asks "Compare", "Growth", "Increase", "Decrease", or "MoM" (Month-over-Month).
-        - **USE FOR "WHY":** If user asks "Why did my bill go up?", use this tool FIRST to establish the exact magnitude of the increase ($ and %).
-
-        [Functional Logic]
-        - Calculates: (Base Period Cost - Comparison Period Cost).
-        - Returns: Absolute difference ($) and Percentage difference (%).
-
-        [Example Triggers]
-        - "Compare June 2024 vs May 2024." -> base=June, comp=May
-        - "Did spend go up last week?" -> base=Last Week, comp=Week Before
-        """
-        client = MavvrikClient(ctx)
-
-        async def fetch_period_total(start, end):
-            # Same fix as Overview: Force groupBy="provider_code" to avoid undefined error
-            q_opt = CostOption(
-                xAxis="date",
-                interval="month",
-                groupBy="provider_code",
-                fromDate=start,
-                toDate=end,
-                options=["discount", "tax"]
-            )
-            vars = {
-                "option": q_opt.model_dump(exclude_none=True),
-                "filter": Filter().model_dump(exclude_none=True)
-            }
-            res = await client.execute(QUERY_COSTS, vars, "CostsQuery")
-            costs = res.get("costs", [])
-            # Aggregate manually
-            return sum(item.get('cost', 0) for item in costs)
-
-        try:
-            base_total, comp_total = await asyncio.gather(
-                fetch_period_total(base_start, base_end),
-                fetch_period_total(comp_start, comp_end)
-            )
-            
-            delta = base_total - comp_total
-            pct = (delta / comp_total * 100) if comp_total != 0 else 0.0
-            
-            synthetic_data = {
-                "comparison": {
-                    "base_period": {"start": base_start, "end": base_end, "total_cost": round(base_total, 2)},
-                    "comparison_period": {"start": comp_start, "end": comp_end, "total_cost": round(comp_total, 2)},
-                    "variance": {
-                        "absolute_change": round(delta, 2), 
-                        "percent_change": f"{round(pct, 2)}%"
-                    }
-                }
-            }
-            return format_cost_response(synthetic_data, "Period Comparison", "view=compare")
-            
-        except Exception as e:
-            return f"Execution Error: {str(e)}"
\ No newline at end of file
+from collections import defaultdict
+from typing import Annotated, Optional, Literal, List, Any, Dict
+from mcp.server.fastmcp import FastMCP, Context
+from pydantic import Field, ValidationError
+import asyncio
+
+# Internal Imports
+from src.client import MavvrikClient
+from src.formatting import format_cost_response, format_batch_response
+from src.config import settings
+from src.schemas import CostOption, Filter, BatchQuery
+from src.deadline import DeadlineExceeded, gather_partial
+from src.downsampling import choose_interval, downsample_rows
+from src.export import export_pages, export_path, parquet_available
+from src.heavy_hitters import SpaceSaving
+from src import snapshot
+from src.tracing import span
+from src.instrumentation import instrumented_tool
+
+# --- GraphQL Constants ---
+# We use a single unified query structure consistent with Scenario 1 
+QUERY_COSTS = """
+query CostsQuery($option: CostOption!, $filter: Filter) {
+  costs(option: $option, filter: $filter) {
+    cost
+    date
+    groupId
+    groupName
+  }
+}
+"""
+
+QUERY_COST_RANKINGS = """
+query CostTopEntriesQuery($option: CostOption!, $filter: Filter) {
+  costTopEntries(option: $option, filter: $filter) {
+    topEntries {
+      cost
+      groupId
+      groupName
+    }
+  }
+}
+"""
+
+QUERY_K8S_COSTS = """
+query K8sCostsQuery($option: CostOption!, $filter: Filter) {
+  k8sCosts(option: $option, filter: $filter) {
+    groupId
+    groupName
+    cost
+    date
+  }
+}
+"""
+
+# Tag breakdowns reuse `costs` grouped by tag value; pages are requested explicitly
+QUERY_TAG_COSTS = """
+query TagCostsQuery($option: CostOption!, $filter: Filter) {
+  costs(option: $option, filter: $filter) {
+    cost
+    groupId
+    groupName
+  }
+}
+"""
+
+# --- Query Variables ---
+# Cost basis each dataset's live tools query with. Snapshots and resources build their
+# queries through series_option() so they serve the same figures as the tools.
+DATASET_OPTIONS: Dict[str, Optional[List[str]]] = {
+    "costs": ["discount", "tax"],
+    "k8s": None,
+}
+
+def series_option(dataset: Literal["costs", "k8s"], from_date: str, to_date: str, interval: str,
+                  group_by: str, **extra: Any) -> CostOption:
+    """Date-series CostOption exactly as the `dataset` tools send it."""
+    return CostOption(
+        xAxis="date",
+        interval=interval,
+        groupBy=group_by,
+        fromDate=from_date,
+        toDate=to_date,
+        options=DATASET_OPTIONS[dataset],
+        **extra
+    )
+
+def register_finops(mcp: FastMCP):
+    """
+    Registers Financial Operations (FinOps) tools with the MCP server.
+    """
+    # Every tool gets correlation IDs, tracing and its deadline
+    tool = instrumented_tool(mcp)
+
+    @tool
+    async def mvk_cost_overview(
+        ctx: Context,
+        from_date: str,
+        to_date: str,
+        granularity: Literal["month", "day"] = "month",
+        provider: Optional[str] = None
+    ) -> str:
+        """
+        Calculates the single SCALAR total cost (or aggregated bill) for a specific time period.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** The user asks for "Total Spend", "How much did we spend?", "What is the bill?", or "Invoice total".
+        - **DO NOT USE WHEN:** The user asks for a "breakdown", "trend", "list of services", or "comparison".
+        
+        [Parameter Reasoning]
+        - `granularity`: Default to "month" for high-level reporting. Use "day" only if the user asks for "daily totals" without a chart.
+        - `provider`: Use this ONLY if the user explicitly scopes the question (e.g., "Total AWS spend").
+        
+        [Example Triggers]
+        - "What is my total bill for June 2024?" -> from_date="2024-06-01", to_date="2024-06-30"
+        - "How much did we spend on GCP last month?" -> provider="gcp"
+        """
+        client = MavvrikClient(ctx)
+        
+        # Normalize Provider
+        clean_provider = None
+        if provider:
+            p_map = {"amazon": "aws", "google": "gcp", "microsoft": "azure"}
+            clean_provider = p_map.get(provider.lower(), provider.lower())
+
+        with span("validate"):
+            try:
+                query_filter = Filter()
+                if clean_provider:
+                    query_filter.provider_code = [clean_provider]
+
+                # CRITICAL FIX: Always include groupBy to prevent "undefined" error 
+                query_option = series_option("costs", from_date, to_date, granularity, "provider_code")
+            except Exception as e:
+                return f"Validation Error: {str(e)}"
+
+        variables = {
+            "option": query_option.model_dump(exclude_none=True),
+            "filter": query_filter.model_dump(exclude_none=True)
+        }
+
+        # Execute (live, or from the offline snapshot depending on SNAPSHOT_MODE)
+        data, as_of = await snapshot.execute(client, QUERY_COSTS, variables, "CostsQuery")
+        raw_costs = data.get("costs", [])
+        
+        # Python-side Aggregation: Sum all groups to get the Total
+        with span("aggregate", rows=len(raw_costs)):
+            total_cost = sum(item.get("cost", 0.0) for item in raw_costs)
+        
+        # Structure the response for the LLM
+        summary_data = {
+            "total_cost": round(total_cost, 2),
+            "currency": "USD",
+            "period": f"{from_date} to {to_date}",
+            "grouping_applied": "provider_code (aggregated)"
+        }
+
+        return format_cost_response(
+            summary_data, 
+            "Cost Overview", 
+            f"view=overview&provider={clean_provider or 'all'}",
+            data_as_of=as_of
+        )
+
+    @tool
+    async def mvk_cost_trend(
+        ctx: Context,
+        from_date: str,
+        to_date: str,
+        granularity: Literal["auto", "day", "week", "month"] = "auto",
+        split_by: Optional[Literal["product_name", "provider_code", "location_id"]] = None,
+        max_points: Annotated[Optional[int], Field(ge=3)] = None
+    ) -> str:
+        """
+        Generates Time-Series data to visualize spending patterns, spikes, or trends over time.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** The user asks for "Trend", "Over time", "Daily spend", "Is cost spiking?", or "Graph".
+        - **USE FOR DIAGNOSIS:** If user asks "Why did cost go up?", use this FIRST with `split_by` to visualize the driver.
+
+        [Argument Mapping Guide]
+        - `split_by="product_name"`: Use if user asks "by Service", "by Product", or "Which service spiked?".
+        - `split_by="provider_code"`: Use if user asks "by Cloud", "AWS vs Azure".
+        - `split_by="location_id"`: Use if user asks "by Region".
+        - `split_by=None`: Use for simple "Total daily spend" trends.
+        - `granularity="auto"`: Default. Picks day/week/month so each series fits within `max_points`.
+          Use "day" only if the user explicitly needs daily values; long daily series are
+          downsampled (peaks and dips preserved) to `max_points` per series.
+        - `max_points`: Leave unset for the server default. Minimum 3 (first, last and one peak).
+
+        [Example Triggers]
+        - "Show me the daily trend for the last 30 days." -> granularity="day", split_by=None
+        - "How has spend trended over the last two years?" -> granularity="auto"
+        - "Plot monthly cost split by Service." -> granularity="month", split_by="product_name"
+        """
+        client = MavvrikClient(ctx)
+        point_budget = max_points or settings.trend_max_points
+
+        # Adaptive mode: coarsen the interval for long ranges so the backend
+        # never ships more points than the model can use.
+        if granularity == "auto":
+            granularity = choose_interval(from_date, to_date, point_budget)
+
+        with span("validate"):
+            try:
+                query_filter = Filter()
+            
+                # CRITICAL FIX: Ensure valid groupBy exists 
+                # If user didn't ask for split, we still group by provider to keep backend happy.
+                effective_group_by = split_by if split_by else "provider_code"
+            
+                query_option = series_option("costs", from_date, to_date, granularity, effective_group_by)
+            except Exception as e:
+                return f"Validation Error: {str(e)}"
+
+        variables = {
+            "option": query_option.model_dump(exclude_none=True),
+            "filter": query_filter.model_dump(exclude_none=True)
+        }
+
+        data, as_of = await snapshot.execute(client, QUERY_COSTS, variables, "CostsQuery")
+        raw_costs = data.get("costs", [])
+
+        with span("aggregate", rows=len(raw_costs)):
+            # Post-Processing Logic
+            if not split_by:
+                # User wanted a simple trend line (Total Cost vs Time).
+                # We must merge the provider segments into a single value per date.
+                date_map = defaultdict(float)
+                for item in raw_costs:
+                    d = item.get("date")
+                    c = item.get("cost", 0.0)
+                    date_map[d] += c
+            
+                # Convert back to sorted list
+                final_costs = [{"date": d, "cost": round(c, 2)} for d, c in sorted(date_map.items())]
+            else:
+                # User wanted the split, return raw grouped data
+                final_costs = raw_costs
+
+            # Downsample locally when the requested interval still exceeds the budget
+            original_points = len(final_costs)
+            final_costs = downsample_rows(final_costs, point_budget, series_key="groupId" if split_by else None)
+            if len(final_costs) < original_points:
+                final_costs = {
+                    "downsampling": f"LTTB, {original_points} -> {len(final_costs)} points (max {point_budget} per series, peaks preserved)",
+                    "points": final_costs
+                }
+
+        return format_cost_response(
+            final_costs, 
+            f"Cost Trend ({granularity})", 
+            f"view=trend&interval={granularity}&split={split_by or 'total'}",
+            data_as_of=as_of
+        )
+
+    @tool
+    async def mvk_cost_rankings(
+        ctx: Context,
+        month: str,
+        category: Literal["product_name", "service", "resource_group_id", "location_id", "billing_account_id"] = "product_name",
+        limit: int = 5
+    ) -> str:
+        """
+        Identifies the TOP cost drivers for a specific month.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** The user asks for "Top X", "Biggest spenders", "Rankings", or "Who spent the most?".
+        - **DO NOT USE FOR KUBERNETES:** If user mentions "Cluster", "Pod", or "Namespace", use `mvk_k8s_drilldown` instead.
+
+        [Argument Mapping Guide]
+        - `category="product_name"`: Default. Use for "Top Services", "Top Products".
+        - `category="billing_account_id"`: Use for "Top Teams", "Top Accounts", "Top Subscriptions".
+        - `category="location_id"`: Use for "Top Regions".
+
+        [Constraints]
+        - Only works for a single `month` (e.g., "2024-06").
+        - `limit`: Default is 5. Max is 20.
+        """
+        client = MavvrikClient(ctx)
+        safe_limit = min(limit, settings.max_list_limit)
+        formatted_month = f"{month}-01" if len(month) == 7 else month
+
+        with span("validate"):
+            try:
+                query_filter = Filter()
+                # Scenario 3 [cite: 15] uses 'category', 'month', 'limit'.
+                query_option = CostOption(
+                    category=category,
+                    month=formatted_month,
+                    limit=safe_limit,
+                    options=["discount", "tax"]
+                )
+            except Exception as e:
+                return f"Validation Error: {str(e)}"
+
+        variables = {
+            "option": query_option.model_dump(exclude_none=True),
+            "filter": query_filter.model_dump(exclude_none=True)
+        }
+
+        data, as_of = await snapshot.execute(client, QUERY_COST_RANKINGS, variables, "CostTopEntriesQuery")
+        
+        return format_cost_response(
+            data.get("costTopEntries", {}), 
+            f"Top {safe_limit} by {category}", 
+            f"view=rankings&dim={category}&month={formatted_month}",
+            data_as_of=as_of
+        )
+    
+    @tool
+    async def mvk_k8s_drilldown(
+        ctx: Context,
+        from_date: str,
+        to_date: str,
+        group_by: Literal["cluster_id", "namespace", "node"] = "cluster_id"
+    ) -> str:
+        """
+        Analyzes KUBERNETES (K8s) specific cost metrics.
+
+        [Use Case Strategy]
+        - **EXCLUSIVE TRIGGER:** Use this tool IF AND ONLY IF the user mentions "Kubernetes", "K8s", "EKS", "AKS", "GKE", "Cluster", "Node", or "Namespace".
+        - **DO NOT USE:** For standard cloud VM/Storage costs (use `mvk_cost_rankings`).
+
+        [Argument Mapping Guide]
+        - `group_by="cluster_id"`: "Which cluster costs the most?", "Total K8s spend".
+        - `group_by="namespace"`: "Cost by Team" (if on K8s), "Top Namespaces".
+        - `group_by="node"`: "Infrastructure cost", "Compute nodes".
+
+        [Example Triggers]
+        - "Show me the top namespaces by cost last month." -> group_by="namespace"
+        - "What is my K8s cluster spend?" -> group_by="cluster_id"
+        """
+        client = MavvrikClient(ctx)
+
+        with span("validate"):
+            try:
+                query_filter = Filter()
+                # Scenario 5 [cite: 20] mandates groupBy for K8s queries
+                query_option = series_option("k8s", from_date, to_date, "month", group_by)
+            except Exception as e:
+                return f"Validation Error: {str(e)}"
+
+        variables = {
+            "option": query_option.model_dump(exclude_none=True),
+            "filter": query_filter.model_dump(exclude_none=True)
+        }
+
+        data, as_of = await snapshot.execute(client, QUERY_K8S_COSTS, variables, "K8sCostsQuery")
+        
+        return format_cost_response(
+            data.get("k8sCosts", []), 
+            f"Kubernetes Cost by {group_by}", 
+            f"view=k8s&group={group_by}",
+            data_as_of=as_of
+        )
+    
+    @tool
+    async def mvk_cost_compare(
+        ctx: Context,
+        base_start: str,
+        base_end: str,
+        comp_start: str,
+        comp_end: str
+    ) -> str:
+        """
+        Compares total cost between two time periods to calculate VARIANCE (Delta & %).
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** The user asks "Compare", "Growth", "Increase", "Decrease", or "MoM" (Month-over-Month).
+        - **USE FOR "WHY":** If user asks "Why did my bill go up?", use this tool FIRST to establish the exact magnitude of the increase ($ and %).
+
+        [Functional Logic]
+        - Calculates: (Base Period Cost - Comparison Period Cost).
+        - Returns: Absolute difference ($) and Percentage difference (%).
+
+        [Example Triggers]
+        - "Compare June 2024 vs May 2024." -> base=June, comp=May
+        - "Did spend go up last week?" -> base=Last Week, comp=Week Before
+        """
+        client = MavvrikClient(ctx)
+        # Snapshot labels of the periods that were answered offline
+        as_of = set()
+
+        async def fetch_period_total(start, end):
+            with span("validate"):
+                # Same fix as Overview: Force groupBy="provider_code" to avoid undefined error
+                q_opt = series_option("costs", start, end, "month", "provider_code")
+                vars = {
+                    "option": q_opt.model_dump(exclude_none=True),
+                    "filter": Filter().model_dump(exclude_none=True)
+                }
+            res, label = await snapshot.execute(client, QUERY_COSTS, vars, "CostsQuery")
+            if label:
+                as_of.add(label)
+            costs = res.get("costs", [])
+            # Aggregate manually
+            return sum(item.get('cost', 0) for item in costs)
+
+        try:
+            # Stop at the tool deadline and keep whichever period finished
+            (base_total, comp_total), partial = await gather_partial(
+                fetch_period_total(base_start, base_end),
+                fetch_period_total(comp_start, comp_end)
+            )
+            if base_total is None and comp_total is None:
+                return "Deadline Exceeded: Neither period could be fetched in time."
+
+            def period(start, end, total):
+                if total is None:
+                    return {"start": start, "end": end, "total_cost": None, "status": "not fetched (deadline exceeded)"}
+                return {"start": start, "end": end, "total_cost": round(total, 2)}
+
+            synthetic_data = {
+                "comparison": {
+                    "base_period": period(base_start, base_end, base_total),
+                    "comparison_period": period(comp_start, comp_end, comp_total),
+                }
+            }
+
+            if not partial:
+                delta = base_total - comp_total
+                pct = (delta / comp_total * 100) if comp_total != 0 else 0.0
+                synthetic_data["comparison"]["variance"] = {
+                    "absolute_change": round(delta, 2), 
+                    "percent_change": f"{round(pct, 2)}%"
+                }
+
+            return format_cost_response(
+                synthetic_data,
+                "Period Comparison",
+                "view=compare",
+                partial_reason="Variance omitted because one period timed out." if partial else None,
+                data_as_of="; ".join(sorted(as_of)) or None
+            )
+            
+        except Exception as e:
+            return f"Execution Error: {str(e)}"
+
+    @tool
+    async def mvk_tag_costs(
+        ctx: Context,
+        tag_key: str,
+        from_date: str,
+        to_date: str,
+        limit: int = 10,
+        min_share_pct: float = 1.0,
+        provider: Optional[str] = None
+    ) -> str:
+        """
+        Breaks down cost by the VALUES of a resource tag (chargeback / showback by owner, team, project, etc.).
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** The user asks "Cost by team", "Spend per owner", "Chargeback by project tag",
+          or "Which `<tag>` values cost the most?".
+        - **DO NOT USE WHEN:** Grouping by a built-in dimension (service, region, account) -> use `mvk_cost_rankings`.
+
+        [Argument Mapping Guide]
+        - `tag_key`: The tag name exactly as stored, e.g. "owner", "team", "cost_center", "commit_sha".
+        - `limit`: Max values to list (Max 20). Smaller values are folded into "other".
+        - `min_share_pct`: Only values with at least this % of tagged spend are listed. Use 0 to list the top `limit` regardless.
+
+        [Constraints]
+        - Works with tags of any cardinality: values are aggregated in bounded memory.
+          For very high-cardinality tags, listed costs carry an `error_bound` (true cost lies in [cost - error_bound, cost]).
+        - Untagged spend is reported as "(untagged)".
+        """
+        client = MavvrikClient(ctx)
+        safe_limit = max(1, min(limit, settings.max_list_limit))
+        min_share = max(min_share_pct, 0.0) / 100
+
+        clean_provider = None
+        if provider:
+            p_map = {"amazon": "aws", "google": "gcp", "microsoft": "azure"}
+            clean_provider = p_map.get(provider.lower(), provider.lower())
+
+        with span("validate"):
+            try:
+                query_filter = Filter()
+                if clean_provider:
+                    query_filter.provider_code = [clean_provider]
+                base_option = CostOption(
+                    groupBy="tag",
+                    tagKey=tag_key,
+                    interval="month",
+                    fromDate=from_date,
+                    toDate=to_date,
+                    options=["discount", "tax"],
+                    pageSize=settings.tag_page_size
+                )
+            except Exception as e:
+                return f"Validation Error: {str(e)}"
+
+        # Pages are folded into the summary one at a time: memory is bounded by
+        # the aggregator capacity, not by the tag's cardinality.
+        summary = SpaceSaving(settings.tag_aggregator_capacity)
+        pages = 0
+        partial_reason = None
+        try:
+            for page_no in range(1, settings.tag_max_pages + 1):
+                variables = {
+                    "option": base_option.model_copy(update={"pageNo": page_no}).model_dump(exclude_none=True),
+                    "filter": query_filter.model_dump(exclude_none=True)
+                }
+                # Pages are folded once; caching them would only evict interactive entries
+                data = await client.execute(QUERY_TAG_COSTS, variables, "TagCostsQuery", use_cache=False)
+                rows = data.get("costs", [])
+                pages += 1
+                with span("aggregate", rows=len(rows)):
+                    for row in rows:
+                        summary.add(row.get("groupName") or row.get("groupId") or "(untagged)", row.get("cost") or 0.0)
+                if len(rows) < settings.tag_page_size:
+                    break
+            else:
+                partial_reason = f"Stopped after {settings.tag_max_pages} pages; narrow the date range or provider."
+        except DeadlineExceeded:
+            if pages == 0:
+                raise
+            partial_reason = f"Deadline reached after {pages} pages; values cover the rows read so far."
+
+        with span("aggregate", stage="significant"):
+            result = summary.significant(safe_limit, min_share)
+        positive_total = result["positive_total"]
+
+        def share(cost: float) -> float:
+            return round(cost / positive_total * 100, 2) if positive_total else 0.0
+
+        values = []
+        for entry in result["values"]:
+            value = {"tag_value": entry["key"], "cost": round(entry["count"], 2), "share_pct": share(entry["count"])}
+            if entry["error"]:
+                value["error_bound"] = round(entry["error"], 2)
+            values.append(value)
+
+        other = result["other"]
+        breakdown_data: Dict[str, Any] = {
+            "tag_key": tag_key,
+            "period": f"{from_date} to {to_date}",
+            "total_cost": round(summary.total, 2),
+            "values": values,
+            "other": {
+                "cost": round(other["high"], 2) if summary.exact else {"min": round(other["low"], 2), "max": round(other["high"], 2)},
+                "share_pct": share(other["high"]),
+            },
+            "scan": {
+                "rows": summary.items_seen,
+                "pages": pages,
+                "exact": summary.exact,
+                # Any single value folded into "other" cost at most this much
+                "unlisted_value_max_cost": round(result["unlisted_max"], 2),
+            },
+        }
+        if summary.negative_total:
+            breakdown_data["credits"] = round(summary.negative_total, 2)
+
+        return format_cost_response(
+            breakdown_data,
+            f"Cost by Tag '{tag_key}'",
+            f"view=tags&tag={tag_key}&from={from_date}&to={to_date}&provider={clean_provider or 'all'}",
+            partial_reason=partial_reason
+        )
+
+    export_group_by = {
+        "costs": ["product_name", "service", "provider_code", "location_id", "billing_account_id", "resource_group_id", "resource_id"],
+        "k8s": ["cluster_id", "namespace", "node"],
+    }
+
+    @tool
+    async def mvk_cost_export(
+        ctx: Context,
+        from_date: str,
+        to_date: str,
+        dataset: Literal["costs", "k8s"] = "costs",
+        group_by: Optional[str] = None,
+        granularity: Literal["day", "week", "month"] = "day",
+        file_format: Optional[Literal["parquet", "csv"]] = None,
+        provider: Optional[str] = None
+    ) -> str:
+        """
+        Exports a FULL cost dataset (every row) to a local Parquet or CSV file and returns its path plus a summary.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** The user asks to "export", "download", "dump" or "give me ALL rows", or the
+          result would be thousands of rows (e.g. "all daily costs by resource for the quarter").
+        - **DO NOT USE WHEN:** The user wants an answer in the chat (totals, trends, top N) -> use the other tools.
+
+        [Argument Mapping Guide]
+        - `dataset="costs"` + `group_by`: product_name (default), service, provider_code, location_id,
+          billing_account_id, resource_group_id, resource_id.
+        - `dataset="k8s"` + `group_by`: cluster_id (default), namespace, node.
+        - `file_format`: "parquet" (default when available) for analytics tools, "csv" for spreadsheets.
+
+        [Constraints]
+        - Only the file path and a summary (row count, total, top groups) are returned, never the rows themselves.
+        - Runs under the normal tool deadline. If it is reached, the rows written so far are kept and
+          `complete` is false: export the remaining date range in a follow-up call.
+        """
+        client = MavvrikClient(ctx)
+        allowed = export_group_by[dataset]
+        group_by = group_by or allowed[0]
+        if group_by not in allowed:
+            return f"Validation Error: `group_by` for dataset '{dataset}' must be one of: {', '.join(allowed)}."
+
+        requested_format = file_format or settings.export_format
+        resolved_format = requested_format if requested_format == "csv" or parquet_available() else "csv"
+
+        clean_provider = None
+        if provider:
+            p_map = {"amazon": "aws", "google": "gcp", "microsoft": "azure"}
+            clean_provider = p_map.get(provider.lower(), provider.lower())
+
+        with span("validate"):
+            try:
+                query_filter = Filter()
+                if clean_provider:
+                    query_filter.provider_code = [clean_provider]
+                base_option = series_option(dataset, from_date, to_date, granularity, group_by, pageSize=settings.export_page_size)
+            except Exception as e:
+                return f"Validation Error: {str(e)}"
+
+        query, operation, field = (
+            (QUERY_COSTS, "CostsQuery", "costs") if dataset == "costs" else (QUERY_K8S_COSTS, "K8sCostsQuery", "k8sCosts")
+        )
+
+        async def fetch_page(page_no: int) -> List[Dict[str, Any]]:
+            variables = {
+                "option": base_option.model_copy(update={"pageNo": page_no}).model_dump(exclude_none=True),
+                "filter": query_filter.model_dump(exclude_none=True)
+            }
+            # Bulk pages would evict every interactive entry from the response cache
+            data = await client.execute(query, variables, operation, use_cache=False)
+            return data.get(field, [])
+
+        path = export_path(settings.export_dir, dataset, group_by, from_date, to_date, resolved_format)
+        with span("export", format=resolved_format) as s:
+            try:
+                export_data = await export_pages(fetch_page, path, resolved_format, settings.export_page_size, settings.export_max_pages)
+            except OSError as e:
+                return f"Execution Error: Could not write export file: {str(e)}"
+            s.set("rows", export_data["rows"])
+
+        if resolved_format != requested_format:
+            export_data["note"] = "pyarrow is not installed; wrote CSV instead of Parquet."
+        export_data["query"] = {"dataset": dataset, "group_by": group_by, "granularity": granularity,
+                                "period": f"{from_date} to {to_date}", "provider": clean_provider or "all"}
+
+        return format_cost_response(
+            export_data,
+            f"Cost Export ({dataset} by {group_by})",
+            f"view={'k8s' if dataset == 'k8s' else 'trend'}&interval={granularity}&split={group_by}",
+            partial_reason=None if export_data["complete"] else f"Export stopped early ({export_data['stopped_by']}); the file holds the rows read so far."
+        )
+
+    # Tools that may be fanned out by mvk_batch. They share the process-wide
+    # connection pool, response cache and in-flight coalescing in MavvrikClient.
+    batch_tools = {
+        "mvk_cost_overview": mvk_cost_overview,
+        "mvk_cost_trend": mvk_cost_trend,
+        "mvk_cost_rankings": mvk_cost_rankings,
+        "mvk_k8s_drilldown": mvk_k8s_drilldown,
+        "mvk_cost_compare": mvk_cost_compare,
+        "mvk_tag_costs": mvk_tag_costs,
+    }
+    # Each tool's FastMCP argument model: batch items get the same validation and
+    # coercion ("5" -> 5) as a direct call
+    batch_arg_metadata = {name: mcp._tool_manager.get_tool(name).fn_metadata for name in batch_tools}
+
+    def validate_batch_args(item: BatchQuery) -> Dict[str, Any]:
+        metadata = batch_arg_metadata[item.tool]
+        unknown = sorted(set(item.args) - set(metadata.arg_model.model_fields))
+        if unknown:
+            raise ValueError(f"Unknown argument(s) for {item.tool}: {', '.join(unknown)}")
+        try:
+            parsed = metadata.arg_model.model_validate(metadata.pre_parse_json(item.args))
+        except ValidationError as e:
+            raise ValueError("; ".join(
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+            ))
+        return parsed.model_dump_one_level()
+
+    @tool
+    async def mvk_batch(
+        ctx: Context,
+        queries: List[BatchQuery]
+    ) -> str:
+        """
+        Runs SEVERAL cost queries concurrently and returns one combined response.
+
+        [Use Case Strategy]
+        - **USE THIS TOOL WHEN:** Answering a dashboard-style question that needs more than one of
+          `mvk_cost_overview`, `mvk_cost_trend`, `mvk_cost_rankings`, `mvk_k8s_drilldown`, `mvk_cost_compare`
+          or `mvk_tag_costs`.
+          One batch replaces several sequential tool calls.
+        - **DO NOT USE WHEN:** A single tool call answers the question.
+
+        [Argument Mapping Guide]
+        - `queries`: List of {"tool": <tool name>, "args": {<that tool's arguments>}, "id": <optional label>}.
+        - Failures are reported per item and never abort the other queries.
+
+        [Example Triggers]
+        - "Give me last month's total, the daily trend and the top 5 services." ->
+          queries=[{"tool": "mvk_cost_overview", "args": {"from_date": "2024-06-01", "to_date": "2024-06-30"}},
+                   {"tool": "mvk_cost_trend", "args": {"from_date": "2024-06-01", "to_date": "2024-06-30"}},
+                   {"tool": "mvk_cost_rankings", "args": {"month": "2024-06"}}]
+        """
+        if not queries:
+            return "Validation Error: `queries` must contain at least one item."
+        if len(queries) > settings.batch_max_items:
+            return f"Validation Error: At most {settings.batch_max_items} queries are allowed per batch."
+
+        semaphore = asyncio.Semaphore(settings.batch_max_concurrency)
+
+        async def run_item(item: BatchQuery) -> str:
+            async with semaphore:
+                try:
+                    kwargs = validate_batch_args(item)
+                except ValueError as e:
+                    return f"Validation Error: {str(e)}"
+                try:
+                    return await batch_tools[item.tool](ctx=ctx, **kwargs)
+                except Exception as e:
+                    return f"Execution Error: {str(e)}"
+
+        # Sub-queries inherit the batch deadline; unfinished ones are cancelled
+        outputs, partial = await gather_partial(*(run_item(item) for item in queries))
+        partial = partial or any(o is not None and o.startswith("Deadline Exceeded") for o in outputs)
+
+        sections = [
+            (
+                f"[{index}] {item.id or item.tool}",
+                output if output is not None else "Deadline Exceeded: Not completed within the batch deadline."
+            )
+            for index, (item, output) in enumerate(zip(queries, outputs), start=1)
+        ]
+        return format_batch_response(
+            sections,
+            settings.batch_max_output_chars,
+            partial_reason="Some queries did not finish before the deadline." if partial else None
+        )
@@ -0,0 +1,103 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from mcp.server.fastmcp import FastMCP
+
+# Internal Imports
+from src.client import MavvrikClient
+from src.config import settings
+from src.schemas import Filter
+from src.subscriptions import enable_subscriptions, subscription_hub
+from src.tools.finops import QUERY_COSTS, QUERY_K8S_COSTS, series_option
+from src import snapshot
+
+URI_OVERVIEW_MTD = "mavvrik://costs/overview/mtd"
+URI_TREND_DAILY = "mavvrik://costs/trend/daily"
+URI_K8S_CLUSTERS_MTD = "mavvrik://k8s/clusters/mtd"
+
+def _variables(dataset: str, from_date: date, to_date: date, interval: str, group_by: str) -> Dict[str, Any]:
+    # Same option builder as the dataset's tools, so a view never disagrees with them
+    option = series_option(dataset, from_date.isoformat(), to_date.isoformat(), interval, group_by)
+    return {
+        "option": option.model_dump(exclude_none=True),
+        "filter": Filter().model_dump(exclude_none=True)
+    }
+
+def _totals(rows: Any, key: str) -> Dict[str, float]:
+    totals: Dict[str, float] = defaultdict(float)
+    for row in rows:
+        totals[row.get(key) or "unknown"] += row.get("cost") or 0.0
+    # Rounded to cents so float noise between polls never counts as a change
+    return {k: round(v, 2) for k, v in sorted(totals.items())}
+
+# --- Views ---
+# Polls bypass the response cache: its TTL would hide changes between polls.
+
+async def _overview_mtd() -> Tuple[Dict[str, Any], Optional[str]]:
+    today = date.today()
+    start = today.replace(day=1)
+    data, as_of = await snapshot.execute(
+        MavvrikClient(None), QUERY_COSTS, _variables("costs", start, today, "month", "provider_code"), "CostsQuery", use_cache=False
+    )
+    by_provider = _totals(data.get("costs", []), "groupName")
+    return {
+        "period": f"{start.isoformat()} to {today.isoformat()}",
+        "currency": "USD",
+        "total_cost": round(sum(by_provider.values()), 2),
+        "by_provider": by_provider,
+    }, as_of
+
+async def _trend_daily() -> Tuple[Dict[str, Any], Optional[str]]:
+    today = date.today()
+    start = today - timedelta(days=settings.resource_trend_days - 1)
+    data, as_of = await snapshot.execute(
+        MavvrikClient(None), QUERY_COSTS, _variables("costs", start, today, "day", "provider_code"), "CostsQuery", use_cache=False
+    )
+    daily = _totals(data.get("costs", []), "date")
+    return {
+        "period": f"{start.isoformat()} to {today.isoformat()}",
+        "currency": "USD",
+        "interval": "day",
+        "daily_totals": [{"date": day, "cost": cost} for day, cost in daily.items()],
+    }, as_of
+
+async def _k8s_clusters_mtd() -> Tuple[Dict[str, Any], Optional[str]]:
+    today = date.today()
+    start = today.replace(day=1)
+    data, as_of = await snapshot.execute(
+        MavvrikClient(None), QUERY_K8S_COSTS, _variables("k8s", start, today, "month", "cluster_id"), "K8sCostsQuery", use_cache=False
+    )
+    by_cluster = _totals(data.get("k8sCosts", []), "groupName")
+    return {
+        "period": f"{start.isoformat()} to {today.isoformat()}",
+        "currency": "USD",
+        "total_cost": round(sum(by_cluster.values()), 2),
+        "by_cluster": by_cluster,
+    }, as_of
+
+def register_resources(mcp: FastMCP):
+    """
+    Registers subscribable cost resources. Clients that subscribe get
+    `notifications/resources/updated` when the figures change, and re-read
+    the resource instead of polling the tools.
+    """
+    subscription_hub.register(URI_OVERVIEW_MTD, "overview_mtd", _overview_mtd)
+    subscription_hub.register(URI_TREND_DAILY, "trend_daily", _trend_daily)
+    subscription_hub.register(URI_K8S_CLUSTERS_MTD, "k8s_clusters_mtd", _k8s_clusters_mtd)
+    enable_subscriptions(mcp)
+
+    @mcp.resource(URI_OVERVIEW_MTD, name="cost_overview_mtd", mime_type="application/json")
+    async def cost_overview_mtd() -> str:
+        """Month-to-date total cost with a per-provider breakdown."""
+        return await subscription_hub.read(URI_OVERVIEW_MTD)
+
+    @mcp.resource(URI_TREND_DAILY, name="cost_trend_daily", mime_type="application/json")
+    async def cost_trend_daily() -> str:
+        """Daily total cost over the last RESOURCE_TREND_DAYS days."""
+        return await subscription_hub.read(URI_TREND_DAILY)
+
+    @mcp.resource(URI_K8S_CLUSTERS_MTD, name="k8s_cluster_costs_mtd", mime_type="application/json")
+    async def k8s_cluster_costs_mtd() -> str:
+        """Month-to-date Kubernetes cost per cluster."""
+        return await subscription_hub.read(URI_K8S_CLUSTERS_MTD)
@@ -0,0 +1,281 @@
+import asyncio
+import atexit
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Union
+
+import httpx
+
+from src.config import settings
+from src.logs import get_logger
+from src.metrics import metrics
+
+logger = get_logger(__name__)
+
+# --- Span Model ---
+
+class _Trace:
+    """Spans of one trace, shared by the root and all its descendants."""
+
+    __slots__ = ("spans", "exported")
+
+    def __init__(self) -> None:
+        self.spans: List["Span"] = []
+        self.exported = False
+
+class Span:
+    """
+    A timed unit of work. Spans of one trace are exported together when the
+    root ends; a span that ends later (a coalesced or cancelled task that
+    outlived the tool) is exported on its own as a follow-up record.
+    """
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns",
+                 "_start_perf", "duration_ms", "attributes", "status", "error", "_trace")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else f"{random.getrandbits(128):032x}"
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent.span_id if parent else None
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self._start_perf = time.perf_counter()
+        self.duration_ms = 0.0
+        self.attributes = attributes
+        self.status = "ok"
+        self.error: Optional[str] = None
+        # All spans of a trace share the root's _Trace
+        self._trace: _Trace = parent._trace if parent else _Trace()
+
+    def set(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start_ns,
+            "end_time_unix_nano": self.end_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "error": self.error,
+            "attributes": self.attributes,
+        }
+
+class _NoopSpan:
+    """Returned for unsampled traces so call sites never need to branch."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+NOOP_SPAN = _NoopSpan()
+
+# Current span, or NOOP_SPAN inside an unsampled trace
+_current_span: ContextVar[Union[Span, _NoopSpan, None]] = ContextVar("mvk_span", default=None)
+
+# --- Exporters ---
+
+class JsonlExporter:
+    """
+    Appends one JSON object per span to a local file. Spans are serialized
+    in the caller and appended by a background writer thread, so the event
+    loop never blocks on the disk.
+    """
+
+    name = "jsonl"
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._queue: Optional["queue.SimpleQueue[Optional[str]]"] = None
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self.stop)
+
+    def export(self, spans: List[Span]) -> None:
+        lines = "".join(json.dumps(s.to_dict(), default=str) + "\n" for s in spans)
+        with self._lock:
+            if self._thread is None:
+                # One queue per writer thread, so a stop() sentinel only ever reaches its own thread
+                self._queue = queue.SimpleQueue()
+                self._thread = threading.Thread(target=self._run, args=(self._queue,), name="mvk-trace-writer", daemon=True)
+                self._thread.start()
+            self._queue.put(lines)
+
+    def stop(self) -> None:
+        """Writes every span queued so far and stops the writer thread."""
+        with self._lock:
+            thread, pending = self._thread, self._queue
+            self._thread = self._queue = None
+            if pending is not None:
+                pending.put(None)
+        if thread is not None:
+            thread.join()
+
+    def _run(self, pending: "queue.SimpleQueue[Optional[str]]") -> None:
+        stopping = False
+        while not stopping:
+            batch = [pending.get()]
+            # Whatever queued up meanwhile goes out in the same append
+            while batch[-1] is not None and not pending.empty():
+                batch.append(pending.get())
+            if batch[-1] is None:
+                stopping = True
+                batch.pop()
+            if not batch:
+                continue
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("".join(batch))
+            except OSError as e:
+                logger.warning("trace.export_failed", exporter=self.name, error=str(e))
+
+class OtlpHttpExporter:
+    """
+    Posts spans to an OTLP/HTTP collector (JSON encoding, e.g. http://localhost:4318/v1/traces).
+    Export runs as a background task so it never delays the tool response.
+    """
+
+    name = "otlp"
+
+    def __init__(self, endpoint: str):
+        self.endpoint = endpoint
+        self._client: Optional[httpx.AsyncClient] = None
+        self._pending: set = set()
+
+    @staticmethod
+    def _attribute(key: str, value: Any) -> Dict[str, Any]:
+        if isinstance(value, bool):
+            return {"key": key, "value": {"boolValue": value}}
+        if isinstance(value, int):
+            return {"key": key, "value": {"intValue": str(value)}}
+        if isinstance(value, float):
+            return {"key": key, "value": {"doubleValue": value}}
+        return {"key": key, "value": {"stringValue": str(value)}}
+
+    def _payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [self._attribute("service.name", "mavvrik-mcp")]},
+                "scopeSpans": [{
+                    "scope": {"name": "src.tracing"},
+                    "spans": [
+                        {
+                            "traceId": s.trace_id,
+                            "spanId": s.span_id,
+                            "parentSpanId": s.parent_id or "",
+                            "name": s.name,
+                            "kind": 1,
+                            "startTimeUnixNano": str(s.start_ns),
+                            "endTimeUnixNano": str(s.end_ns),
+                            "attributes": [self._attribute(k, v) for k, v in s.attributes.items()],
+                            "status": {"code": 2, "message": s.error or ""} if s.status == "error" else {"code": 1},
+                        }
+                        for s in spans
+                    ],
+                }],
+            }]
+        }
+
+    async def _post(self, payload: Dict[str, Any]) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(timeout=5.0)
+        try:
+            await self._client.post(self.endpoint, json=payload)
+        except httpx.HTTPError as e:
+            logger.warning("trace.export_failed", exporter=self.name, error=str(e))
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._post(self._payload(spans)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+def _build_exporters() -> List[Any]:
+    exporters: List[Any] = []
+    if settings.trace_file:
+        exporters.append(JsonlExporter(os.path.abspath(settings.trace_file)))
+    if settings.trace_otlp_endpoint:
+        exporters.append(OtlpHttpExporter(settings.trace_otlp_endpoint))
+    return exporters
+
+_exporters = _build_exporters()
+
+def _export(spans: List[Span]) -> None:
+    for exporter in _exporters:
+        try:
+            exporter.export(spans)
+        except Exception as e:
+            # Tracing must never break a tool call
+            logger.warning("trace.export_failed", exporter=exporter.name, error=str(e))
+
+# --- Public API ---
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Union[Span, _NoopSpan]]:
+    """
+    Opens a span as a child of the current one. The sampling decision is
+    made once at the root (settings.trace_sample_rate); when a trace is not
+    sampled every nested call yields NOOP_SPAN and costs one ContextVar lookup.
+    """
+    parent = _current_span.get()
+    if parent is NOOP_SPAN:
+        yield NOOP_SPAN
+        return
+
+    if parent is None and (not _exporters or random.random() >= settings.trace_sample_rate):
+        token = _current_span.set(NOOP_SPAN)
+        try:
+            yield NOOP_SPAN
+        finally:
+            _current_span.reset(token)
+        return
+
+    current = Span(name, parent, attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.status = "error"
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        current.duration_ms = (time.perf_counter() - current._start_perf) * 1000
+        current.end_ns = current.start_ns + int(current.duration_ms * 1_000_000)
+        trace = current._trace
+        if trace.exported:
+            # The root is already out: flush this span alone rather than dropping it
+            metrics.incr("trace.late_spans")
+            _export([current])
+        elif parent is None:
+            trace.spans.append(current)
+            trace.exported = True
+            _export(trace.spans)
+        else:
+            trace.spans.append(current)
+
+def traced_tool(fn: Callable[..., Awaitable[str]]) -> Callable[..., Awaitable[str]]:
+    """Decorator for MCP tools: wraps each invocation in a root span."""
+    @functools.wraps(fn)
+    async def wrapper(*args: Any, **kwargs: Any) -> str:
+        with span(f"tool.{fn.__name__}", tool=fn.__name__) as s:
+            result = await fn(*args, **kwargs)
+            s.set("output_chars", len(result))
+            return result
+
+    return wrapper
@@ -0,0 +1,54 @@
+import asyncio
+import inspect
+import json
+
+import httpx
+import pytest
+
+from src import client as client_module
+from src.cache import response_cache
+from src.config import settings
+
+class FakeBackend:
+    """Routes the shared HTTP client to a handler and records every request body."""
+
+    def __init__(self, monkeypatch):
+        self._monkeypatch = monkeypatch
+        self.bodies = []
+        self.requests = []
+
+    def install(self, handler):
+        async def record(req: httpx.Request) -> httpx.Response:
+            self.requests.append(req)
+            self.bodies.append(json.loads(req.content))
+            response = handler(self.bodies[-1])
+            return await response if inspect.isawaitable(response) else response
+
+        http = httpx.AsyncClient(transport=httpx.MockTransport(record))
+        self._monkeypatch.setattr(client_module, "get_http_client", lambda: http)
+        return self.bodies
+
+    async def respond_after(self, seconds, response):
+        """Answers after `seconds`, honouring the client's read timeout like a real socket would."""
+        timeout = self.requests[-1].extensions.get("timeout", {}).get("read")
+        if timeout is not None and timeout < seconds:
+            await asyncio.sleep(timeout)
+            raise httpx.ReadTimeout("timed out", request=self.requests[-1])
+        await asyncio.sleep(seconds)
+        return response
+
+    @staticmethod
+    def reply(status, payload=None, text=""):
+        # A byte stream, not `content=`: the client reads the body with aiter_raw()
+        raw = json.dumps(payload).encode() if payload is not None else text.encode()
+        return httpx.Response(status, stream=httpx.ByteStream(raw), headers={"content-type": "application/json"})
+
+@pytest.fixture
+def backend(monkeypatch, request):
+    monkeypatch.setenv("MAVVRIK_API_KEY", "test-key")
+    monkeypatch.setenv("MAVVRIK_TENANT_ID", "test-tenant")
+    monkeypatch.setattr(settings, "persisted_queries", True)
+    # A fresh endpoint per test keeps APQ state and cache keys apart
+    monkeypatch.setattr(settings, "api_url", f"http://backend.test/{request.node.name}")
+    yield FakeBackend(monkeypatch)
+    response_cache.clear()
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.config import settings
+from src.tools.finops import register_finops
+
+COSTS = {"costs": [{"cost": 10.0, "date": "2026-09-01", "groupId": "aws", "groupName": "aws"}]}
+RANKINGS = {"costTopEntries": {"topEntries": [{"cost": 7.0, "groupId": "ec2", "groupName": "EC2"}]}}
+
+@pytest.fixture
+def mcp(backend, monkeypatch):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+    monkeypatch.setattr(settings, "snapshot_mode", "off")
+    server = FastMCP("test")
+    register_finops(server)
+    return server
+
+def _answer(backend, body, rankings_error=False, rankings_delay=0.0):
+    if "costTopEntries" in body["query"]:
+        if rankings_error:
+            return backend.reply(200, {"errors": [{"message": "rankings unavailable"}]})
+        return backend.respond_after(rankings_delay, backend.reply(200, {"data": RANKINGS}))
+    return backend.reply(200, {"data": COSTS})
+
+def _call(server, name, arguments):
+    result = asyncio.run(server.call_tool(name, arguments))
+    content = result[0] if isinstance(result, tuple) else result
+    return "".join(c.text for c in content)
+
+OVERVIEW = {"tool": "mvk_cost_overview", "args": {"from_date": "2026-09-01", "to_date": "2026-09-30"}}
+
+def test_batch_runs_every_item(mcp, backend):
+    backend.install(lambda body: _answer(backend, body))
+
+    output = _call(mcp, "mvk_batch", {"queries": [
+        {**OVERVIEW, "id": "total"},
+        {"tool": "mvk_cost_rankings", "args": {"month": "2026-09"}},
+    ]})
+
+    assert output.startswith("## Batch Results (2 queries)")
+    assert "#### [1] total" in output and '"total_cost": 10.0' in output
+    assert "#### [2] mvk_cost_rankings" in output and "EC2" in output
+    assert "PARTIAL RESULT" not in output
+
+def test_failing_item_does_not_affect_the_others(mcp, backend):
+    backend.install(lambda body: _answer(backend, body, rankings_error=True))
+
+    output = _call(mcp, "mvk_batch", {"queries": [OVERVIEW, {"tool": "mvk_cost_rankings", "args": {"month": "2026-09"}}]})
+
+    assert '"total_cost": 10.0' in output
+    assert "Execution Error: Mavvrik API Error: rankings unavailable" in output
+
+def test_item_arguments_are_validated_and_coerced(mcp, backend):
+    backend.install(lambda body: _answer(backend, body))
+
+    output = _call(mcp, "mvk_batch", {"queries": [
+        {"tool": "mvk_cost_rankings", "args": {"month": "2026-09", "limit": "2"}},
+        {"tool": "mvk_cost_rankings", "args": {"month": "2026-09", "limit": "x"}},
+        {"tool": "mvk_cost_overview", "args": {"from_date": "2026-09-01"}},
+        {"tool": "mvk_cost_overview", "args": {**OVERVIEW["args"], "bogus": 1}},
+    ]})
+    sections = output.split("#### ")[1:]
+
+    assert "### Top 2 by product_name" in sections[0]
+    assert "Validation Error: limit: Input should be a valid integer" in sections[1]
+    assert "Validation Error: to_date: Field required" in sections[2]
+    assert "Validation Error: Unknown argument(s) for mvk_cost_overview: bogus" in sections[3]
+    # Rejected items never reach the backend
+    assert len(backend.bodies) == 1
+
+def test_item_count_is_limited(mcp, backend, monkeypatch):
+    monkeypatch.setattr(settings, "batch_max_items", 2)
+    backend.install(lambda body: _answer(backend, body))
+
+    output = _call(mcp, "mvk_batch", {"queries": [OVERVIEW] * 3})
+
+    assert output == "Validation Error: At most 2 queries are allowed per batch."
+    assert backend.bodies == []
+
+def test_deadline_mid_batch_marks_the_result_partial(mcp, backend, monkeypatch):
+    monkeypatch.setattr(settings, "tool_deadlines", {"mvk_batch": 0.3})
+    backend.install(lambda body: _answer(backend, body, rankings_delay=5.0))
+
+    output = _call(mcp, "mvk_batch", {"queries": [OVERVIEW, {"tool": "mvk_cost_rankings", "args": {"month": "2026-09"}}]})
+    sections = output.split("#### ")[1:]
+
+    assert "**Status:** ⚠️ PARTIAL RESULT" in output
+    assert '"total_cost": 10.0' in sections[0]
+    assert "Deadline Exceeded" in sections[1]
@@ -0,0 +1,44 @@
+import os
+import stat
+import time
+
+from src.cache import ResponseCache
+
+def _cache(tmp_path, **kwargs):
+    return ResponseCache(ttl_seconds=60, max_entries=100, max_bytes=10 * 1024 * 1024, cache_dir=str(tmp_path), **kwargs)
+
+def test_disk_entries_are_owner_only(tmp_path):
+    cache = _cache(tmp_path)
+
+    cache.set("k1", {"costs": [{"cost": 1.5}]})
+
+    mode = stat.S_IMODE(os.stat(tmp_path / "k1.bin").st_mode)
+    assert mode == 0o600
+
+def test_sweep_removes_expired_files(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set("fresh", {"costs": [{"cost": 1.5}]})
+    cache._write_file("stale", time.time() - 1, "zlib", b"x")
+
+    result = cache.sweep_disk()
+
+    assert result["removed"]["expired"] == 1
+    assert sorted(os.listdir(tmp_path)) == ["fresh.bin"]
+
+def test_sweep_enforces_size_limit_oldest_first(tmp_path):
+    cache = _cache(tmp_path, dir_max_bytes=2500)
+    for i in range(5):
+        cache._write_file(f"k{i}", time.time() + 60 + i, "zlib", b"x" * 1000)
+
+    result = cache.sweep_disk()
+
+    assert result["removed"]["size_limit"] == 3
+    assert sorted(os.listdir(tmp_path)) == ["k3.bin", "k4.bin"]
+
+def test_writes_trigger_periodic_sweep(tmp_path):
+    cache = _cache(tmp_path, sweep_interval=0.0)
+    cache._write_file("stale", time.time() - 1, "zlib", b"x")
+
+    cache.set("k1", {"costs": [{"cost": 1.5}]})
+
+    assert not (tmp_path / "stale.bin").exists()
@@ -0,0 +1,89 @@
+import asyncio
+
+import pytest
+
+from src.cache import response_cache
+from src.client import MavvrikClient
+from src.config import settings
+from src.deadline import DeadlineExceeded, deadline_scope
+
+QUERY = "query CostsQuery { costs { cost } }"
+DATA = {"costs": [{"cost": 1.0}]}
+
+@pytest.fixture
+def slow_backend(backend, monkeypatch):
+    # Full text only, and slow enough that concurrent callers share one request
+    monkeypatch.setattr(settings, "persisted_queries", False)
+
+    async def handler(body):
+        await asyncio.sleep(0.05)
+        return backend.reply(200, {"data": DATA})
+
+    return backend.install(handler)
+
+async def _concurrent(*flags):
+    client = MavvrikClient(None)
+    results = await asyncio.gather(*(client.execute(QUERY, {}, "CostsQuery", use_cache=flag) for flag in flags))
+    return client, results
+
+@pytest.mark.parametrize("flags", [(False, True), (True, False)])
+def test_coalesced_request_is_cached_when_any_caller_wants_it(slow_backend, flags):
+    client, results = asyncio.run(_concurrent(*flags))
+
+    assert results == [DATA, DATA]
+    assert len(slow_backend) == 1
+    assert response_cache.get(client._cache_key(QUERY, {})) == DATA
+
+def test_uncached_callers_never_populate_the_cache(slow_backend):
+    client, results = asyncio.run(_concurrent(False, False))
+
+    assert results == [DATA, DATA]
+    assert len(slow_backend) == 1
+    assert response_cache.get(client._cache_key(QUERY, {})) is None
+
+def test_coalesced_waiters_keep_their_own_deadlines(backend, monkeypatch):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+
+    def handler(body):
+        return backend.respond_after(0.3, backend.reply(200, {"data": DATA}))
+
+    bodies = backend.install(handler)
+
+    async def call(seconds, delay):
+        await asyncio.sleep(delay)
+        with deadline_scope(seconds):
+            return await MavvrikClient(None).execute(QUERY, {}, "CostsQuery", use_cache=False)
+
+    async def main():
+        return await asyncio.gather(call(0.1, 0.0), call(2.0, 0.02), return_exceptions=True)
+
+    short, long = asyncio.run(main())
+
+    # The short deadline fails only its own caller; the shared request runs on for the other
+    assert isinstance(short, DeadlineExceeded)
+    assert long == DATA
+    assert len(bodies) == 1
+
+def test_shared_request_is_cancelled_when_last_waiter_leaves(backend, monkeypatch):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+    cancelled = []
+
+    async def handler(body):
+        try:
+            await asyncio.sleep(1.0)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return backend.reply(200, {"data": DATA})
+
+    backend.install(handler)
+
+    async def main():
+        with deadline_scope(0.05):
+            with pytest.raises(DeadlineExceeded):
+                await MavvrikClient(None).execute(QUERY, {}, "CostsQuery", use_cache=False)
+        await asyncio.sleep(0.05)
+
+    asyncio.run(main())
+
+    assert cancelled == [True]
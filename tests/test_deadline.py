@@ -0,0 +1,90 @@
+import asyncio
+import time
+
+import pytest
+
+from src.config import settings
+from src.deadline import DeadlineExceeded, deadline_scope, enforce_deadline, gather_partial, remaining
+
+def test_no_deadline_outside_a_scope():
+    assert remaining() is None
+
+def test_nested_scope_can_only_tighten():
+    with deadline_scope(1.0):
+        outer = remaining()
+        with deadline_scope(10.0):
+            # A longer inner budget keeps the outer deadline
+            assert remaining() <= outer
+        with deadline_scope(0.1):
+            assert remaining() <= 0.1
+        assert remaining() > 0.5
+    assert remaining() is None
+
+def test_enforce_deadline_turns_expiry_into_a_tool_result(monkeypatch):
+    monkeypatch.setattr(settings, "tool_deadlines", {"slow_tool": 0.05})
+
+    @enforce_deadline
+    async def slow_tool() -> str:
+        await asyncio.sleep(0.01)
+        raise DeadlineExceeded("backend too slow")
+
+    assert asyncio.run(slow_tool()) == "Deadline Exceeded: No results were available within 0.05s."
+
+def test_enforce_deadline_applies_the_tool_budget(monkeypatch):
+    monkeypatch.setattr(settings, "tool_deadlines", {"budgeted_tool": 3.0})
+
+    @enforce_deadline
+    async def budgeted_tool() -> str:
+        return f"{remaining():.0f}"
+
+    assert asyncio.run(budgeted_tool()) == "3"
+
+def test_gather_partial_returns_everything_when_in_time():
+    async def value(v):
+        await asyncio.sleep(0.01)
+        return v
+
+    async def main():
+        with deadline_scope(1.0):
+            return await gather_partial(value(1), value(2))
+
+    assert asyncio.run(main()) == ([1, 2], False)
+
+def test_gather_partial_marks_missing_items_and_cancels_pending():
+    cancelled = []
+
+    async def fast():
+        return "fast"
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def expired():
+        raise DeadlineExceeded("backend")
+
+    async def main():
+        started = time.monotonic()
+        with deadline_scope(0.05):
+            result = await gather_partial(fast(), slow(), expired())
+        return result, time.monotonic() - started
+
+    (results, partial), elapsed = asyncio.run(main())
+
+    assert results == ["fast", None, None]
+    assert partial is True
+    assert cancelled == [True]
+    assert elapsed < 1.0
+
+def test_gather_partial_propagates_other_errors():
+    async def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        asyncio.run(gather_partial(broken()))
+
+def test_gather_partial_with_nothing_to_do():
+    assert asyncio.run(gather_partial()) == ([], False)
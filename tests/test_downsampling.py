@@ -0,0 +1,59 @@
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.exceptions import ToolError
+
+from src.downsampling import choose_interval, downsample_rows, lttb_indices
+from src.tools.finops import register_finops
+
+@pytest.mark.parametrize("from_date, to_date, max_points, expected", [
+    ("2026-09-01", "2026-09-30", 30, "day"),
+    ("2026-09-01", "2026-10-01", 30, "week"),
+    ("2026-01-01", "2026-12-31", 53, "week"),
+    ("2026-01-01", "2026-12-31", 52, "month"),
+    ("2026-09-30", "2026-09-01", 10, "day"),
+    ("not-a-date", "2026-09-01", 10, "day"),
+])
+def test_choose_interval_picks_finest_that_fits(from_date, to_date, max_points, expected):
+    assert choose_interval(from_date, to_date, max_points) == expected
+
+def test_lttb_keeps_endpoints_and_peaks():
+    ys = [1.0] * 100
+    ys[37], ys[71] = 50.0, -20.0
+    xs = [float(i) for i in range(100)]
+
+    kept = lttb_indices(xs, ys, 10)
+
+    assert len(kept) == 10
+    assert kept[0] == 0 and kept[-1] == 99
+    assert kept == sorted(kept)
+    assert {37, 71} <= set(kept)
+
+def test_lttb_returns_everything_under_threshold():
+    assert lttb_indices([0.0, 1.0, 2.0], [1.0, 2.0, 3.0], 5) == [0, 1, 2]
+
+def test_downsample_rows_budgets_each_series():
+    start = date(2026, 1, 1)
+    rows = [
+        {"date": (start + timedelta(days=d)).isoformat(), "groupId": group, "cost": float(d % 7)}
+        for d in range(60) for group in ("aws", "gcp")
+    ]
+    rows += [{"date": start.isoformat(), "groupId": "azure", "cost": 1.0}]
+
+    sampled = downsample_rows(rows, 12, series_key="groupId")
+
+    counts = {group: sum(r["groupId"] == group for r in sampled) for group in ("aws", "gcp", "azure")}
+    assert counts == {"aws": 12, "gcp": 12, "azure": 1}
+    # Original order is preserved
+    assert sampled == [r for r in rows if r in sampled]
+
+def test_cost_trend_rejects_too_small_max_points(backend):
+    server = FastMCP("test")
+    register_finops(server)
+
+    with pytest.raises(ToolError, match="max_points"):
+        asyncio.run(server.call_tool("mvk_cost_trend", {"from_date": "2026-09-01", "to_date": "2026-09-30", "max_points": 2}))
+
+    assert backend.requests == []
@@ -0,0 +1,91 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from src.export import export_pages, export_path
+
+def _rows(page_no, count):
+    return [
+        {"date": f"2026-09-{i % 28 + 1:02d}", "groupId": f"g{page_no}", "groupName": f"g{page_no}", "cost": 1.0}
+        for i in range(count)
+    ]
+
+def _pages(*sizes, fail_at=None):
+    requested = []
+
+    async def fetch_page(page_no):
+        requested.append(page_no)
+        if page_no == fail_at:
+            raise RuntimeError("backend down")
+        return _rows(page_no, sizes[page_no - 1])
+
+    return fetch_page, requested
+
+def _export(fetch_page, path, max_pages=10):
+    return asyncio.run(export_pages(fetch_page, str(path), "csv", page_size=3, max_pages=max_pages))
+
+def test_export_path_is_unique_per_call(tmp_path):
+    first = export_path(str(tmp_path), "costs", "provider_code", "2026-09-01", "2026-09-30", "csv")
+    second = export_path(str(tmp_path), "costs", "provider_code", "2026-09-01", "2026-09-30", "csv")
+    assert first != second
+
+def test_pages_until_a_short_page(tmp_path):
+    fetch_page, requested = _pages(3, 3, 1)
+    path = tmp_path / "out.csv"
+
+    result = _export(fetch_page, path)
+
+    assert requested == [1, 2, 3]
+    assert result["complete"] and "stopped_by" not in result
+    assert result["rows"] == 7 and result["pages"] == 3 and result["total_cost"] == 7.0
+    assert len(pd.read_csv(path)) == 7
+    assert not (tmp_path / "out.csv.partial").exists()
+
+def test_page_limit_marks_truncated(tmp_path):
+    fetch_page, requested = _pages(3, 3, 3)
+
+    result = _export(fetch_page, tmp_path / "out.csv", max_pages=2)
+
+    assert requested == [1, 2]
+    assert result["rows"] == 6
+    assert not result["complete"]
+    assert result["stopped_by"] == "page limit (2 pages of 3 rows)"
+
+def test_backend_error_keeps_rows_written_so_far(tmp_path):
+    fetch_page, _ = _pages(3, 3, fail_at=2)
+    path = tmp_path / "out.csv"
+
+    result = _export(fetch_page, path)
+
+    assert result["rows"] == 3 and not result["complete"]
+    assert result["stopped_by"] == "RuntimeError: backend down"
+    assert len(pd.read_csv(path)) == 3
+
+def test_error_before_any_row_removes_partial_file(tmp_path):
+    fetch_page, _ = _pages(fail_at=1)
+
+    with pytest.raises(RuntimeError):
+        _export(fetch_page, tmp_path / "out.csv")
+
+    assert list(tmp_path.iterdir()) == []
+
+def test_cancelled_export_removes_partial_file(tmp_path):
+    async def run():
+        started = asyncio.Event()
+
+        async def fetch_page(page_no):
+            if page_no == 2:
+                started.set()
+                await asyncio.sleep(60)
+            return _rows(page_no, 3)
+
+        task = asyncio.ensure_future(export_pages(fetch_page, str(tmp_path / "out.csv"), "csv", page_size=3, max_pages=10))
+        await started.wait()
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,31 @@
+import json
+
+from src.formatting import format_batch_response, format_cost_response, truncate_to_budget
+
+def _cost_output(rows: int) -> str:
+    data = [{"groupName": f"service-{i}", "cost": i * 1.5} for i in range(rows)]
+    return format_cost_response(data, "Cost Rankings", "view=rankings")
+
+def test_truncation_closes_json_fence_and_fits_budget():
+    text = _cost_output(200)
+
+    truncated = truncate_to_budget(text, 500)
+
+    assert len(truncated) <= 500
+    assert truncated.count("```") % 2 == 0
+    assert "Truncated" in truncated
+
+def test_batch_budget_covers_headings_and_status():
+    sections = [(f"[{i}] mvk_cost_rankings", _cost_output(200)) for i in range(1, 4)]
+
+    output = format_batch_response(sections, 3000, partial_reason="Some queries did not finish before the deadline.")
+
+    assert len(output) <= 3000
+    assert output.count("```") % 2 == 0
+
+def test_short_sections_are_untouched():
+    body = _cost_output(2)
+    output = format_batch_response([("[1] a", body)], 10000)
+
+    assert body in output
+    assert json.loads(body.split("```json")[1].split("```")[0])
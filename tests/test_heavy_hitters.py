@@ -0,0 +1,43 @@
+import random
+
+from src.heavy_hitters import SpaceSaving
+
+def test_unlisted_max_covers_tracked_keys_cut_by_limit():
+    summary = SpaceSaving(capacity=100)
+    costs = {f"v{i}": float(1000 - i * 10) for i in range(50)}
+    for key, cost in costs.items():
+        summary.add(key, cost)
+
+    result = summary.significant(limit=3, min_share=0.0)
+
+    assert [v["key"] for v in result["values"]] == ["v0", "v1", "v2"]
+    # v3 is tracked but not listed; the bound must cover it, not just untracked keys
+    assert result["unlisted_max"] == costs["v3"]
+
+def test_unlisted_max_bounds_every_unlisted_key_when_approximate():
+    rng = random.Random(7)
+    summary = SpaceSaving(capacity=50)
+    true_costs = {}
+    for _ in range(20000):
+        key = f"sha{int(rng.paretovariate(1.2)) % 5000}"
+        cost = rng.uniform(1, 10)
+        true_costs[key] = true_costs.get(key, 0.0) + cost
+        summary.add(key, cost)
+    assert not summary.exact
+
+    result = summary.significant(limit=3, min_share=0.0)
+    listed = {v["key"] for v in result["values"]}
+
+    assert len(summary) > len(listed)
+    assert max(c for k, c in true_costs.items() if k not in listed) <= result["unlisted_max"] + 1e-9
+    assert result["other"]["low"] <= result["other"]["high"]
+
+def test_unlisted_max_includes_keys_below_min_share():
+    summary = SpaceSaving(capacity=10)
+    summary.add("big", 90.0)
+    summary.add("small", 10.0)
+
+    result = summary.significant(limit=10, min_share=0.5)
+
+    assert [v["key"] for v in result["values"]] == ["big"]
+    assert result["unlisted_max"] == 10.0
@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from mcp.server.fastmcp import Context
+from structlog.contextvars import get_contextvars
+
+from src.instrumentation import correlated
+
+class _Ctx(Context):
+    """Context of an MCP request with a known ID."""
+
+    @property
+    def request_id(self) -> str:
+        return "req-7"
+
+async def tool_fn(ctx: Context, month: str) -> str:
+    return get_contextvars()["mcp_request_id"]
+
+@pytest.mark.parametrize("call", [
+    lambda fn, ctx: fn(ctx=ctx, month="2026-09"),
+    lambda fn, ctx: fn(ctx, month="2026-09"),
+])
+def test_request_id_is_bound_however_ctx_is_passed(call):
+    assert asyncio.run(call(correlated(tool_fn), _Ctx())) == "req-7"
+
+def test_missing_ctx_binds_no_request_id():
+    assert asyncio.run(correlated(tool_fn)(None, month="2026-09")) is None
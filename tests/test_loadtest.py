@@ -0,0 +1,35 @@
+import builtins
+import importlib
+import sys
+
+from mcp.types import CallToolResult, TextContent
+
+import src
+import src.runtime
+from src.loadtest import _classify
+
+def _result(text: str, is_error: bool = False) -> CallToolResult:
+    return CallToolResult(content=[TextContent(type="text", text=text)], isError=is_error)
+
+def test_classify_counts_every_tool_error_prefix():
+    assert _classify(_result("Execution Error: Mavvrik API Error: boom")) == "error"
+    assert _classify(_result("Validation Error: limit: Input should be a valid integer")) == "error"
+    assert _classify(_result("Deadline Exceeded: No results were available within 20s.")) == "deadline"
+    assert _classify(_result("Error executing tool mvk_cost_trend: boom", is_error=True)) == "tool_error"
+    assert _classify(_result("### Cost Overview\n...")) is None
+
+def test_runtime_imports_without_resource_module(monkeypatch):
+    real_import = builtins.__import__
+
+    def no_resource(name, *args, **kwargs):
+        if name == "resource":
+            raise ImportError("No module named 'resource'")
+        return real_import(name, *args, **kwargs)
+
+    # Re-import in isolation; monkeypatch restores the original module afterwards
+    monkeypatch.setattr(src, "runtime", src.runtime)
+    monkeypatch.delitem(sys.modules, "src.runtime")
+    monkeypatch.setattr(builtins, "__import__", no_resource)
+    runtime = importlib.import_module("src.runtime")
+
+    assert runtime.process_memory()["peak_rss_mib"] is None
@@ -0,0 +1,113 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from src.client import MavvrikClient, persisted_query_stats
+from src.config import settings
+
+QUERY = "query CostsQuery { costs { cost } }"
+DATA = {"costs": [{"cost": 1.0}]}
+
+def _run(coro):
+    return asyncio.run(coro)
+
+def _execute():
+    return _run(MavvrikClient(None).execute(QUERY, {}, "CostsQuery", use_cache=False))
+
+def test_backend_without_apq_returning_generic_error(backend):
+    def handler(body):
+        if "query" not in body:
+            return backend.reply(200, {"errors": [{"message": "Must provide query string."}]})
+        return backend.reply(200, {"data": DATA})
+
+    bodies = backend.install(handler)
+
+    assert _execute() == DATA
+    assert _execute() == DATA
+    # Hash-only once, then the full text; APQ stays off for this endpoint afterwards
+    assert ["query" in b for b in bodies] == [False, True, True]
+    stats = persisted_query_stats()[settings.api_url]
+    assert stats == {"supported": False, "registered": 0, "hits": 0, "misses": 1}
+
+def test_backend_without_apq_returning_400(backend):
+    def handler(body):
+        if "query" not in body:
+            return backend.reply(400, text="Bad Request")
+        return backend.reply(200, {"data": DATA})
+
+    bodies = backend.install(handler)
+
+    assert _execute() == DATA
+    assert _execute() == DATA
+    assert ["query" in b for b in bodies] == [False, True, True]
+    assert persisted_query_stats()[settings.api_url]["supported"] is False
+
+def test_query_error_with_apq_support_keeps_apq_enabled(backend):
+    def handler(body):
+        return backend.reply(200, {"errors": [{"message": "Unknown field 'costs'."}]})
+
+    backend.install(handler)
+
+    with pytest.raises(ValueError, match="Unknown field"):
+        _execute()
+    stats = persisted_query_stats()[settings.api_url]
+    # An error is neither a hit nor a reason to stop sending hashes
+    assert stats["supported"] is True
+    assert stats["hits"] == 0
+    assert stats["registered"] == 0
+
+def test_registered_hash_counts_as_hit(backend):
+    def handler(body):
+        if "query" not in body and not registered:
+            return backend.reply(200, {"errors": [{"message": "PersistedQueryNotFound"}]})
+        registered.append(True)
+        return backend.reply(200, {"data": DATA})
+
+    registered = []
+    bodies = backend.install(handler)
+
+    assert _execute() == DATA
+    assert _execute() == DATA
+    assert ["query" in b for b in bodies] == [False, True, False]
+    stats = persisted_query_stats()[settings.api_url]
+    assert stats == {"supported": True, "registered": 1, "hits": 1, "misses": 1}
+
+@pytest.mark.parametrize("transient", [
+    {"status": 200, "payload": {"errors": [{"message": "Service temporarily unavailable."}]}},
+    {"status": 429, "text": "Too Many Requests"},
+])
+def test_transient_hash_failure_keeps_apq_enabled(backend, transient):
+    failures = [transient]
+
+    def handler(body):
+        if "query" not in body and failures:
+            return backend.reply(**failures.pop())
+        return backend.reply(200, {"data": DATA})
+
+    bodies = backend.install(handler)
+
+    assert _execute() == DATA
+    assert _execute() == DATA
+    # The full-text retry succeeded, but the next call goes back to sending the hash
+    assert ["query" in b for b in bodies] == [False, True, False]
+    assert persisted_query_stats()[settings.api_url]["supported"] is True
+
+def test_unsupported_endpoint_is_probed_again_after_cooldown(backend, monkeypatch):
+    monkeypatch.setattr(settings, "persisted_queries_retry_seconds", 0.05)
+
+    def handler(body):
+        if "query" not in body:
+            return backend.reply(200, {"errors": [{"message": "PersistedQueryNotSupported"}]})
+        return backend.reply(200, {"data": DATA})
+
+    bodies = backend.install(handler)
+
+    assert _execute() == DATA
+    assert _execute() == DATA
+    assert persisted_query_stats()[settings.api_url]["supported"] is False
+    time.sleep(0.1)
+    assert _execute() == DATA
+    # Cooldown over: the hash is tried once more before falling back again
+    assert ["query" in b for b in bodies] == [False, True, True, False, True]
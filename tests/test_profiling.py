@@ -0,0 +1,29 @@
+import asyncio
+import json
+import time
+
+from src import profiling
+from src.profiling import profiled, profiling_config
+
+def test_profiled_call_writes_folded_stacks(monkeypatch, tmp_path):
+    monkeypatch.setattr(profiling_config, "tools", {"busy_tool"})
+    monkeypatch.setattr(profiling_config, "interval_ms", 1.0)
+    monkeypatch.setattr(profiling_config, "output_dir", str(tmp_path))
+
+    async def busy_tool() -> str:
+        deadline = time.perf_counter() + 0.2
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+        return "done"
+
+    assert asyncio.run(profiled(busy_tool)()) == "done"
+
+    # The sampler thread is stopped and joined before the profile is written
+    assert profiling._sampler._thread is None
+    [summary] = [json.loads(line) for line in (tmp_path / "index.jsonl").read_text().splitlines()]
+    assert summary["tool"] == "busy_tool"
+    assert summary["samples"] > 0 and summary["on_cpu_samples"] > 0
+    folded = open(summary["file"], encoding="utf-8").read().splitlines()
+    assert folded and all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in folded) == summary["on_cpu_samples"]
+    assert any("busy_tool" in line for line in folded)
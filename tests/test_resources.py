@@ -0,0 +1,35 @@
+import asyncio
+
+import pytest
+from mcp.server.fastmcp import FastMCP
+
+from src.config import settings
+from src.tools import resources
+from src.tools.finops import register_finops
+
+ROW = {"cost": 3.0, "date": "2026-09-01", "groupId": "c1", "groupName": "c1"}
+
+@pytest.fixture
+def live(backend, monkeypatch):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+    monkeypatch.setattr(settings, "snapshot_mode", "off")
+    backend.install(lambda body: backend.reply(200, {"data": {"costs": [ROW], "k8sCosts": [ROW]}}))
+    return backend
+
+def _sent_options(backend):
+    return [body["variables"]["option"].get("options") for body in backend.bodies]
+
+@pytest.mark.parametrize("view, tool, args", [
+    (resources._overview_mtd, "mvk_cost_overview", {}),
+    (resources._k8s_clusters_mtd, "mvk_k8s_drilldown", {"group_by": "cluster_id"}),
+])
+def test_views_query_with_their_tools_options(live, view, tool, args):
+    server = FastMCP("test")
+    register_finops(server)
+    asyncio.run(server.call_tool(tool, {"from_date": "2026-09-01", "to_date": "2026-09-30", **args}))
+    tool_options = _sent_options(live)
+
+    payload, as_of = asyncio.run(view())
+
+    assert payload["total_cost"] == 3.0
+    assert _sent_options(live)[len(tool_options):] == tool_options
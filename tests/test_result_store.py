@@ -0,0 +1,26 @@
+import json
+
+from src.result_store import CompactRows
+
+def _roundtrip(data):
+    encoded = CompactRows.encode(data)
+    assert encoded is not None
+    return encoded.decode()
+
+def test_integer_costs_decode_as_ints():
+    data = {"costs": [{"cost": 3, "groupId": "a"}, {"cost": 7, "groupId": "b"}]}
+
+    decoded = _roundtrip(data)
+
+    assert json.dumps(decoded) == json.dumps(data)
+    assert type(decoded["costs"][0]["cost"]) is int
+
+def test_float_costs_and_missing_values_round_trip():
+    data = {"costs": [{"cost": 3.5, "groupId": "a"}, {"cost": None, "groupId": "b"}]}
+
+    assert _roundtrip(data) == data
+
+def test_ints_mixed_with_floats_are_not_compacted():
+    # No single column dtype preserves both 3 and 3.5 exactly
+    assert CompactRows.encode({"costs": [{"cost": 3}, {"cost": 3.5}]}) is None
+    assert CompactRows.encode({"costs": [{"cost": 3}, {"cost": None}]}) is None
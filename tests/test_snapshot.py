@@ -0,0 +1,53 @@
+import asyncio
+from datetime import date
+
+from src.config import settings
+from src.snapshot import SnapshotMaterializer, SnapshotStore
+
+ROWS = [
+    {"date": "2026-09-01", "groupId": "aws", "groupName": "aws", "cost": 10.0},
+    {"date": "2026-09-02", "groupId": "aws", "groupName": "aws", "cost": 5.0},
+    {"date": None, "groupId": "gcp", "groupName": "gcp", "cost": 99.0},
+    {"date": "2026-09-02", "groupId": "gcp", "groupName": "gcp", "cost": 2.5},
+]
+
+def test_materialize_skips_rows_without_a_date(backend, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+    monkeypatch.setattr(settings, "snapshot_groupings", ["provider_code"])
+    monkeypatch.setattr(settings, "snapshot_k8s_groupings", [])
+    backend.install(lambda body: backend.reply(200, {"data": {"costs": ROWS}}))
+    store = SnapshotStore(str(tmp_path))
+
+    summary = asyncio.run(SnapshotMaterializer(store).materialize())
+
+    assert summary["rows"] == {"costs/provider_code": 3}
+    assert summary["skipped_rows"] == {"costs/provider_code": 1}
+    table = store.current("test-tenant").table("costs", "provider_code")
+    totals = dict(zip(table.group_names, table.group_totals(date(2026, 9, 1), date(2026, 9, 30))))
+    assert totals == {"aws": 15.0, "gcp": 2.5}
+
+def test_datasets_keep_their_live_options(backend, monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+    monkeypatch.setattr(settings, "snapshot_groupings", ["provider_code"])
+    monkeypatch.setattr(settings, "snapshot_k8s_groupings", ["cluster_id"])
+    day = date.today().replace(day=1).isoformat()
+    row = {"date": day, "groupId": "g1", "groupName": "g1", "cost": 4.0}
+    backend.install(lambda body: backend.reply(200, {"data": {"costs": [row], "k8sCosts": [row]}}))
+    store = SnapshotStore(str(tmp_path))
+
+    asyncio.run(SnapshotMaterializer(store).materialize())
+
+    sent = {"k8sCosts" in body["query"]: body["variables"]["option"].get("options") for body in backend.bodies}
+    assert sent == {False: ["discount", "tax"], True: None}
+    snap = store.current("test-tenant")
+
+    def ask(operation, group_by, options=None):
+        option = {"xAxis": "date", "interval": "month", "groupBy": group_by, "fromDate": day, "toDate": day}
+        if options:
+            option["options"] = options
+        return snap.answer(operation, {"option": option, "filter": {}})
+
+    assert ask("CostsQuery", "provider_code", ["tax", "discount"])["costs"][0]["cost"] == 4.0
+    assert ask("CostsQuery", "provider_code") is None
+    assert ask("K8sCostsQuery", "cluster_id")["k8sCosts"][0]["cost"] == 4.0
+    assert ask("K8sCostsQuery", "cluster_id", ["discount", "tax"]) is None
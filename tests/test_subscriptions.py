@@ -0,0 +1,70 @@
+import asyncio
+
+import pytest
+
+from src import subscriptions
+from src.config import settings
+from src.subscriptions import _ViewPoller
+
+class _Session:
+    """Stands in for a subscribed ServerSession."""
+
+    def __init__(self):
+        self.updates = []
+
+    async def send_resource_updated(self, uri):
+        self.updates.append(str(uri))
+
+def _run_loop(monkeypatch, poller, polls):
+    """Runs the poll loop for `polls` iterations and returns the requested sleeps."""
+    delays = []
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+        if len(delays) >= polls:
+            raise asyncio.CancelledError
+
+    monkeypatch.setattr(subscriptions.asyncio, "sleep", fake_sleep)
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(poller._loop())
+    return delays
+
+def test_failed_polls_back_off_exponentially_up_to_cap(monkeypatch):
+    monkeypatch.setattr(settings, "resource_poll_interval_seconds", 60.0)
+    monkeypatch.setattr(settings, "resource_poll_max_backoff_seconds", 300.0)
+
+    async def failing():
+        raise ValueError("Connection Failed")
+
+    poller = _ViewPoller("mavvrik://test/view", "test", failing)
+    session = _Session()
+    poller.sessions.add(session)
+
+    assert _run_loop(monkeypatch, poller, 5) == [60.0, 120.0, 240.0, 300.0, 300.0]
+    assert poller.failures == 5
+    assert poller.last_error == "ValueError: Connection Failed"
+
+def test_recovery_resets_backoff_and_notifies_only_on_change(monkeypatch):
+    monkeypatch.setattr(settings, "resource_poll_interval_seconds", 60.0)
+    results = iter([ValueError("down"), {"total": 1.0}, {"total": 1.0}, {"total": 2.0}])
+
+    async def fetch():
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        return result, None
+
+    poller = _ViewPoller("mavvrik://test/view", "test", fetch)
+    session = _Session()
+    poller.sessions.add(session)
+    # Every poll sees an expired value, so each iteration fetches
+    monkeypatch.setattr(poller, "fresh", lambda max_age: False)
+
+    delays = _run_loop(monkeypatch, poller, 4)
+
+    assert delays[0] == 60.0
+    assert all(d <= 60.0 for d in delays[1:])
+    assert poller.failures == 0
+    # Baseline (1.0) and the unchanged repeat send nothing; the change to 2.0 does
+    assert session.updates == ["mavvrik://test/view"]
+    assert poller.revision == 2
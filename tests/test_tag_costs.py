@@ -0,0 +1,23 @@
+import asyncio
+
+from mcp.server.fastmcp import FastMCP
+
+from src.cache import response_cache
+from src.config import settings
+from src.tools.finops import register_finops
+
+def test_tag_pages_bypass_the_response_cache(backend, monkeypatch):
+    monkeypatch.setattr(settings, "persisted_queries", False)
+    monkeypatch.setattr(settings, "tag_page_size", 2)
+    pages = {
+        1: [{"cost": 5.0, "groupId": "a", "groupName": "team-a"}, {"cost": 3.0, "groupId": "b", "groupName": "team-b"}],
+        2: [{"cost": 1.0, "groupId": "c", "groupName": "team-c"}],
+    }
+    backend.install(lambda body: backend.reply(200, {"data": {"costs": pages[body["variables"]["option"]["pageNo"]]}}))
+    server = FastMCP("test")
+    register_finops(server)
+
+    asyncio.run(server.call_tool("mvk_tag_costs", {"tag_key": "team", "from_date": "2026-09-01", "to_date": "2026-09-30"}))
+
+    assert [body["variables"]["option"]["pageNo"] for body in backend.bodies] == [1, 2]
+    assert len(response_cache) == 0
@@ -0,0 +1,69 @@
+import asyncio
+import json
+import threading
+
+from src import tracing
+from src.tracing import JsonlExporter, Span
+
+def test_export_failure_names_the_failing_exporter(monkeypatch, tmp_path):
+    warnings = []
+    monkeypatch.setattr(tracing.logger, "warning", lambda event, **fields: warnings.append((event, fields)))
+    # A directory cannot be opened for appending
+    exporter = JsonlExporter(str(tmp_path))
+
+    exporter.export([Span("tool", None, {})])
+    exporter.stop()
+
+    assert warnings[0][0] == "trace.export_failed"
+    assert warnings[0][1]["exporter"] == "jsonl"
+
+def test_jsonl_spans_are_written_by_the_writer_thread(monkeypatch, tmp_path):
+    path = tmp_path / "traces.jsonl"
+    exporter = JsonlExporter(str(path))
+    written_from = []
+    real_open = open
+
+    def recording_open(*args, **kwargs):
+        written_from.append(threading.current_thread().name)
+        return real_open(*args, **kwargs)
+
+    monkeypatch.setattr("builtins.open", recording_open)
+    for name in ("first", "second"):
+        exporter.export([Span(name, None, {})])
+    exporter.stop()
+    monkeypatch.undo()
+
+    assert [json.loads(line)["name"] for line in path.read_text().splitlines()] == ["first", "second"]
+    assert set(written_from) == {"mvk-trace-writer"}
+
+class _Collector:
+    name = "collector"
+
+    def __init__(self):
+        self.batches = []
+
+    def export(self, spans):
+        self.batches.append([s.name for s in spans])
+
+def test_span_ending_after_root_is_exported_as_follow_up(monkeypatch):
+    collector = _Collector()
+    monkeypatch.setattr(tracing, "_exporters", [collector])
+    monkeypatch.setattr(tracing.settings, "trace_sample_rate", 1.0)
+    before = tracing.metrics.snapshot().get("trace.late_spans", 0)
+    release = asyncio.Event()
+
+    async def background():
+        with tracing.span("graphql.execute"):
+            await release.wait()
+
+    async def main():
+        with tracing.span("tool.mvk_cost_trend"):
+            task = asyncio.create_task(background())
+            await asyncio.sleep(0)
+        release.set()
+        await task
+
+    asyncio.run(main())
+
+    assert collector.batches == [["tool.mvk_cost_trend"], ["graphql.execute"]]
+    assert tracing.metrics.snapshot()["trace.late_spans"] == before + 1